@@ -0,0 +1,63 @@
+"""
+JWT 인증 비용 비교: 기본 JWTAuthentication vs CachedJWTAuthentication
+요청 1회당 쿼리 수와 지연(ms 중앙값)을 출력한다.
+
+    python -m benchmarks.bench_auth [-n 300]
+"""
+import argparse
+from unittest import mock
+
+from .common import count_queries, setup_django, timeit
+
+ENDPOINTS = [
+    ("GET", "/api/notifications/unread/"),
+    ("POST", "/api/posts/{post}/like/"),
+    ("DELETE", "/api/posts/{post}/like/"),
+]
+AUTH_CLASSES = [
+    "rest_framework_simplejwt.authentication.JWTAuthentication",
+    "blog.authentication.CachedJWTAuthentication",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", type=int, default=300)
+    args = parser.parse_args()
+
+    connection = setup_django()
+    from django.conf import settings
+    from django.contrib.auth.models import User
+    from django.test.utils import override_settings
+    from django.utils.module_loading import import_string
+    from rest_framework.views import APIView
+    from rest_framework.test import APIClient
+    from blog.models import Post
+    from blog.serializers import ClaimsTokenObtainPairSerializer
+    from blog.throttling import get_store
+
+    user = User.objects.create_user("bench", password="pw12345!")
+    post = Post.objects.create(author=user, title="bench", content="bench")
+    token = str(ClaimsTokenObtainPairSerializer.get_token(user).access_token)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    rf = {**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": {}}  # throttle 영향 제거
+    print(f"{'auth class':<28} {'endpoint':<36} {'queries':>8} {'ms':>8}")
+    for auth in AUTH_CLASSES:
+        # authentication_classes는 APIView 클래스 속성에 임포트 시점에 고정되므로 직접 교체
+        with override_settings(REST_FRAMEWORK=rf), \
+                mock.patch.object(APIView, "authentication_classes", [import_string(auth)]):
+            for method, path in ENDPOINTS:
+                url = path.format(post=post.id)
+                call = lambda: getattr(client, method.lower())(url)  # noqa: E731
+                get_store().clear()
+                call()  # 캐시 예열
+                with count_queries(connection) as q:
+                    call()
+                ms = timeit(call, n=args.n)
+                print(f"{auth.rsplit('.', 1)[-1]:<28} {method + ' ' + path:<36} {q.count:>8} {ms:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
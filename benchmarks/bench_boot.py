@@ -0,0 +1,68 @@
+"""
+워커 부팅 비용: import 시간(-X importtime)과 부팅 직후 상주 메모리(RSS)
+각 측정은 새 인터프리터에서 (WSGI 앱 생성 + URLconf 로드 = 첫 요청 전 워커 상태)
+
+    python -m benchmarks.bench_boot [--runs 5] [--top 10]
+
+"+ gemini SDK" 행은 같은 부팅 뒤 google.generativeai를 읽었을 때 (AI provider를 처음 쓴 워커)
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+BOOT = (
+    "import os; os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings');"
+    "from django.core.wsgi import get_wsgi_application; get_wsgi_application();"
+    "from django.urls import get_resolver; get_resolver().url_patterns;"
+)
+SDK = "import google.generativeai;"
+RSS = (
+    "import sys; status = open('/proc/self/status').read();"
+    "sys.stdout.write(status.split('VmRSS:')[1].split()[0])"  # kB
+)
+LINE = re.compile(r"import time:\s+(\d+) \|\s+\d+ \| *(\S+)")
+
+
+def run(code, *flags):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return subprocess.run([sys.executable, *flags, "-W", "ignore", "-c", code], cwd=root,
+                          capture_output=True, text=True, check=True)
+
+
+def import_profile(code):
+    """→ (import 시간 합(ms), {최상위 패키지: 자체 시간 합 ms})"""
+    total, packages = 0, {}
+    for line in run(code, "-X", "importtime").stderr.splitlines():
+        m = LINE.match(line)
+        if not m:
+            continue
+        self_us, name = int(m.group(1)), m.group(2)
+        package = name.split(".", 1)[0]
+        packages[package] = packages.get(package, 0) + self_us / 1000
+        total += self_us
+    return total / 1000, packages
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    for label, code in (("boot", BOOT), ("+ gemini SDK", BOOT + SDK)):
+        times = [import_profile(code)[0] for _ in range(args.runs)]
+        rss = [int(run(code + RSS).stdout) / 1024 for _ in range(args.runs)]
+        print(f"{label:<14} import {statistics.median(times):>8.0f} ms   rss {statistics.median(rss):>7.1f} MB")
+
+    _, packages = import_profile(BOOT)
+    print("\nslowest packages at boot (ms):")
+    for name, ms in sorted(packages.items(), key=lambda kv: -kv[1])[:args.top]:
+        print(f"  {name:<30} {ms:>8.1f}")
+    print(f"\ngoogle SDK loaded at boot: {'google' in packages}")
+
+
+if __name__ == "__main__":
+    main()
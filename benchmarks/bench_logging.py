@@ -0,0 +1,69 @@
+"""
+로그 한 줄이 요청 스레드에서 드는 시간 (µs): 파일에 바로 쓰는 StreamHandler vs blog.logs 큐 핸들러 vs 샘플링으로 버려지는 줄.
+동시 스레드 수를 올려 쓰기 잠금 경합도 본다.
+
+    python -m benchmarks.bench_logging [--calls 20000] [--threads 1,8]
+"""
+import argparse
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from .common import setup_django
+
+
+def per_call_us(logger, calls, threads):
+    """스레드 threads개가 calls번씩 logger.info → 한 번당 평균 µs (스레드별 평균의 최댓값)"""
+    results = []
+
+    def worker():
+        t0 = time.perf_counter()
+        for i in range(calls):
+            logger.info("AI filled on create id=%s", i, extra={"post_id": i})
+        results.append((time.perf_counter() - t0) / calls * 1e6)
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return max(results)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--threads", default="1,8")
+    args = parser.parse_args()
+    setup_django()
+    from blog import logs
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.log")
+        direct = logging.FileHandler(path)
+        direct.setFormatter(logs.JSONFormatter())
+        queued = logs.NonBlockingQueueHandler(maxsize=1_000_000, stream=open(path, "a"))
+        sampled = logs.NonBlockingQueueHandler(stream=open(path, "a"))
+        sampled.addFilter(logs.SamplingFilter({"bench": 0.0}))
+        print(f"{'handler':<22}" + "".join(f"{f'{n} thr µs':>12}" for n in args.threads.split(",")))
+        for label, handler in (("direct JSON file", direct), ("queue (blog.logs)", queued),
+                               ("queue, sampled out", sampled)):
+            handler.addFilter(logs.RequestIdFilter())
+            logger = logging.getLogger(f"bench.{label}")
+            logger.handlers, logger.propagate, logger.level = [handler], False, logging.INFO
+            cells = []
+            for n in args.threads.split(","):
+                cells.append(per_call_us(logger, args.calls, int(n)))
+                for h in (queued, sampled):  # 리스너가 밀린 줄을 다 쓴 뒤 다음 측정 (GIL 경합 제외)
+                    while not h.queue.empty():
+                        time.sleep(0.01)
+            print(f"{label:<22}" + "".join(f"{c:>12.2f}" for c in cells))
+        queued.flush_and_stop()
+        sampled.flush_and_stop()
+        print(f"\nqueue dropped: {queued.dropped}")
+
+
+if __name__ == "__main__":
+    main()
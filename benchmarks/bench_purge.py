@@ -0,0 +1,69 @@
+"""
+반응이 많은 글 삭제: Post.delete()(collector 한 번) vs 숨김 + 배치 정리
+요청 경로에서 걸리는 시간과 정리 전체 시간, 가장 긴 트랜잭션(잠금 유지 시간)을 비교
+
+    python -m benchmarks.bench_purge [--likes 20000 --comments 20000]
+"""
+import argparse
+import time
+
+from .common import setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--likes", type=int, default=20_000)
+    parser.add_argument("--comments", type=int, default=20_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth.models import User
+    from django.db import transaction
+    from django.utils import timezone
+    from blog import purge
+    from blog.models import Comment, Like, Post
+
+    users = User.objects.bulk_create(User(username=f"u{i}") for i in range(args.likes))
+    author = users[0]
+
+    def make_post():
+        post = Post.objects.create(author=author, title="hot", content="c")
+        Like.objects.bulk_create((Like(post=post, user=u) for u in users), batch_size=5000)
+        Comment.objects.bulk_create((Comment(post=post, author=author, content="x", path=f"{i:07d}")
+                                     for i in range(args.comments)), batch_size=5000)
+        return post
+
+    post = make_post()
+    t0 = time.perf_counter()
+    with transaction.atomic():
+        post.delete()
+    print(f"Post.delete()        request {time.perf_counter() - t0:>8.2f} s  (one transaction)")
+
+    post = make_post()
+    t0 = time.perf_counter()
+    with transaction.atomic():
+        # soft_delete와 같은 저장 (커밋 후 백그라운드 정리 예약은 빼고 아래에서 직접 실행)
+        post.deleted_at = timezone.now()
+        post.save(update_fields=["deleted_at"])
+    request = time.perf_counter() - t0
+
+    longest = 0.0
+    original = purge.delete_in_batches
+
+    def timed(qs, size):
+        nonlocal longest
+        t = time.perf_counter()
+        n = original(qs, size)
+        longest = max(longest, (time.perf_counter() - t) / max(1, -(-n // size)))
+        return n
+
+    purge.delete_in_batches = timed
+    t0 = time.perf_counter()
+    purge.purge_post(post.pk, args.batch_size)
+    print(f"soft delete + purge  request {request:>8.4f} s  purge {time.perf_counter() - t0:.2f} s, "
+          f"~{longest * 1000:.1f} ms per batch transaction")
+
+
+if __name__ == "__main__":
+    main()
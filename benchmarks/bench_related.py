@@ -0,0 +1,61 @@
+"""
+관련 글 인덱스: 빌드 시간, 조회(related) / 저장 반영(upsert) 지연(ms 중앙값)
+
+    python -m benchmarks.bench_related [--posts 100000]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from .common import setup_django, timeit
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--posts", type=int, default=100_000)
+    parser.add_argument("-n", type=int, default=2000)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth.models import User
+    from blog.models import Post, Tag
+    from blog.related import RelatedIndex
+
+    rnd = random.Random(0)
+    words = [f"word{i}" for i in range(20_000)]
+    tags = Tag.objects.bulk_create(Tag(name=f"tag{i}", slug=f"tag{i}") for i in range(500))
+    user = User.objects.create_user("bench", password="pw12345!")
+
+    def content():
+        # 지프 분포 비슷하게: 앞쪽 단어가 자주 나옴
+        return " ".join(words[int(rnd.paretovariate(1.2)) % len(words)] for _ in range(200))
+
+    posts = Post.objects.bulk_create(
+        (Post(author=user, title=f"post {i}", slug=f"post-{i}", content=content(),
+              tags_suggested=rnd.sample([t.slug for t in tags], 3)) for i in range(args.posts)),
+        batch_size=2000)
+    Through = Post.tags.through
+    Through.objects.bulk_create(
+        (Through(post_id=p.id, tag_id=t.id) for p in posts for t in rnd.sample(tags, 2)), batch_size=5000)
+
+    t0 = time.perf_counter()
+    index = RelatedIndex().build()
+    print(f"build            {len(index):>7} posts {time.perf_counter() - t0:>8.2f} s")
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "related.bin")
+        index.write(path)
+        t0 = time.perf_counter()
+        index = RelatedIndex.read(path)
+        print(f"load   {os.path.getsize(path) / 2**20:>10.1f} MB file {time.perf_counter() - t0:>8.2f} s")
+
+    ids = [p.id for p in posts]
+    print(f"related(k=10)    {timeit(lambda: index.related(rnd.choice(ids), 10), n=args.n):>14.4f} ms")
+    sample = rnd.choice(posts)
+    upsert = lambda: index.upsert(sample.id, sample.title, content(), ["tag1"], ["tag2"])  # noqa: E731
+    print(f"upsert           {timeit(upsert, n=50, warmup=5):>14.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
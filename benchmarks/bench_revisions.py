@@ -0,0 +1,50 @@
+"""
+글 수정 이력: 큰 글을 여러 번 조금씩 고쳤을 때 저장 크기(전문 저장 대비)와 복원/기록 지연(ms 중앙값)
+
+    python -m benchmarks.bench_revisions [--lines 5000 --edits 200]
+"""
+import argparse
+import random
+
+from .common import setup_django, timeit
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lines", type=int, default=5000)
+    parser.add_argument("--edits", type=int, default=200)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth.models import User
+    from blog import revisions
+    from blog.models import Post, PostRevision
+
+    rnd = random.Random(0)
+    lines = [f"{i} " + " ".join(f"w{rnd.randrange(5000)}" for _ in range(12)) + "\n" for i in range(args.lines)]
+    user = User.objects.create_user("bench", password="pw12345!")
+    post = Post.objects.create(author=user, title="big", content="".join(lines))
+
+    def edit():
+        before = (post.title, post.content)
+        for _ in range(3):  # 한 번에 몇 줄씩 수정/추가
+            i = rnd.randrange(len(lines))
+            lines[i] = f"edited {rnd.random()}\n" if rnd.random() < 0.7 else lines[i] + "added line\n"
+        post.content = "".join(lines)
+        Post.objects.filter(pk=post.pk).update(content=post.content)
+        revisions.record(post, before, editor=user)
+
+    print(f"record           {timeit(edit, n=args.edits, warmup=1):>10.2f} ms")
+    stored = sum(len(bytes(d)) for d in PostRevision.objects.filter(post=post).values_list("data", flat=True))
+    full = sum(PostRevision.objects.filter(post=post).values_list("size", flat=True))
+    n = PostRevision.objects.filter(post=post).count()
+    print(f"storage {stored / 2**10:>10.1f} KB for {n} revisions (full text {full / 2**20:.1f} MB, "
+          f"{full / max(stored, 1):.0f}x smaller)")
+
+    last = n
+    print(f"reconstruct      {timeit(lambda: revisions.reconstruct(post.id, [rnd.randint(1, last)]), n=100):>10.2f} ms")
+    print(f"diff             {timeit(lambda: revisions.diff(post.id, rnd.randint(1, last), last), n=50):>10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
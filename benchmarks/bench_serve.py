@@ -0,0 +1,162 @@
+"""
+운영 서빙 처리량: 같은 설정(config.settings_production)으로 gunicorn gthread(wsgi)와 uvicorn 워커(asgi)를 띄워
+동시 연결 N개(keep-alive)로 일정 시간 요청을 보내고 초당 요청 수와 지연 p50/p99를 비교한다.
+임시 SQLite DB/STATIC_ROOT에 migrate + 글 생성 + collectstatic 후 실행 (gunicorn, uvicorn, 공유 캐시 필요 —
+CACHE_URL, 기본 redis://127.0.0.1:6379/15).
+
+    python -m benchmarks.bench_serve [--posts 2000] [--concurrency 32] [--seconds 10] [--workers 0]
+
+경로: 글 목록, 글 상세, 해시 이름 정적 파일(미리 압축된 gzip)
+"""
+import argparse
+import http.client
+import importlib.util
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SEED = (
+    "import django; django.setup();"
+    "from django.contrib.auth.models import User; from blog.models import Post;"
+    "u = User.objects.create_user('bench', password='pw');"
+    "[Post.objects.create(author=u, title=f'post {i}', content='본문 ' * 200) for i in range({n})];"
+    "from django.contrib.staticfiles.storage import staticfiles_storage;"
+    "print(staticfiles_storage.url('js/app.js'))"
+)
+
+
+def manage(env, *args):
+    subprocess.run([sys.executable, "-W", "ignore", "manage.py", *args], cwd=ROOT, env=env, check=True,
+                   stdout=subprocess.DEVNULL)
+
+
+def prepare(tmp, posts):
+    env = {
+        **os.environ,
+        "DJANGO_SETTINGS_MODULE": "config.settings_production",
+        "DJANGO_SECRET_KEY": "bench",
+        "ALLOWED_HOSTS": "127.0.0.1",
+        "HTTPS": "false",
+        "SQLITE_PATH": os.path.join(tmp, "bench.sqlite3"),
+        "STATIC_ROOT": os.path.join(tmp, "static"),
+        "SLOW_QUERY_MS": "0",
+        "AI_ENABLE": "false",
+        "CACHE_URL": os.environ.get("CACHE_URL", "redis://127.0.0.1:6379/15"),
+    }
+    manage(env, "migrate", "--noinput")
+    manage(env, "collectstatic", "--noinput")
+    out = subprocess.run([sys.executable, "-W", "ignore", "-c", SEED.replace("{n}", str(posts))], cwd=ROOT, env=env,
+                         check=True, capture_output=True, text=True)
+    return env, out.stdout.strip().splitlines()[-1]
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_ready(port, proc, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("server exited")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("server did not start")
+
+
+def load(port, path, concurrency, seconds, headers):
+    """→ (요청 수, 오류 수, 지연 ms 목록)"""
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    stop = time.monotonic() + seconds
+
+    def client():
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        mine, failed = [], 0
+        while time.monotonic() < stop:
+            t0 = time.perf_counter()
+            try:
+                conn.request("GET", path, headers=headers)
+                res = conn.getresponse()
+                res.read()
+                if res.status != 200:
+                    failed += 1
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+                continue
+            mine.append((time.perf_counter() - t0) * 1000)
+        conn.close()
+        with lock:
+            latencies.extend(mine)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return len(latencies), errors[0], latencies
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--posts", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--workers", type=int, default=0, help="0 = runprod 기본 (CPU 수 기준)")
+    args = parser.parse_args()
+    for module in ("gunicorn", "uvicorn"):
+        if importlib.util.find_spec(module) is None:
+            sys.exit(f"{module}이(가) 필요합니다: pip install gunicorn uvicorn")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env, app_js = prepare(tmp, args.posts)
+        paths = [
+            ("list", "/api/posts/", {}),
+            ("detail", "/api/posts/1/", {}),
+            ("static", app_js, {"Accept-Encoding": "gzip"}),
+        ]
+        results = {}
+        for mode in ("wsgi", "asgi"):
+            port = free_port()
+            cmd = [sys.executable, "-W", "ignore", "manage.py", "runprod", "--bind", f"127.0.0.1:{port}"]
+            cmd += ["--asgi"] if mode == "asgi" else []
+            cmd += ["--workers", str(args.workers)] if args.workers else []
+            plan = subprocess.run(cmd + ["--dry-run"], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+            print(plan.stdout.splitlines()[0])  # "wsgi: N cpu → ..."
+            proc = subprocess.Popen(cmd, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            try:
+                wait_ready(port, proc)
+                for label, path, headers in paths:
+                    load(port, path, args.concurrency, 1, headers)  # 워밍업 (워커별 첫 요청/연결)
+                    n, failed, latencies = load(port, path, args.concurrency, args.seconds, headers)
+                    q = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else [0] * 99
+                    results[(mode, label)] = {"rps": round(n / args.seconds, 1), "p50_ms": round(q[49], 2),
+                                              "p99_ms": round(q[98], 2), "errors": failed}
+            finally:
+                proc.terminate()
+                proc.wait(timeout=30)
+
+    print(f"\n{'path':<8} {'mode':<5} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for (mode, label), r in sorted(results.items(), key=lambda kv: (kv[0][1], kv[0][0])):
+        print(f"{label:<8} {mode:<5} {r['rps']:>9.1f} {r['p50_ms']:>8.2f} {r['p99_ms']:>8.2f} {r['errors']:>7}")
+    print(json.dumps({f"{m}:{p}": r for (m, p), r in results.items()}, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
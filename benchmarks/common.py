@@ -0,0 +1,49 @@
+"""
+벤치마크 공용: 테스트 DB(임시)를 만든 상태로 Django를 띄운다.
+    python -m benchmarks.bench_auth
+"""
+import contextlib
+import os
+import statistics
+import time
+import warnings
+
+
+def setup_django():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    warnings.filterwarnings("ignore", category=FutureWarning)
+    import django
+    django.setup()
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    return connection
+
+
+def timeit(fn, n=200, warmup=20):
+    """fn을 n번 실행한 1회당 시간(ms) 중앙값"""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+class _Counter:
+    count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+@contextlib.contextmanager
+def count_queries(connection):
+    """요청 시작 시 queries_log가 비워지므로 CaptureQueriesContext 대신 execute_wrapper로 센다"""
+    counter = _Counter()
+    with connection.execute_wrapper(counter):
+        yield counter
@@ -1,8 +1,159 @@
+import json
+
 from django.contrib import admin
-from .models import Post
+from django.db.models import Q
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils.html import format_html
+
+from .models import Comment, Like, Notification, Post, RequestProfile
+from .pagination import EstimatedCountPaginator
+from .profiling import prof_bytes
+from .search import search_post_ids
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """
+    행이 많은 표의 관리자 목록: 전체 목록은 추정 행 수로 페이지를 나누고 ("전체 N개" COUNT도 생략),
+    FK는 JOIN 한 번 + 편집 화면은 전체 선택 상자 대신 id 입력.
+    검색은 숫자면 id_search_fields 정확 일치, 아니면 username_search_fields 정확 일치 (인덱스 조회, LIKE 스캔 없음).
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    id_search_fields = ("pk",)
+    username_search_fields = ()
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        if term.isdigit():
+            q = Q()
+            for field in self.id_search_fields:
+                q |= Q(**{field: int(term)})
+            return queryset.filter(q), False
+        if not self.username_search_fields:
+            return queryset.none(), False
+        q = Q()
+        for field in self.username_search_fields:
+            q |= Q(**{field: term})
+        return queryset.filter(q), False
+
 
 @admin.register(Post)
-class PostAdmin(admin.ModelAdmin):
-    list_display = ("id", "title", "created_at", "updated_at")
+class PostAdmin(LargeTableAdmin):
+    """숨긴(deleted_at) 글도 보이게 all_objects. 좋아요/댓글 수는 PostScore 카운터, 본문 검색은 blog.search 색인"""
+    list_display = ("id", "title", "author", "category", "like_count", "comment_count", "created_at", "deleted_at")
+    list_select_related = ("author", "category", "trending")
+    list_filter = ("category",)
+    raw_id_fields = ("author",)
     search_fields = ("title", "content")
+    search_help_text = "글 번호 또는 제목/본문 단어 (단어마다 앞부분 일치)"
+    ordering = ("-id",)
+
+    def get_queryset(self, request):
+        return Post.all_objects.get_queryset()
+
+    @admin.display(description="likes", ordering="trending__likes")
+    def like_count(self, obj):
+        score = getattr(obj, "trending", None)
+        return score.likes if score else 0
+
+    @admin.display(description="comments", ordering="trending__comments")
+    def comment_count(self, obj):
+        score = getattr(obj, "trending", None)
+        return score.comments if score else 0
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        if not term or term.isdigit():
+            return super().get_search_results(request, queryset, term)
+        ids = search_post_ids(term)
+        if ids is None:  # 색인이 없는 DB → 기본 LIKE 검색
+            return admin.ModelAdmin.get_search_results(self, request, queryset, term)
+        return queryset.filter(pk__in=ids), False
+
+
+@admin.register(Comment)
+class CommentAdmin(LargeTableAdmin):
+    list_display = ("id", "post", "author", "depth", "reply_count", "created_at")
+    list_select_related = ("post", "author")
+    raw_id_fields = ("post", "author", "parent")
+    search_fields = ("author__username",)
+    search_help_text = "댓글/글 번호 또는 작성자 아이디"
+    id_search_fields = ("pk", "post_id")
+    username_search_fields = ("author__username",)
     ordering = ("-id",)
+
+
+@admin.register(Like)
+class LikeAdmin(LargeTableAdmin):
+    list_display = ("id", "post", "user", "created_at")
+    list_select_related = ("post", "user")
+    raw_id_fields = ("post", "user")
+    search_fields = ("user__username",)
+    search_help_text = "글 번호 또는 사용자 아이디"
+    id_search_fields = ("pk", "post_id")
+    username_search_fields = ("user__username",)
+    ordering = ("-id",)
+
+
+@admin.register(Notification)
+class NotificationAdmin(LargeTableAdmin):
+    list_display = ("id", "user", "message", "post", "is_read", "created_at")
+    list_select_related = ("user", "post")
+    list_filter = ("is_read",)
+    raw_id_fields = ("user", "post", "comment")
+    search_fields = ("user__username",)
+    search_help_text = "알림/글 번호 또는 수신자 아이디"
+    id_search_fields = ("pk", "post_id")
+    username_search_fields = ("user__username",)
+    ordering = ("-id",)
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    """blog.profiling이 남긴 요청 프로파일 — 읽기/삭제만, .prof(pstats)와 SQL 목록(.json) 다운로드"""
+    list_display = ("id", "created_at", "trigger", "method", "path", "status", "duration_ms", "sql_count", "sql_ms",
+                    "downloads")
+    list_filter = ("trigger", "method", "status")
+    search_fields = ("path", "view_name")
+    ordering = ("-id",)
+    exclude = ("stats", "queries")
+    readonly_fields = ("created_at", "user", "trigger", "method", "path", "view_name", "status", "duration_ms",
+                       "sql_count", "sql_ms", "downloads", "summary")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_urls(self):
+        urls = [path("<int:pk>/download/<str:kind>/", self.admin_site.admin_view(self.download),
+                     name="blog_requestprofile_download")]
+        return urls + super().get_urls()
+
+    @admin.display(description="download")
+    def downloads(self, obj):
+        link = lambda kind: reverse("admin:blog_requestprofile_download", args=[obj.pk, kind])  # noqa: E731
+        return format_html('<a href="{}">.prof</a> / <a href="{}">sql.json</a>', link("prof"), link("sql"))
+
+    def download(self, request, pk, kind):
+        if not self.has_view_permission(request):
+            return HttpResponse(status=403)
+        profile = get_object_or_404(RequestProfile, pk=pk)
+        if kind == "prof":
+            response = HttpResponse(prof_bytes(profile), content_type="application/octet-stream")
+            filename = f"profile-{pk}.prof"
+        elif kind == "sql":
+            body = {"path": profile.path, "view": profile.view_name, "sql_count": profile.sql_count,
+                    "sql_ms": profile.sql_ms, "queries": profile.queries}
+            response = HttpResponse(json.dumps(body, ensure_ascii=False, indent=2),
+                                    content_type="application/json; charset=utf-8")
+            filename = f"profile-{pk}-sql.json"
+        else:
+            return HttpResponse(status=404)
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
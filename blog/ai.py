@@ -1,16 +1,26 @@
 # blog/ai.py
-import json, re, logging
-from google.generativeai.types import HarmCategory, HarmBlockThreshold
+# google.generativeai(+ protobuf/grpc)는 import만 ~0.9s, 수십 MB라 모듈 상단에서 읽지 않는다.
+# GeminiAI를 처음 만들 때(AI_ENABLE + provider=gemini) 한 번만 로드 → 로컬/더미 모드 프로세스는 SDK를 안 읽음.
+import json, re, logging, threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 from django.conf import settings
+from .logs import in_context
+from .tagger import get_tagger
+from . import summarizer
 
 logger = logging.getLogger(__name__)
-SAFETY_OFF = {
-    HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
-    HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
-    HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
-    HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
-}
+
+
+def _safety_off():
+    """안전필터 완화 설정 (SDK 타입이 필요해 GeminiAI 생성 시점에 만든다)"""
+    from google.generativeai.types import HarmCategory, HarmBlockThreshold
+    return {
+        HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
+        HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
+        HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
+        HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
+    }
 
 # -------------------------
 # Fallback (Dummy provider)
@@ -25,9 +35,104 @@ class DummyAI:
         return s[:max_chars]
 
     def suggest_tags(self, text: str, k: int = 5) -> List[str]:
-        """태그 폴백: 비어있는 리스트"""
+        """태그 폴백: 로컬 TF-IDF 추천기 (blog/tagger.py)"""
         logger.info("AI: Dummy suggest_tags() used")
-        return []
+        if not text:
+            return []
+        return get_tagger().suggest(text, k)
+
+# -------------------------
+# Local provider (in-process, 외부 호출 없음)
+# -------------------------
+class LocalAI(DummyAI):
+    """추출 요약(TextRank) + 로컬 TF-IDF 태그. 글 저장 시점의 1차 결과용"""
+    def summarize(self, text: str, max_chars: int = 120) -> str:
+        if not text:
+            return ""
+        return summarizer.summarize(text, max_chars)
+
+    def analyze(self, text: str, max_chars: int = 120, k: int = 6, usage=None) -> tuple[str, List[str]]:
+        return self.summarize(text, max_chars), self.suggest_tags(text, k)
+
+# -------------------------
+# 토큰 예산 (긴 글은 나눠서 요약 → 합치기)
+# -------------------------
+MAP_OUTPUT_TOKENS = 512        # 조각 요약 1개 (2.5 계열은 thinking 토큰도 이 한도에 포함)
+ANALYZE_OUTPUT_TOKENS = 1024   # 최종 요약 + 태그 JSON
+
+def estimate_tokens(text: str) -> int:
+    """
+    API 호출 없이 대략적인 토큰 수: 영문/숫자/기호는 ~4자당 1토큰, 한글 등은 ~1.5자당 1토큰.
+    분할 여부 판단용이라 정확할 필요는 없다 (실제 사용량은 응답의 usage_metadata로 기록).
+    """
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return int(ascii_chars / 4 + (len(text) - ascii_chars) / 1.5) + 1
+
+def split_chunks(text: str, budget: int) -> List[str]:
+    """문단(빈 줄) 경계로 budget 토큰 이하 조각으로 묶는다. 한 문단이 budget보다 크면 줄/문장 단위로 자른다"""
+    pieces = []
+    for para in re.split(r"\n\s*\n", text):
+        para = para.strip()
+        if not para:
+            continue
+        if estimate_tokens(para) <= budget:
+            pieces.append(para)
+            continue
+        for sent in re.split(r"(?<=[.!?。])\s+|\n", para):
+            while estimate_tokens(sent) > budget:  # 문장 하나도 크면 글자 수로
+                cut = max(1, int(len(sent) * budget / estimate_tokens(sent)))
+                pieces.append(sent[:cut])
+                sent = sent[cut:]
+            if sent.strip():
+                pieces.append(sent.strip())
+    chunks, cur, cur_tokens = [], [], 0
+    for piece in pieces:
+        n = estimate_tokens(piece)
+        if cur and cur_tokens + n > budget:
+            chunks.append("\n\n".join(cur))
+            cur, cur_tokens = [], 0
+        cur.append(piece)
+        cur_tokens += n
+    if cur:
+        chunks.append("\n\n".join(cur))
+    return chunks
+
+class TokenUsage:
+    """글 1건 처리에 든 호출 수/토큰 (조각 요약이 병렬이라 lock)"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.chunks = 0
+        self.prompt_tokens = 0
+        self.output_tokens = 0
+
+    def add(self, resp):
+        meta = getattr(resp, "usage_metadata", None)
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += getattr(meta, "prompt_token_count", 0) or 0
+            self.output_tokens += ((getattr(meta, "candidates_token_count", 0) or 0)
+                                   + (getattr(meta, "thoughts_token_count", 0) or 0))
+
+_map_pool = None
+_map_pool_lock = threading.Lock()
+
+def _get_map_pool():
+    global _map_pool
+    if _map_pool is None:
+        with _map_pool_lock:
+            if _map_pool is None:
+                _map_pool = ThreadPoolExecutor(max_workers=getattr(settings, "AI_MAP_WORKERS", 4),
+                                               thread_name_prefix="ai-map")
+    return _map_pool
+
+def record_usage(post_id: int, usage, model: str = ""):
+    """실제 API를 호출한 경우에만 글별 사용량 행을 남긴다"""
+    if usage is None or not usage.calls:
+        return
+    from .models import AIUsage
+    AIUsage.objects.create(post_id=post_id, model=model[:50], calls=usage.calls, chunks=usage.chunks,
+                           prompt_tokens=usage.prompt_tokens, output_tokens=usage.output_tokens)
 
 # -------------------------
 # Gemini provider
@@ -38,11 +143,18 @@ class GeminiAI:
         import google.generativeai as genai
         genai.configure(api_key=api_key)
         self.genai = genai
+        self.safety = _safety_off()
         self.summary_model = summary_model or "gemini-2.5-flash"
         self.tag_model = tag_model or "gemini-2.5-flash"
         logger.info("Gemini configured: summary=%s, tags=%s", self.summary_model, self.tag_model)
 
-    def _gen(self, model: str, system: str, user: str, *, json_mode: bool = False, max_tokens: int = 256) -> str:
+    def _gen(self, model: str, system: str, user: str, *, json_mode: bool = False, max_tokens: int = 256,
+             usage=None) -> str:
+        return self._generate(model, (system or "") + "\n\n" + (user or ""),
+                              json_mode=json_mode, max_tokens=max_tokens, usage=usage)
+
+    def _generate(self, model: str, prompt: str, *, json_mode: bool = False, max_tokens: int = 256,
+                  usage=None) -> str:
         generation_config = {"max_output_tokens": max_tokens}
         if json_mode:
             generation_config["response_mime_type"] = "application/json"
@@ -50,12 +162,13 @@ class GeminiAI:
         m = self.genai.GenerativeModel(
             model,
             generation_config=generation_config,
-            safety_settings=SAFETY_OFF,  # ✅ 안전필터 완화
+            safety_settings=self.safety,  # ✅ 안전필터 완화
         )
 
         try:
-            # 문자열 합치기 대신 contents 구조로 주는 것도 가능하지만, 현재 형태 유지
-            resp = m.generate_content((system or "") + "\n\n" + (user or ""))
+            resp = m.generate_content(prompt)
+            if usage is not None:
+                usage.add(resp)
 
             # ✅ candidates 기반 안전 파싱
             cands = getattr(resp, "candidates", None) or []
@@ -73,7 +186,7 @@ class GeminiAI:
             parts = getattr(cand, "content", None)
             parts = getattr(parts, "parts", []) if parts else []
             texts = [p.text for p in parts if hasattr(p, "text") and isinstance(p.text, str)]
-            out = " ".join(texts).strip()
+            out = ("" if json_mode else " ").join(texts).strip()
             return out
 
         except Exception as e:
@@ -150,7 +263,9 @@ class GeminiAI:
             arr = data
         else:
             arr = []
+        return self._clean_tags(arr, k)
 
+    def _clean_tags(self, arr, k: int) -> List[str]:
         cleaned, seen = [], set()
         for t in arr:
             slug = self._slugify_token(t)
@@ -161,35 +276,25 @@ class GeminiAI:
 
     @staticmethod
     def _simple_keywords(text: str, k: int) -> List[str]:
-        words = re.findall(r"[A-Za-z0-9가-힣_\-]{2,}", (text or "").lower())
-        stop = {"그리고","하지만","그러나","the","and","that","this","with","from","for","are"}
-        freq = {}
-        for w in words:
-            if w in stop:
-                continue
-            freq[w] = freq.get(w, 0) + 1
-        # 빈도 내림차순 → 알파 정렬
-        out = [w for w, _ in sorted(freq.items(), key=lambda x: (-x[1], x[0]))]
-        # 슬러그 규칙 재확인
-        out2, seen = [], set()
-        for t in out:
-            slug = re.sub(r"[^a-z0-9\-가-힣_]", "", t)
-            if 2 <= len(slug) <= 20 and slug not in seen:
-                out2.append(slug)
-                seen.add(slug)
-            if len(out2) >= k:
-                break
-        return out2
+        # 최후 폴백도 로컬 TF-IDF 추천기 사용 (단순 빈도 대신 코퍼스 idf + 기존 태그 가중)
+        return get_tagger().suggest(text or "", k)
     
-    def analyze(self, text: str, max_chars: int = 120, k: int = 6) -> tuple[str, List[str]]:
+    def analyze(self, text: str, max_chars: int = 120, k: int = 6, usage=None) -> tuple[str, List[str]]:
         """
-        요약 + 태그를 한 번의 호출에서 JSON으로 받는다.
-        반환: (summary, tags)
+        요약 + 태그를 한 번의 호출에서 JSON으로 받는다. 반환: (summary, tags)
+        추정 토큰이 AI_CHUNK_TOKENS를 넘는 글은 문단 단위 조각을 병렬로 요약(map)한 뒤
+        부분 요약들만 넣어 최종 호출(reduce)한다. 실패하면 추가 호출 없이 로컬 결과로 대신한다.
         """
         if not text:
             return "", []
+        usage = usage if usage is not None else TokenUsage()
+
+        budget = getattr(settings, "AI_CHUNK_TOKENS", 3000)
+        content, note = text, None
+        if estimate_tokens(text) > budget:
+            content = self._map_chunks(text, budget, usage)
+            note = "content는 긴 글을 순서대로 나눠 요약한 부분 요약들이다. 전체 글의 요약으로 합쳐라."
 
-        model = self.summary_model  # 같은 모델 하나로 처리
         prompt = {
             "task": "blog_summarize_and_tag",
             "lang": "ko",
@@ -197,80 +302,123 @@ class GeminiAI:
                 "summary": f"{max_chars}자 이하, 1~2문장, 핵심만.",
                 "tags": "3~7개, 2~20자, 소문자/한글, 공백 제거(하이픈 허용), JSON 배열만.",
             },
-            "content": text,
+            "content": content,
             "output_format": {"type": "json", "schema": {"summary": "string", "tags": ["string"]}}
         }
+        if note:
+            prompt["note"] = note
 
-        # JSON 강제 + 안전필터 완화
-        m = self.genai.GenerativeModel(
-            model,
-            generation_config={"response_mime_type": "application/json", "max_output_tokens": 256},
-            safety_settings=SAFETY_OFF,
-        )
+        # JSON 강제 + 안전필터 완화 (같은 모델 하나로 처리)
+        raw = self._generate(self.summary_model, json.dumps(prompt, ensure_ascii=False),
+                             json_mode=True, max_tokens=ANALYZE_OUTPUT_TOKENS, usage=usage)
         try:
-            resp = m.generate_content(json.dumps(prompt, ensure_ascii=False))
-            cands = getattr(resp, "candidates", None) or []
-            if not cands:
-                logger.warning("Gemini analyze: no candidates")
-                return "", []
-            cand = cands[0]
-            fr = getattr(cand, "finish_reason", None)
-            if fr is not None and fr != 1:
-                logger.warning("Gemini analyze: non-STOP finish_reason=%s", fr)
-                return "", []
-
-            parts = getattr(cand, "content", None)
-            parts = getattr(parts, "parts", []) if parts else []
-            raw = ""
-            for p in parts:
-                if hasattr(p, "text") and isinstance(p.text, str):
-                    raw += p.text
-            raw = (raw or "").strip()
             data = json.loads(raw)
-
             summary = (data.get("summary") or "").strip()
-            tags_in = data.get("tags") or []
-
-            # 슬러그화/중복제거
-            def slugify_token(s: str) -> str:
-                s = str(s).strip().lower()
-                s = re.sub(r"\s+", "-", s)
-                s = re.sub(r"[^a-z0-9\-가-힣_]", "", s)
-                s = re.sub(r"-{2,}", "-", s).strip("-")
-                return s[:30]
-            seen, tags = set(), []
-            for t in tags_in:
-                slug = slugify_token(t)
-                if 2 <= len(slug) <= 20 and slug not in seen:
-                    tags.append(slug); seen.add(slug)
-            return (summary[:max_chars], tags[:k])
+            tags = self._clean_tags(data.get("tags") or [], k)
+        except Exception:
+            logger.warning("Gemini analyze: unusable response raw=%r", raw[:200])
+            summary, tags = "", []
+        if not summary:
+            # 폴백: 로컬 추출 요약/태그 (API 재호출 없음)
+            return LocalAI().analyze(text, max_chars, k)
+        return summary[:max_chars], tags
 
-        except Exception as e:
-            logger.exception("Gemini analyze failed: %s", e)
-            # 폴백: 기존 방식(요약1+태그1)로라도 반환
-            return self.summarize(text, max_chars), self.suggest_tags(text, k)
+    def _map_chunks(self, text: str, budget: int, usage) -> str:
+        # 조각 수는 AI_MAX_CHUNKS 이하로 (넘치면 조각을 키움)
+        max_chunks = getattr(settings, "AI_MAX_CHUNKS", 8)
+        budget = max(budget, -(-estimate_tokens(text) // max_chunks))
+        chunks = split_chunks(text, budget)
+        usage.chunks = len(chunks)
+        n = len(chunks)
+
+        def summarize_chunk(i, chunk):
+            prompt = (f"다음은 긴 블로그 글의 {i + 1}/{n}번째 부분이다. "
+                      f"이 부분의 핵심 내용을 한국어 3문장 이내로 요약해줘.\n\n{chunk}")
+            out = self._generate(self.summary_model, prompt, max_tokens=MAP_OUTPUT_TOKENS, usage=usage)
+            return out or summarizer.summarize(chunk, 300)  # 실패한 조각은 로컬 추출 요약
+
+        parts = list(_get_map_pool().map(in_context(summarize_chunk), range(n), chunks))  # 로그에 요청 id 유지
+        return "\n\n".join(f"[{i + 1}/{n}] {p}" for i, p in enumerate(parts))
 
 # -------------------------
 # Provider selector
 # -------------------------
-def get_ai():
-    masked = (getattr(settings, "GEMINI_API_KEY", "") or "").strip()
-    logger.info("Gemini key loaded: len=%d, head=%s, tail=%s",
-            len(masked), masked[:4], masked[-4:])
-    """환경설정에 따라 실제 AI 또는 더미 반환"""
-    ai_enable = bool(getattr(settings, "AI_ENABLE", False))
-    provider = (getattr(settings, "AI_PROVIDER", "dummy") or "dummy").lower()
+_provider = None       # (설정 키, 인스턴스) — 요청마다 SDK configure/객체 생성을 반복하지 않도록
+_provider_lock = threading.Lock()
+
+def _provider_config():
+    return (
+        bool(getattr(settings, "AI_ENABLE", False)),
+        (getattr(settings, "AI_PROVIDER", "dummy") or "dummy").lower(),
+        (getattr(settings, "GEMINI_API_KEY", "") or "").strip(),
+        getattr(settings, "GEMINI_SUMMARY_MODEL", "gemini-2.5-flash"),
+        getattr(settings, "GEMINI_TAG_MODEL", "gemini-2.5-flash"),
+    )
+
+def _build_ai(config):
+    ai_enable, provider, api_key, summary_model, tag_model = config
+    # 설정이 바뀌어 provider를 새로 만들 때만 (키 값은 남기지 않음)
+    logger.info("AI provider build: enable=%s provider=%s key=%s",
+                ai_enable, provider, "set" if api_key else "missing")
     if ai_enable and provider == "gemini":
-        api_key = (getattr(settings, "GEMINI_API_KEY", "") or "").strip()
         if api_key:
             try:
-                return GeminiAI(
-                    api_key=api_key,
-                    summary_model=getattr(settings, "GEMINI_SUMMARY_MODEL", "gemini-2.5-flash"),
-                    tag_model=getattr(settings, "GEMINI_TAG_MODEL", "gemini-2.5-flash"),
-                )
+                return GeminiAI(api_key=api_key, summary_model=summary_model, tag_model=tag_model)
             except Exception as e:
                 logger.exception("Gemini init failed: %s", e)
     # 폴백
-    logger.warning("AI -> Dummy (enable=%s, provider=%s)", ai_enable, provider)
-    return DummyAI()
\ No newline at end of file
+    if provider == "dummy":
+        logger.warning("AI -> Dummy (enable=%s, provider=%s)", ai_enable, provider)
+        return DummyAI()
+    logger.warning("AI -> Local (enable=%s, provider=%s)", ai_enable, provider)
+    return LocalAI()
+
+def get_ai():
+    """환경설정에 따라 실제 AI 또는 로컬/더미 반환 (설정이 같으면 같은 인스턴스)"""
+    global _provider
+    config = _provider_config()
+    cached = _provider
+    if cached is not None and cached[0] == config:
+        return cached[1]
+    with _provider_lock:
+        if _provider is None or _provider[0] != config:
+            _provider = (config, _build_ai(config))
+        return _provider[1]
+
+# -------------------------
+# 저장 후 업그레이드 (로컬 1차 결과 → 실제 provider 결과)
+# -------------------------
+_upgrade_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ai-upgrade")
+
+def upgrade_post_ai(post_id: int):
+    """
+    커밋 이후 백그라운드에서 실제 provider로 요약/태그를 다시 만든다.
+    그 사이 글이 수정됐으면(updated_at 변경) 결과를 버린다.
+    """
+    from .models import Post
+    try:
+        post = Post.objects.only("title", "content", "updated_at").get(pk=post_id)
+        ai = get_ai()
+        if not isinstance(ai, GeminiAI):  # 그 사이 설정이 로컬/더미로 바뀜
+            return
+        text = (post.content or post.title or "").strip()
+        usage = TokenUsage()
+        summary, tags = ai.analyze(text, max_chars=120, k=6, usage=usage)
+        record_usage(post_id, usage, getattr(ai, "summary_model", ""))
+        if summary or tags:
+            updated = (Post.objects.filter(pk=post_id, updated_at=post.updated_at)
+                           .update(summary=summary, tags_suggested=tags))
+            if updated:
+                # update()는 post_save를 보내지 않으므로 피드/관련 글 인덱스를 직접 갱신
+                from django.db import transaction
+                from . import related, syndication
+                transaction.on_commit(lambda: syndication.post_changed(post_id))
+                transaction.on_commit(lambda: related.refresh_post(post_id))
+    except Exception:
+        logger.exception("AI upgrade failed id=%s", post_id)
+    finally:
+        from django.db import connection
+        connection.close()  # 워커 스레드의 DB 연결 정리
+
+def schedule_ai_upgrade(post_id: int):
+    _upgrade_pool.submit(in_context(upgrade_post_ai), post_id)  # 업그레이드 로그에도 요청 id
\ No newline at end of file
@@ -0,0 +1,60 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import ClaimsUser
+
+# 캐시에 올리지 않는 컬럼 (비밀번호 해시는 필요할 때만 DB에서)
+_UNCACHED = {"password"}
+
+
+def _user_cache_key(user_id):
+    return f"authuser:{user_id}"
+
+
+def get_cached_user_row(user_id):
+    """User 행을 dict로 (AUTH_USER_CACHE_TTL초 캐시). 없으면 None"""
+    key = _user_cache_key(user_id)
+    row = cache.get(key)
+    if row is None:
+        names = [f.attname for f in User._meta.concrete_fields if f.attname not in _UNCACHED]
+        row = User.objects.filter(pk=user_id).values(*names).first()
+        if row is None:
+            return None
+        cache.set(key, row, getattr(settings, "AUTH_USER_CACHE_TTL", 60))
+    return row
+
+
+def invalidate_cached_user(user_id):
+    cache.delete(_user_cache_key(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    기본 JWTAuthentication은 요청마다 User를 DB에서 읽는다.
+    여기서는 토큰 클레임으로 ClaimsUser를 만들고, 클레임에 없는 속성은
+    캐시된 사용자 행에서 채운다 → 캐시가 따뜻하면 인증에 쿼리 0회.
+    is_active 검사도 캐시된 행 기준 (사용자 저장/삭제 시 signals에서 캐시 무효화).
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        user = ClaimsUser.from_claims(user_id, validated_token.get("username"))
+        try:
+            if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+                raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        except User.DoesNotExist as e:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            # 비밀번호 해시 비교가 필요한 설정이면 기존 경로(DB 조회)를 그대로 사용
+            return super().get_user(validated_token)
+        return user
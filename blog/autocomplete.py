@@ -0,0 +1,166 @@
+"""
+태그 자동완성 인덱스 — GET /api/tags/autocomplete/?q= 용.
+
+태그 slug/이름을 자모 단위로 풀어 쓴 키("파이썬" → "ㅍㅏㅇㅣㅆㅓㄴ")와 초성 키("ㅍㅇㅆ")를
+정렬된 배열에 넣고 bisect로 접두어 범위를 찾는다.
+- 자모 키: 입력 중인 글자("팡" → "ㅍㅏㅇ")도 "파이썬"의 접두어로 잡힌다
+- 초성 키: 자음만 입력한 경우("ㅍㅇ")
+결과는 태그가 달린 글 수 순. 태그 생성/수정/삭제, 글의 태그 변경 시 증분 반영하고,
+다른 프로세스의 변경은 AUTOCOMPLETE_TTL 초마다 다시 빌드해 맞춘다.
+"""
+import bisect
+import heapq
+import threading
+import time
+
+from django.conf import settings
+from django.db.models import Count
+
+CHO = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONG = ("", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ", "ㄿ", "ㅀ",
+        "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ")
+# 겹모음/겹받침은 낱자로 ("과" 입력 중 "고"까지만 쳐도 매칭되도록)
+COMPOUND = {
+    "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ", "ㄽ": "ㄹㅅ",
+    "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ",
+}
+CHO_SET = frozenset(CHO)
+
+
+def _syllable(ch):
+    code = ord(ch) - 0xAC00
+    return (code // 588, (code % 588) // 28, code % 28) if 0 <= code < 11172 else None
+
+
+def to_jamo(text):
+    out = []
+    for ch in text.lower():
+        parts = _syllable(ch)
+        if parts is None:
+            out.append(COMPOUND.get(ch, ch))
+        else:
+            cho, jung, jong = parts
+            out.append(CHO[cho] + COMPOUND.get(JUNG[jung], JUNG[jung]) + COMPOUND.get(JONG[jong], JONG[jong]))
+    return "".join(out)
+
+
+def to_choseong(text):
+    out = []
+    for ch in text.lower():
+        parts = _syllable(ch)
+        out.append(ch if parts is None else CHO[parts[0]])
+    return "".join(out)
+
+
+class TagIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys = []      # 정렬된 검색 키 (자모/초성 키 모두)
+        self._ids = []       # _keys와 같은 순서의 tag id
+        self._tags = {}      # id → (slug, name)
+        self._counts = {}    # id → 글 수
+        self.built_at = 0.0
+
+    @staticmethod
+    def keys_for(slug, name):
+        keys = {to_jamo(slug), to_jamo(name)}
+        keys.add("\x01" + to_choseong(name))  # 초성 키는 별도 구간 (자모 키와 섞이지 않도록)
+        keys.add("\x01" + to_choseong(slug))
+        return keys
+
+    def build(self):
+        from .models import Tag
+        pairs, tags, counts = [], {}, {}
+        for tag_id, slug, name, n in Tag.objects.annotate(n=Count("posts")).values_list("id", "slug", "name", "n"):
+            tags[tag_id] = (slug, name)
+            counts[tag_id] = n
+            pairs.extend((key, tag_id) for key in self.keys_for(slug, name))
+        pairs.sort()
+        with self._lock:
+            self._keys = [k for k, _ in pairs]
+            self._ids = [i for _, i in pairs]
+            self._tags, self._counts = tags, counts
+            self.built_at = time.monotonic()
+        return self
+
+    # ---------- 증분 ----------
+    def _remove_keys(self, tag_id):
+        slug, name = self._tags[tag_id]
+        for key in self.keys_for(slug, name):
+            i = bisect.bisect_left(self._keys, key)
+            while i < len(self._keys) and self._keys[i] == key:
+                if self._ids[i] == tag_id:
+                    del self._keys[i]
+                    del self._ids[i]
+                    break
+                i += 1
+
+    def upsert(self, tag_id, slug, name):
+        with self._lock:
+            if tag_id in self._tags:
+                self._remove_keys(tag_id)
+            self._tags[tag_id] = (slug, name)
+            self._counts.setdefault(tag_id, 0)
+            for key in self.keys_for(slug, name):
+                i = bisect.bisect_right(self._keys, key)
+                self._keys.insert(i, key)
+                self._ids.insert(i, tag_id)
+
+    def remove(self, tag_id):
+        with self._lock:
+            if tag_id in self._tags:
+                self._remove_keys(tag_id)
+                del self._tags[tag_id]
+                del self._counts[tag_id]
+
+    def adjust(self, tag_ids, delta):
+        with self._lock:
+            for tag_id in tag_ids:
+                if tag_id in self._counts:
+                    self._counts[tag_id] = max(0, self._counts[tag_id] + delta)
+
+    # ---------- 검색 ----------
+    def _prefix_ids(self, prefix):
+        lo = bisect.bisect_left(self._keys, prefix)
+        hi = bisect.bisect_left(self._keys, prefix + "\uffff", lo)
+        return self._ids[lo:hi]
+
+    def search(self, q, limit=8):
+        """→ [{"id", "slug", "name", "post_count"}] 글 수 많은 순, 같으면 slug 순"""
+        q = (q or "").strip().lower()
+        if not q:
+            return []
+        with self._lock:
+            ids = set(self._prefix_ids(to_jamo(q)))
+            if all(ch in CHO_SET for ch in q):
+                ids.update(self._prefix_ids("\x01" + q))
+            best = heapq.nsmallest(limit, ids, key=lambda i: (-self._counts[i], self._tags[i][0]))
+            return [{"id": i, "slug": self._tags[i][0], "name": self._tags[i][1], "post_count": self._counts[i]}
+                    for i in best]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_tag_index():
+    """프로세스당 1개. AUTOCOMPLETE_TTL이 지나면 다음 요청에서 다시 빌드"""
+    global _index
+    ttl = getattr(settings, "AUTOCOMPLETE_TTL", 600)
+    if _index is None or time.monotonic() - _index.built_at > ttl:
+        with _index_lock:
+            if _index is None or time.monotonic() - _index.built_at > ttl:
+                _index = TagIndex().build()
+    return _index
+
+
+def loaded_tag_index():
+    return _index
+
+
+def reset_tag_index():
+    global _index
+    with _index_lock:
+        _index = None
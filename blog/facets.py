@@ -0,0 +1,69 @@
+"""
+카테고리/태그 facet 카운트 — GET /api/posts/facets/ 용.
+
+두 GROUP BY를 UNION ALL로 묶어 쿼리 1번에 센다.
+결과는 캐시에 두고, 키에 "세대" 번호를 넣어 글/태그/카테고리가 바뀌면 세대만 올려 한꺼번에 무효화한다
+(이전 세대 키는 TTL로 사라짐).
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import CharField, Count, Value
+
+from .models import Post
+
+GENERATION_KEY = "facets:gen"
+
+
+def generation():
+    # 캐시에서 밀려났을 때 예전 번호와 겹치지 않도록 시각으로 시작
+    return cache.get_or_set(GENERATION_KEY, int(time.time() * 1000), None)
+
+
+def bump_generation():
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, int(time.time() * 1000), None)
+
+
+def cache_key(params):
+    """facet에 영향을 주는 파라미터만 (page, ordering 등은 제외)"""
+    tags = ",".join(sorted(t.strip() for t in params.get("tags", "").split(",") if t.strip()))
+    raw = f'{params.get("search", "")}|{params.get("category", "")}|{tags}'
+    return f"facets:{generation()}:{hashlib.md5(raw.encode()).hexdigest()}"
+
+
+def count_facets(category_qs, tag_qs):
+    """
+    category_qs: 카테고리 카운트를 셀 글 범위 (카테고리 필터 제외한 컨텍스트)
+    tag_qs:      태그 카운트를 셀 글 범위 (태그 필터 제외한 컨텍스트)
+    → {"categories": [{"slug", "name", "count"}], "tags": [...]} 많은 순
+    """
+    kind = lambda name: Value(name, output_field=CharField())  # noqa: E731
+    categories = (Post.objects.filter(pk__in=category_qs.order_by().values("pk"), category__isnull=False)
+                  .order_by().values("category__slug", "category__name")
+                  .annotate(kind=kind("category"), n=Count("id"))
+                  .values_list("kind", "category__slug", "category__name", "n"))
+    tags = (Post.tags.through.objects.filter(post_id__in=tag_qs.order_by().values("pk"))
+            .order_by().values("tag__slug", "tag__name")
+            .annotate(kind=kind("tag"), n=Count("id"))
+            .values_list("kind", "tag__slug", "tag__name", "n"))
+
+    out = {"categories": [], "tags": []}
+    for k, slug, name, n in categories.union(tags, all=True):
+        out["categories" if k == "category" else "tags"].append({"slug": slug, "name": name, "count": n})
+    for items in out.values():
+        items.sort(key=lambda f: (-f["count"], f["slug"]))
+    return out
+
+
+def cached_facets(params, build):
+    key = cache_key(params)
+    data = cache.get(key)
+    if data is None:
+        data = build()
+        cache.set(key, data, getattr(settings, "FACETS_CACHE_TTL", 300))
+    return data
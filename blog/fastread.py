@@ -0,0 +1,127 @@
+"""
+읽기 전용 빠른 직렬화 경로.
+
+ModelSerializer는 행마다 필드 객체를 돌며 get_attribute → to_representation을 호출한다.
+여기서는 시리얼라이저의 필드 정의를 한 번만 분석해
+  (출력 키, .values() 키, 변환 함수, 부모 FK 키)
+목록으로 "컴파일"해 두고, 모델 인스턴스 대신 .values() dict 행을 바로 변환한다.
+출력은 기존 시리얼라이저와 바이트 단위로 같아야 한다 (blog/tests.py 계약 테스트).
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+_cache = {}
+
+
+class Unsupported(Exception):
+    """컴파일할 수 없는 필드(SerializerMethodField, source='*' 등) → 기존 경로 사용"""
+
+
+def _identity(value):
+    return value
+
+
+class FieldMapper:
+    def __init__(self, model, entries):
+        # entries: [(name, key, convert, guard_key)]
+        self.entries = entries
+        self.pk_key = model._meta.pk.attname
+        self._columns = set()
+        for f in model._meta.concrete_fields:
+            self._columns.update((f.name, f.attname))
+        keys = [self.pk_key]  # 후처리 훅(태그 등)이 행을 식별할 수 있게 pk는 항상 포함
+        for _, key, _, guard in entries:
+            for k in (key, guard):
+                if k and k not in keys:
+                    keys.append(k)
+        self.keys = keys
+
+    def supports(self, queryset):
+        """단일 키는 실제 컬럼이거나 이 쿼리셋의 annotate 이름이어야 한다 (property 등은 불가)"""
+        annotations = queryset.query.annotations
+        return all("__" in k or k in self._columns or k in annotations for k in self.keys)
+
+    def values(self, queryset):
+        return queryset.values(*self.keys)
+
+    def map_row(self, row):
+        out = {}
+        for name, key, convert, guard in self.entries:
+            if guard is not None and row[guard] is None:
+                continue  # 중간 FK가 NULL → DRF는 SkipField로 키 자체를 생략
+            value = row[key]
+            out[name] = None if value is None else convert(value)
+        return out
+
+    def map_rows(self, rows):
+        map_row = self.map_row
+        return [map_row(r) for r in rows]
+
+
+def _fk_attname(model, name):
+    f = model._meta.get_field(name)
+    if not f.concrete or not getattr(f, "many_to_one", False):
+        raise Unsupported(name)
+    return f.attname
+
+
+def _compile_field(model, name, field):
+    attrs = field.source_attrs
+    if not attrs:
+        raise Unsupported(name)
+
+    if isinstance(field, serializers.PrimaryKeyRelatedField):
+        if len(attrs) != 1:
+            raise Unsupported(name)
+        return (name, _fk_attname(model, attrs[0]), _identity, None)
+
+    if isinstance(field, serializers.SlugRelatedField):
+        if len(attrs) != 1:
+            raise Unsupported(name)
+        _fk_attname(model, attrs[0])
+        return (name, f"{attrs[0]}__{field.slug_field}", _identity, None)
+
+    if isinstance(field, (serializers.SerializerMethodField, serializers.RelatedField,
+                          serializers.ManyRelatedField,
+                          serializers.BaseSerializer, serializers.HiddenField)):
+        raise Unsupported(name)
+
+    if isinstance(field, serializers.ReadOnlyField):
+        convert = _identity
+    elif type(field) is serializers.IntegerField:
+        convert = int
+    elif type(field) is serializers.CharField:
+        convert = str
+    else:
+        convert = field.to_representation  # DateTimeField/ListField 등은 DRF 구현 그대로
+
+    if len(attrs) == 1:
+        return (name, attrs[0], convert, None)
+
+    # "post.id" 같은 점 표기: 첫 단계는 FK여야 하고, NULL이면 키 생략
+    guard = _fk_attname(model, attrs[0])
+    if len(attrs) == 2 and attrs[1] in ("id", "pk"):
+        key = guard  # JOIN 없이 FK 컬럼 재사용
+    else:
+        key = "__".join(attrs)
+    return (name, key, convert, guard)
+
+
+def get_mapper(serializer):
+    """
+    시리얼라이저 인스턴스(필드가 ?fields/omit 로 잘렸을 수도 있음)에서 매퍼를 얻는다.
+    (클래스, 남은 필드 이름) 단위로 캐시. 컴파일 불가면 None.
+    """
+    readable = tuple(n for n, f in serializer.fields.items() if not f.write_only)
+    cache_key = (type(serializer), readable)
+    if cache_key in _cache:
+        return _cache[cache_key]
+
+    model = serializer.Meta.model
+    try:
+        entries = [_compile_field(model, n, serializer.fields[n]) for n in readable]
+        mapper = FieldMapper(model, entries)
+    except (Unsupported, FieldDoesNotExist):
+        mapper = None
+    _cache[cache_key] = mapper
+    return mapper
@@ -0,0 +1,120 @@
+"""
+개인 피드 (GET /api/feed/) — push/pull 혼합.
+
+- push: 팔로워가 FEED_FANOUT_LIMIT 이하인 작성자의 새 글은 커밋 직후 팔로워마다 TimelineEntry로 넣는다.
+  타임라인은 사용자당 최근 FEED_TIMELINE_MAX개만 남긴다.
+- pull: 팔로워가 많은 작성자(fan-out 비용이 큰 경우)의 글은 넣지 않고, 읽을 때 Post(author, id)에서 가져와 합친다.
+두 쪽 모두 post id 키셋(?before=)으로 한 페이지 크기만 읽으므로 읽기 비용은 페이지 크기에 비례한다.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F, Window
+from django.db.models.functions import RowNumber
+
+from .models import Follow, Post, TimelineEntry
+
+FOLLOWER_COUNT_TTL = 3600
+
+
+def fanout_limit():
+    return getattr(settings, "FEED_FANOUT_LIMIT", 1000)
+
+
+def timeline_max():
+    return getattr(settings, "FEED_TIMELINE_MAX", 500)
+
+
+# ---------- 팔로워 수 (push/pull 판단용, 캐시) ----------
+def _count_key(user_id):
+    return f"followers:{user_id}"
+
+
+def follower_counts(user_ids):
+    """{user_id: 팔로워 수} — 캐시에 없는 것만 GROUP BY 1번"""
+    keys = {_count_key(u): u for u in user_ids}
+    found = cache.get_many(keys)
+    counts = {keys[k]: v for k, v in found.items()}
+    missing = [u for u in user_ids if u not in counts]
+    if missing:
+        rows = dict(Follow.objects.filter(followee_id__in=missing)
+                    .values_list("followee_id").annotate(n=Count("id")).values_list("followee_id", "n"))
+        fresh = {u: rows.get(u, 0) for u in missing}
+        cache.set_many({_count_key(u): n for u, n in fresh.items()}, FOLLOWER_COUNT_TTL)
+        counts.update(fresh)
+    return counts
+
+
+def adjust_follower_count(user_id, delta):
+    try:
+        cache.incr(_count_key(user_id), delta)
+    except ValueError:
+        pass  # 캐시에 없으면 다음 조회 때 다시 셈
+
+
+def is_pushed(author_id):
+    return follower_counts([author_id])[author_id] <= fanout_limit()
+
+
+# ---------- 쓰기 ----------
+def trim(user_ids):
+    """사용자별로 최근 FEED_TIMELINE_MAX개만 남기고 삭제 (한 문장)"""
+    ranked = (TimelineEntry.objects.filter(user_id__in=user_ids)
+              .annotate(rn=Window(RowNumber(), partition_by=F("user_id"), order_by=F("post_id").desc()))
+              .filter(rn__gt=timeline_max()).values("pk"))
+    TimelineEntry.objects.filter(pk__in=ranked).delete()
+
+
+def fan_out(post_id, author_id):
+    """새 글을 팔로워 타임라인에 넣는다. 팔로워가 많은 작성자는 pull 대상이라 건너뜀"""
+    if not is_pushed(author_id):
+        return 0
+    followers = list(Follow.objects.filter(followee_id=author_id).values_list("follower_id", flat=True))
+    if not followers:
+        return 0
+    TimelineEntry.objects.bulk_create(
+        [TimelineEntry(user_id=u, post_id=post_id, author_id=author_id) for u in followers],
+        batch_size=500, ignore_conflicts=True)
+    trim(followers)
+    return len(followers)
+
+
+def backfill(user_id, author_id):
+    """팔로우 직후 그 작성자의 최근 글을 타임라인에 채운다 (push 대상일 때만)"""
+    if not is_pushed(author_id):
+        return
+    recent = Post.objects.filter(author_id=author_id).order_by("-id").values_list("id", flat=True)[:timeline_max()]
+    TimelineEntry.objects.bulk_create(
+        [TimelineEntry(user_id=user_id, post_id=p, author_id=author_id) for p in recent],
+        batch_size=500, ignore_conflicts=True)
+    trim([user_id])
+
+
+def unfollow_cleanup(user_id, author_id):
+    TimelineEntry.objects.filter(user_id=user_id, author_id=author_id).delete()
+
+
+# ---------- 읽기 ----------
+def feed_page(user_id, before=None, size=20):
+    """
+    → (post id 목록(최신순), 다음 페이지 before 값 또는 None)
+    push 타임라인 한 페이지 + pull 작성자들의 글 한 페이지를 합쳐 상위 size개.
+    """
+    followees = list(Follow.objects.filter(follower_id=user_id).values_list("followee_id", flat=True))
+    if not followees:
+        return [], None
+    limit = fanout_limit()
+    pulled = [a for a, n in follower_counts(followees).items() if n > limit]
+
+    pushed = TimelineEntry.objects.filter(user_id=user_id)
+    if before is not None:
+        pushed = pushed.filter(post_id__lt=before)
+    ids = list(pushed.order_by("-post_id").values_list("post_id", flat=True)[:size + 1])
+    if pulled:
+        extra = Post.objects.filter(author_id__in=pulled)
+        if before is not None:
+            extra = extra.filter(id__lt=before)
+        ids.extend(extra.order_by("-id").values_list("id", flat=True)[:size + 1])
+        ids = sorted(set(ids), reverse=True)
+
+    page = ids[:size]
+    return page, (page[-1] if len(ids) > size else None)
@@ -0,0 +1,259 @@
+"""
+Idempotency-Key — 쓰기 요청 재전송(토큰 갱신 후 재시도, 모바일 타임아웃 재시도)이 일을 두 번 하지 않게.
+
+같은 사용자가 같은 키로 다시 보내면
+- 첫 요청이 끝났으면: 저장된 응답(상태 코드 + 본문)을 그대로 돌려준다 (Idempotent-Replayed: true)
+- 첫 요청이 아직 처리 중이면: IDEMPOTENCY_WAIT_SECONDS까지 기다렸다가 그 응답을 돌려주고, 그래도 안 끝나면 409
+- 같은 키인데 경로/본문이 다르면: 422 (키를 잘못 재사용한 클라이언트)
+5xx와 409/429 응답은 저장하지 않고 키를 풀어 다시 시도할 수 있게 한다.
+키는 IDEMPOTENCY_TTL초 뒤 만료된다.
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http.request import RawPostDataException
+from django.utils.module_loading import import_string
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.throttling import BaseThrottle
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+REPLAYED_HEADER = "Idempotent-Replayed"
+STORED_HEADERS = ("Location",)
+
+
+def ttl():
+    return getattr(settings, "IDEMPOTENCY_TTL", 86400)
+
+
+def wait_seconds():
+    return getattr(settings, "IDEMPOTENCY_WAIT_SECONDS", 10)
+
+
+def lock_seconds():
+    """처리 중 표시의 수명 — 워커가 죽어 끝내지 못한 키도 이 시간 뒤엔 다시 쓸 수 있다"""
+    return getattr(settings, "IDEMPOTENCY_LOCK_SECONDS", 120)
+
+
+# -------------------------
+# 저장소: key → (fingerprint, record) / record=None 은 처리 중
+# -------------------------
+class LocalIdempotencyStore:
+    """
+    프로세스 내 OrderedDict + Lock. 워커가 하나거나 개발 환경일 때.
+    끝난 키는 뒤로 옮기므로 앞쪽부터 만료된 항목을 걷어 내면 되고, max_keys를 넘으면 오래된 것부터 버린다.
+    처리 중인 키마다 Event를 두어 중복 요청은 폴링 없이 기다린다.
+    """
+    max_keys = 50_000
+    timer = time.monotonic
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key → [만료 시각, fingerprint, record, Event]
+
+    def claim(self, key, fingerprint, timeout):
+        """키를 잡으면 None, 이미 있으면 (fingerprint, record)"""
+        now = self.timer()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                return entry[1], entry[2]
+            self._entries[key] = [now + timeout, fingerprint, None, threading.Event()]
+            self._entries.move_to_end(key)
+            self._prune(now)
+            return None
+
+    def wait(self, key, timeout):
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+        entry[3].wait(timeout)
+        return entry[1], entry[2]
+
+    def complete(self, key, fingerprint, record, timeout):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            self._entries[key] = [self.timer() + timeout, fingerprint, record, threading.Event()]
+        if entry is not None:
+            entry[1], entry[2] = fingerprint, record  # 기다리던 요청이 보는 항목
+            entry[3].set()
+
+    def release(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        if entry is not None:
+            entry[3].set()
+
+    def _prune(self, now):
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if entry[0] > now and len(self._entries) <= self.max_keys:
+                break
+            self._entries.popitem(last=False)
+            entry[3].set()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class CacheIdempotencyStore:
+    """
+    Django 캐시(redis/memcached 등 공유 캐시) 기반. 여러 워커가 같은 키를 본다.
+    cache.add()로 처리 중 표시를 원자적으로 잡고, 중복 요청은 결과가 저장될 때까지 폴링한다.
+    """
+    poll_interval = 0.05
+
+    def __init__(self, alias=None):
+        self.cache = caches[alias or getattr(settings, "IDEMPOTENCY_CACHE_ALIAS", "default")]
+
+    def claim(self, key, fingerprint, timeout):
+        for _ in range(2):  # get 사이에 만료됐으면 한 번 더
+            if self.cache.add(key, (fingerprint, None), timeout):
+                return None
+            found = self.cache.get(key)
+            if found is not None:
+                return found
+        return None
+
+    def wait(self, key, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            found = self.cache.get(key)
+            if found is None or found[1] is not None or time.monotonic() > deadline:
+                return found
+            time.sleep(self.poll_interval)
+
+    def complete(self, key, fingerprint, record, timeout):
+        self.cache.set(key, (fingerprint, record), timeout)
+
+    def release(self, key):
+        self.cache.delete(key)
+
+    def clear(self):
+        pass
+
+
+_store = None
+
+
+def get_store():
+    global _store
+    if _store is None:
+        path = getattr(settings, "IDEMPOTENCY_STORE", "blog.idempotency.LocalIdempotencyStore")
+        _store = import_string(path)()
+    return _store
+
+
+# -------------------------
+# 뷰 믹스인
+# -------------------------
+class IdempotencyInProgress(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "같은 Idempotency-Key 요청이 아직 처리 중입니다."
+    default_code = "idempotency_in_progress"
+
+
+class IdempotencyKeyReused(APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = "Idempotency-Key가 다른 요청에 이미 사용되었습니다."
+    default_code = "idempotency_key_reused"
+
+
+class Replay(Exception):
+    def __init__(self, record):
+        self.record = record
+
+
+def fingerprint(request):
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{request.method} {request.get_full_path()}\0".encode())
+    try:
+        h.update(request.body)
+    except RawPostDataException:  # 이미 스트림으로 읽힌 본문(업로드 등)
+        h.update(JSONRenderer().render(request.data))
+    return h.hexdigest()
+
+
+class IdempotencyMixin:
+    """
+    idempotent_actions에 든 action의 POST에 Idempotency-Key 헤더가 있으면 한 번만 처리한다.
+    인증/권한 확인 뒤, throttle 앞에서 확인하므로 재전송은 throttle 토큰을 쓰지 않는다.
+    키는 사용자(익명은 IP)별로 따로다.
+    """
+    idempotent_actions = ()
+    _idempotency = None  # 이 요청이 잡은 (저장소 키, fingerprint)
+
+    def check_throttles(self, request):
+        self._begin_idempotent(request)
+        super().check_throttles(request)
+
+    def _begin_idempotent(self, request):
+        key = request.headers.get(HEADER)
+        if not key or request.method != "POST" or self.action not in self.idempotent_actions:
+            return
+        if len(key) > MAX_KEY_LENGTH:
+            raise ValidationError({HEADER: f"{MAX_KEY_LENGTH}자 이하여야 합니다."})
+        if request.user and request.user.is_authenticated:
+            ident = f"u{request.user.pk}"
+        else:
+            ident = f"ip{BaseThrottle().get_ident(request)}"
+        store_key = f"idempotency:{ident}:{hashlib.blake2b(key.encode(), digest_size=16).hexdigest()}"
+        fp = fingerprint(request)
+
+        store = get_store()
+        found = store.claim(store_key, fp, lock_seconds())
+        if found is None:
+            self._idempotency = (store_key, fp)
+            return
+        if found[0] != fp:
+            raise IdempotencyKeyReused()
+        if found[1] is None:
+            found = store.wait(store_key, wait_seconds())
+            if found is None or found[1] is None:
+                raise IdempotencyInProgress()
+        raise Replay(found[1])
+
+    def _end_idempotent(self, response):
+        if self._idempotency is None:
+            return
+        store_key, fp = self._idempotency
+        self._idempotency = None
+        code = getattr(response, "status_code", 500)
+        if code >= 500 or code in (status.HTTP_409_CONFLICT, status.HTTP_429_TOO_MANY_REQUESTS):
+            get_store().release(store_key)
+            return
+        data = getattr(response, "data", None)
+        record = {
+            "status": code,
+            # ReturnDict/Decimal/datetime 등을 캐시에 그대로 넣지 않도록 JSON 값으로
+            "data": None if data is None else json.loads(JSONRenderer().render(data)),
+            "headers": {h: response[h] for h in STORED_HEADERS if response.has_header(h)},
+        }
+        get_store().complete(store_key, fp, record, ttl())
+
+    def handle_exception(self, exc):
+        if isinstance(exc, Replay):
+            record = exc.record
+            response = Response(record["data"], status=record["status"], headers=record["headers"])
+            response[REPLAYED_HEADER] = "true"
+            return response
+        try:
+            return super().handle_exception(exc)
+        except Exception:
+            self._end_idempotent(None)
+            raise
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        self._end_idempotent(response)
+        return response
@@ -0,0 +1,58 @@
+"""
+좋아요 추가/취소를 SQL 한 문장으로 (글 객체를 읽지 않음).
+- 추가: 글이 있을 때만(삭제 표시된 글 제외), (post, user) 중복이면 아무것도 안 하는 INSERT → 영향 행 수로 새로 눌렀는지 판단
+- 취소: DELETE ... RETURNING created_at (트렌딩 점수에서 그 시각 기준으로 빼기 위해)
+RETURNING/ON CONFLICT를 못 쓰는 백엔드(MySQL)는 INSERT IGNORE / SELECT 후 DELETE로 처리한다.
+"""
+import datetime
+
+from django.db import connection
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Like, Post
+
+
+def _names():
+    q = connection.ops.quote_name
+    return q(Like._meta.db_table), q(Post._meta.db_table)
+
+
+def add_like(post_id, user_id):
+    """→ True(새로 좋아요) / False(이미 좋아요했거나 글이 없음/삭제됨)"""
+    like, post = _names()
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+    if connection.vendor == "mysql":
+        head, tail = "INSERT IGNORE INTO", ""
+    else:
+        head, tail = "INSERT INTO", " ON CONFLICT (post_id, user_id) DO NOTHING"
+    sql = (f"{head} {like} (post_id, user_id, created_at) "
+           f"SELECT %s, %s, %s WHERE EXISTS (SELECT 1 FROM {post} WHERE id = %s AND deleted_at IS NULL){tail}")
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [post_id, user_id, now, post_id])
+        return cursor.rowcount == 1
+
+
+def _aware(value):
+    # sqlite는 RETURNING 값을 문자열(UTC)로 돌려준다
+    if isinstance(value, str):
+        value = parse_datetime(value)
+    if timezone.is_naive(value):
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    return value
+
+
+def remove_like(post_id, user_id):
+    """→ 지운 좋아요의 created_at, 없었으면 None"""
+    like, _ = _names()
+    with connection.cursor() as cursor:
+        if connection.vendor == "mysql":
+            row = Like.objects.filter(post_id=post_id, user_id=user_id).values_list("pk", "created_at").first()
+            if row is None:
+                return None
+            cursor.execute(f"DELETE FROM {like} WHERE id = %s", [row[0]])
+            return row[1] if cursor.rowcount else None
+        cursor.execute(f"DELETE FROM {like} WHERE post_id = %s AND user_id = %s RETURNING created_at",
+                       [post_id, user_id])
+        row = cursor.fetchone()
+    return None if row is None else _aware(row[0])
@@ -0,0 +1,158 @@
+"""
+구조화 로그 — settings.LOGGING이 사용. 요청 스레드는 레코드를 큐에 넣기만 하고 포맷/쓰기는 전용 스레드가 한다.
+
+- request_id: RequestIdMiddleware(blog.middleware)가 요청마다 정하는 상관 id (X-Request-ID를 받거나 새로 만듦).
+  ContextVar라 같은 요청의 뷰/AI provider 로그에 붙고, 백그라운드 풀에는 in_context()로 감싸 넘긴다
+- RequestIdFilter: 레코드에 request_id를 붙임 (큐에 넣기 전, 호출한 스레드에서)
+- SamplingFilter: LOG_SAMPLE_RATES {"blog.views": 0.1, "blog.ai": 0.1} — 해당 로거(하위 포함)의 INFO 이하만 비율만큼 남김.
+  같은 요청의 줄은 함께 남거나 함께 빠지도록 request_id로 정한다. WARNING 이상은 항상 남김
+- JSONFormatter: 한 줄 JSON (ts, level, logger, msg, request_id, thread, extra=… 로 넘긴 값, exc)
+- NonBlockingQueueHandler: 크기 제한 큐 + QueueListener. 큐가 가득 차면 기다리지 않고 버리고 dropped를 센다
+"""
+import atexit
+import contextvars
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import zlib
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from django.conf import settings
+
+request_id_var = contextvars.ContextVar("request_id", default="-")
+
+# LogRecord 기본 속성 — 나머지는 extra로 넘긴 값
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id",
+                                                                         "sample_rate"}
+
+
+def get_request_id():
+    return request_id_var.get()
+
+
+def in_context(fn):
+    """지금 컨텍스트(request_id 포함)에서 fn을 실행하는 callable — 스레드 풀에 넘길 때.
+    한 Context는 동시에 한 스레드만 들어갈 수 있어 호출마다 복사본에서 실행 (map으로 여러 스레드에 나눠도 됨)"""
+    ctx = contextvars.copy_context()
+    return lambda *args, **kwargs: ctx.copy().run(fn, *args, **kwargs)
+
+
+class RequestIdFilter(logging.Filter):
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    def __init__(self, rates=None):
+        super().__init__()
+        self.rates = rates if rates is not None else getattr(settings, "LOG_SAMPLE_RATES", {})
+        self._cache = {}
+
+    def rate_for(self, name):
+        """가장 길게 일치하는 로거 이름의 비율 (없으면 1)"""
+        rate = self._cache.get(name)
+        if rate is None:
+            rate, parts = 1.0, name.split(".")
+            for i in range(len(parts), 0, -1):
+                prefix = ".".join(parts[:i])
+                if prefix in self.rates:
+                    rate = self.rates[prefix]
+                    break
+            self._cache[name] = rate
+        return rate
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rate_for(record.name)
+        if rate >= 1:
+            return True
+        request_id = getattr(record, "request_id", None) or request_id_var.get()
+        if request_id != "-":
+            keep = zlib.crc32(request_id.encode()) % 10_000 < rate * 10_000
+        else:
+            keep = random.random() < rate
+        if keep:
+            record.sample_rate = rate  # 집계할 때 1/rate 배
+        return keep
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-"),
+            "thread": record.threadName,
+        }
+        if hasattr(record, "sample_rate"):
+            entry["sample_rate"] = record.sample_rate
+        for key, value in vars(record).items():
+            if key not in _RESERVED and key not in entry:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = record.stack_info
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    호출 스레드 비용 = 필터 + 메시지 문자열 만들기 + put_nowait. 실제 포맷/쓰기는 리스너 스레드에서.
+    gunicorn --preload처럼 fork하면 자식에는 리스너 스레드가 없으므로 fork 직후 새로 띄운다.
+    """
+
+    def __init__(self, maxsize=10_000, stream=None):
+        super().__init__(queue.Queue(maxsize))
+        self.maxsize = maxsize
+        self.target = logging.StreamHandler(stream or sys.stderr)
+        self.target.setFormatter(JSONFormatter())
+        self.dropped = 0
+        self.listener = None
+        self._start()
+        atexit.register(self.flush_and_stop)
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._restart)
+
+    def _start(self):
+        self.listener = QueueListener(self.queue, self.target, respect_handler_level=True)
+        self.listener.start()
+
+    def _restart(self):
+        self.queue = queue.Queue(self.maxsize)
+        self._start()
+
+    def setFormatter(self, fmt):
+        # dictConfig의 "formatter"는 실제로 쓰는 쪽(리스너 스레드)에 적용
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record):
+        # 포맷은 리스너에서. 인자는 지금 값으로 문자열을 만들어 둠 (나중에 바뀔 수 있으므로)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush_and_stop(self):
+        if self.listener is not None:
+            self.listener.stop()  # 남은 레코드를 모두 쓴 뒤 멈춤
+            self.listener = None
+        self.target.flush()
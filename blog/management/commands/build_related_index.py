@@ -0,0 +1,22 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog.related import RelatedIndex, reset_related_index
+
+
+class Command(BaseCommand):
+    help = "전체 글로 관련 글 인덱스 파일(RELATED_INDEX_PATH)을 다시 만든다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", default=None, help="출력 파일 (기본: settings.RELATED_INDEX_PATH)")
+
+    def handle(self, *args, **opts):
+        path = opts["path"] or str(settings.RELATED_INDEX_PATH)
+        t0 = time.perf_counter()
+        index = RelatedIndex().build()
+        index.write(path)
+        reset_related_index()
+        self.stdout.write(self.style.SUCCESS(
+            f"related index: {len(index)} posts → {path} ({time.perf_counter() - t0:.2f}s)"))
@@ -0,0 +1,21 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog.tagger import TagModel, build_corpus_df
+
+
+class Command(BaseCommand):
+    help = "전체 글로 로컬 태그 추천기의 df 통계 파일(TAG_MODEL_PATH)을 다시 만든다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", default=None, help="출력 파일 (기본: settings.TAG_MODEL_PATH)")
+
+    def handle(self, *args, **opts):
+        path = opts["path"] or str(settings.TAG_MODEL_PATH)
+        t0 = time.perf_counter()
+        n_docs, df = build_corpus_df()
+        TagModel.write(path, n_docs, df)
+        self.stdout.write(self.style.SUCCESS(
+            f"tag model: {n_docs} docs, {len(df)} terms → {path} ({time.perf_counter() - t0:.2f}s)"))
@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.trending import decay, reconcile
+
+
+class Command(BaseCommand):
+    help = ("트렌딩 점수의 기준 시각을 현재로 옮기고(값 축소) 식은 글을 목록에서 뺀다(점수 0, 카운터 행은 유지). "
+            "좋아요/댓글 카운터는 원본 행 수로 맞춘다. cron 등으로 주기 실행.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--min-score", type=float, default=0.05,
+                            help="현재 시점 점수가 이보다 작으면 0으로 (기본 0.05 ≈ 좋아요 1개가 반감기 4.3번 지난 값)")
+        parser.add_argument("--no-reconcile", action="store_true", help="카운터 보정(COUNT) 생략")
+
+    def handle(self, *args, **opts):
+        t0 = time.perf_counter()
+        kept, cooled = decay(opts["min_score"])  # 이 프로세스 버퍼를 먼저 반영
+        fixed = 0 if opts["no_reconcile"] else reconcile()
+        self.stdout.write(self.style.SUCCESS(
+            f"trending: {kept} kept, {cooled} cooled, {fixed} reconciled ({time.perf_counter() - t0:.2f}s)"))
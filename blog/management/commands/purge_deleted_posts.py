@@ -0,0 +1,18 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.purge import batch_size, purge_deleted
+
+
+class Command(BaseCommand):
+    help = "삭제 표시된 글의 좋아요/댓글/알림 등을 나눠 지우고 글 행까지 정리한다 (백그라운드 정리가 중단된 경우용)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None,
+                            help="DELETE 한 번(트랜잭션 하나)에 지울 행 수 (기본 PURGE_BATCH_SIZE)")
+
+    def handle(self, *args, **opts):
+        t0 = time.perf_counter()
+        n = purge_deleted(opts["batch_size"] or batch_size())
+        self.stdout.write(self.style.SUCCESS(f"purged {n} posts ({time.perf_counter() - t0:.2f}s)"))
@@ -0,0 +1,35 @@
+import datetime
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.models import Post, RenderedContent
+
+
+class Command(BaseCommand):
+    help = ("글 본문 렌더링 결과(HTML/평문 요약/읽기 시간)를 채운다 — 렌더링 전 글, RENDER_VERSION이 바뀐 글. "
+            "어떤 글도 가리키지 않는 오래된 결과 행은 지운다.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **opts):
+        t0 = time.perf_counter()
+        size = opts["batch_size"]
+        changed, n = [], 0
+        for post in Post.all_objects.only("id", "content", "rendered").iterator(chunk_size=size):
+            if post.ensure_rendered():
+                changed.append(post)
+                n += 1
+            if len(changed) >= size:
+                Post.all_objects.bulk_update(changed, ["rendered"])
+                changed.clear()
+        Post.all_objects.bulk_update(changed, ["rendered"])
+
+        # 방금 만들어져 아직 글에 연결되기 전인 행은 건드리지 않도록 한 시간 이상 된 것만
+        used = Post.all_objects.filter(rendered__isnull=False).values("rendered")
+        cutoff = timezone.now() - datetime.timedelta(hours=1)
+        pruned, _ = RenderedContent.objects.filter(created_at__lt=cutoff).exclude(key__in=used).delete()
+        self.stdout.write(self.style.SUCCESS(
+            f"rendered {n} posts, pruned {pruned} unused results ({time.perf_counter() - t0:.2f}s)"))
@@ -0,0 +1,36 @@
+import importlib.util
+import os
+import shlex
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.serving import cpu_count, command, plan
+
+
+class Command(BaseCommand):
+    help = ("운영 서버 실행: CPU 수에 맞춰 gunicorn 워커/스레드를 정하고 config.settings_production으로 띄운다. "
+            "먼저 collectstatic --noinput (같은 설정으로).")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--asgi", action="store_true", help="uvicorn 워커로 config.asgi 실행 (기본은 gthread + wsgi)")
+        parser.add_argument("--bind", default=os.getenv("SERVE_BIND", "0.0.0.0:8000"))
+        parser.add_argument("--workers", type=int, default=int(os.getenv("SERVE_WORKERS", "0")),
+                            help="기본: wsgi 2×CPU+1, asgi CPU개")
+        parser.add_argument("--threads", type=int, default=0, help="gthread 워커당 스레드 (기본 SERVE_THREADS)")
+        parser.add_argument("--app-settings", default="config.settings_production")
+        parser.add_argument("--no-preload", action="store_true")
+        parser.add_argument("--dry-run", action="store_true", help="실행할 명령만 출력")
+
+    def handle(self, *args, **opts):
+        mode = "asgi" if opts["asgi"] else "wsgi"
+        p = plan(mode, cpu_count(), opts["workers"] or None, opts["threads"] or None)
+        argv = command(p, opts["bind"], preload=not opts["no_preload"])
+        self.stdout.write(f"{mode}: {p['cpus']} cpu → {p['workers']} workers × {p['threads']} threads")
+        if opts["dry_run"]:
+            self.stdout.write(shlex.join(argv))
+            return
+        for module in ("gunicorn",) + (("uvicorn",) if mode == "asgi" else ()):
+            if importlib.util.find_spec(module) is None:
+                raise CommandError(f"{module}이(가) 필요합니다: pip install gunicorn uvicorn")
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": opts["app_settings"]}
+        os.execve(argv[0], argv, env)
@@ -0,0 +1,201 @@
+import re
+import uuid
+
+from django.conf import settings
+from django.db import connection
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.text import compress_sequence, compress_string
+
+try:  # 선택 의존성: 설치돼 있을 때만 br / zstd 협상
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+_REQUEST_ID = re.compile(r"[A-Za-z0-9._:-]{8,64}")
+
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript",
+                      "application/xml", "+json", "+xml")
+
+
+def _brotli_sequence(sequence):
+    c = brotli.Compressor(quality=5)  # 동적 응답용: 11은 너무 느림
+    for chunk in sequence:
+        out = c.process(chunk)
+        if out:
+            yield out
+    yield c.finish()
+
+
+def _zstd_sequence(sequence):
+    c = zstandard.ZstdCompressor(level=3).compressobj()
+    for chunk in sequence:
+        out = c.compress(chunk)
+        if out:
+            yield out
+    yield c.flush()
+
+
+def parse_accept_encoding(header):
+    """'gzip;q=0.8, br' → {"gzip": 0.8, "br": 1.0}"""
+    accepted = {}
+    for part in (header or "").split(","):
+        token, _, params = part.partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[token] = q
+    return accepted
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Accept-Encoding 협상 압축 (br > zstd > gzip, 설치된 것만).
+    - COMPRESSION_MIN_SIZE 바이트 미만 응답은 그대로 (압축 이득보다 CPU가 큼)
+    - StreamingHttpResponse는 청크 단위로 압축해서 메모리를 늘리지 않음
+    - 이미 Content-Encoding이 있거나 Cache-Control: no-transform이면 건드리지 않음
+    gzip은 Django GZipMiddleware와 같은 함수(BREACH 대비 랜덤 패딩 포함)를 사용한다.
+    """
+    max_random_bytes = 100
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.min_size = getattr(settings, "COMPRESSION_MIN_SIZE", 512)
+        # 같은 q값이면 앞쪽(압축률 좋은 쪽) 우선
+        self.encodings = [name for name, ok in (("br", brotli), ("zstd", zstandard), ("gzip", True)) if ok]
+
+    def choose_encoding(self, header):
+        accepted = parse_accept_encoding(header)
+        best, best_q = None, 0.0
+        for name in self.encodings:
+            q = accepted.get(name, accepted.get("*", 0.0))
+            if q > best_q:
+                best, best_q = name, q
+        return best
+
+    def process_response(self, request, response):
+        if response.has_header("Content-Encoding"):
+            return response
+        content_type = response.get("Content-Type", "").split(";", 1)[0].strip().lower()
+        if not any(t in content_type for t in COMPRESSIBLE_TYPES):
+            return response
+        if "no-transform" in response.get("Cache-Control", ""):
+            return response
+        if response.streaming and response.is_async:
+            return response  # 비동기 스트림은 건너뜀(현재 사용처 없음)
+        if not response.streaming and len(response.content) < self.min_size:
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = self.choose_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if encoding == "br":
+                response.streaming_content = _brotli_sequence(response.streaming_content)
+            elif encoding == "zstd":
+                response.streaming_content = _zstd_sequence(response.streaming_content)
+            else:
+                response.streaming_content = compress_sequence(
+                    response.streaming_content, max_random_bytes=self.max_random_bytes)
+            del response.headers["Content-Length"]
+        else:
+            if encoding == "br":
+                compressed = brotli.compress(response.content, quality=5)
+            elif encoding == "zstd":
+                compressed = zstandard.ZstdCompressor(level=3).compress(response.content)
+            else:
+                compressed = compress_string(response.content, max_random_bytes=self.max_random_bytes)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+
+class ProfilingMiddleware:
+    """
+    스태프 요청 프로파일(X-Profile 헤더/샘플링)과 느린 쿼리 로그 (blog.profiling).
+    인증 미들웨어 뒤(목록 맨 끝)에 두어 뷰와 그 안의 SQL만 잰다.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        from . import profiling
+
+        trigger = profiling.trigger_for(request)
+        if trigger is not None:
+            return profiling.profile_request(request, self.get_response, trigger)
+        if not profiling.slow_query_ms():
+            return self.get_response(request)
+        with connection.execute_wrapper(profiling.QueryRecorder(request)):
+            return self.get_response(request)
+
+
+class StaticFilesMiddleware:
+    """
+    운영용 정적 파일 서빙 (blog.staticfiles): STATIC_URL 아래 GET/HEAD를 다른 미들웨어/URL 해석 없이 바로 처리.
+    미리 만든 압축본 협상 + 해시 이름은 immutable 캐시 + ETag/Last-Modified 조건부 요청. 목록 맨 앞에 둔다.
+    """
+
+    def __init__(self, get_response):
+        from .staticfiles import StaticIndex
+
+        self.get_response = get_response
+        self.prefix = "/" + settings.STATIC_URL.lstrip("/") if "://" not in settings.STATIC_URL else None
+        self.index = StaticIndex(getattr(settings, "STATIC_ROOT", None))
+
+    def __call__(self, request):
+        if self.prefix and request.method in ("GET", "HEAD") and request.path_info.startswith(self.prefix):
+            entry = self.index.get(request.path_info[len(self.prefix):])
+            if entry is not None:
+                from .staticfiles import serve
+
+                return serve(request, entry)
+        return self.get_response(request)
+
+
+class RequestIdMiddleware:
+    """
+    요청 상관 id (blog.logs): 믿을 만한 형식의 X-Request-ID(프록시/클라이언트가 붙인 것)는 그대로, 없으면 새로 만든다.
+    요청 동안 로그 레코드마다 request_id로 붙고, 응답 헤더로 돌려준다.
+    """
+    header = "X-Request-ID"
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        from .logs import request_id_var
+
+        request_id = request.headers.get(self.header, "")
+        if not _REQUEST_ID.fullmatch(request_id):
+            request_id = uuid.uuid4().hex
+        request.request_id = request_id
+        token = request_id_var.set(request_id)
+        try:
+            response = self.get_response(request)
+        finally:
+            request_id_var.reset(token)
+        response[self.header] = request_id
+        return response
@@ -0,0 +1,96 @@
+# Generated by Django 5.2.5 on 2026-10-19 09:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils.text import slugify
+
+
+def fill_post_slugs(apps, schema_editor):
+    # 기존 글에 unique slug 채우기 (Post.save()와 같은 규칙: 제목 slug + -2, -3 ...)
+    Post = apps.get_model("blog", "Post")
+    used = set()
+    for post in Post.objects.order_by("id").only("id", "title"):
+        base = slugify(post.title)[:70] or str(post.id)
+        candidate, i = base, 1
+        while candidate in used:
+            i += 1
+            candidate = f"{base}-{i}"
+        used.add(candidate)
+        Post.objects.filter(pk=post.pk).update(slug=candidate)
+
+
+class Migration(migrations.Migration):
+    """
+    0002가 두 갈래(0002_comment / 0002_post_summary...)로 나뉘어 있던 것을 합치고,
+    models.py에는 있지만 마이그레이션에 빠져 있던 Category/Tag/Post.slug를 보충한다.
+    """
+
+    dependencies = [
+        ("blog", "0002_post_summary_post_tags_suggested"),
+        ("blog", "0004_notification"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Category",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=50, unique=True)),
+                ("slug", models.SlugField(max_length=60, unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="Tag",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=30, unique=True)),
+                ("slug", models.SlugField(max_length=40, unique=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="category",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="posts",
+                to="blog.category",
+            ),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="tags",
+            field=models.ManyToManyField(
+                blank=True, related_name="posts", to="blog.tag"
+            ),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="slug",
+            field=models.SlugField(default="", max_length=80),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_post_slugs, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="post",
+            name="slug",
+            field=models.SlugField(max_length=80, unique=True),
+        ),
+    ]
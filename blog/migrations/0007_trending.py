@@ -0,0 +1,74 @@
+# Generated by Django 5.2.5 on 2026-10-19 02:53
+
+import time
+from collections import defaultdict
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_scores(apps, schema_editor):
+    # 기존 좋아요(1)/댓글(2)로 초기 점수와 카운터를 채운다 (epoch = 마이그레이션 시각)
+    Like = apps.get_model("blog", "Like")
+    Comment = apps.get_model("blog", "Comment")
+    PostScore = apps.get_model("blog", "PostScore")
+    TrendingEpoch = apps.get_model("blog", "TrendingEpoch")
+
+    epoch = time.time()
+    half_life = getattr(settings, "TRENDING_HALF_LIFE_HOURS", 24) * 3600
+    rows = defaultdict(lambda: [0.0, 0, 0])
+    for model, weight, slot in ((Like, 1.0, 1), (Comment, 2.0, 2)):
+        for post_id, created_at in model.objects.values_list("post_id", "created_at").iterator():
+            row = rows[post_id]
+            row[0] += weight * 2 ** ((created_at.timestamp() - epoch) / half_life)
+            row[slot] += 1
+    TrendingEpoch.objects.create(pk=1, ts=epoch)
+    PostScore.objects.bulk_create(
+        [PostScore(post_id=pk, score=s, likes=l, comments=c) for pk, (s, l, c) in rows.items()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0006_claimsuser"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PostScore",
+            fields=[
+                (
+                    "post",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="trending",
+                        serialize=False,
+                        to="blog.post",
+                    ),
+                ),
+                ("score", models.FloatField(db_index=True, default=0)),
+                ("likes", models.PositiveIntegerField(default=0)),
+                ("comments", models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="TrendingEpoch",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("ts", models.FloatField()),
+            ],
+        ),
+        migrations.RunPython(backfill_scores, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.5 on 2026-10-19 03:07
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.utils.http import int_to_base36
+
+
+def backfill_paths(apps, schema_editor):
+    # 기존 댓글은 모두 최상위 → path = 자기 id 한 단계
+    Comment = apps.get_model("blog", "Comment")
+    batch = []
+    for c in Comment.objects.only("id").iterator(chunk_size=2000):
+        c.path = int_to_base36(c.id).rjust(7, "0")
+        batch.append(c)
+        if len(batch) >= 2000:
+            Comment.objects.bulk_update(batch, ["path"])
+            batch = []
+    if batch:
+        Comment.objects.bulk_update(batch, ["path"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0008_follow_timeline"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comment",
+            name="depth",
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="comment",
+            name="parent",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="replies",
+                to="blog.comment",
+            ),
+        ),
+        migrations.AddField(
+            model_name="comment",
+            name="path",
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name="comment",
+            name="reply_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(fields=["post", "path"], name="comment_post_path"),
+        ),
+        migrations.RunPython(backfill_paths, migrations.RunPython.noop),
+    ]
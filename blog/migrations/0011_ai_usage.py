@@ -0,0 +1,42 @@
+# Generated by Django 5.2.5 on 2026-10-19 03:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0010_post_revisions"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AIUsage",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("model", models.CharField(blank=True, max_length=50)),
+                ("calls", models.PositiveSmallIntegerField()),
+                ("chunks", models.PositiveSmallIntegerField(default=0)),
+                ("prompt_tokens", models.PositiveIntegerField()),
+                ("output_tokens", models.PositiveIntegerField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "post",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ai_usage",
+                        to="blog.post",
+                    ),
+                ),
+            ],
+        ),
+    ]
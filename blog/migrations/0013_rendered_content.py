@@ -0,0 +1,39 @@
+# Generated by Django 5.2.5 on 2026-10-19 03:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0012_post_deleted_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RenderedContent",
+            fields=[
+                (
+                    "key",
+                    models.CharField(max_length=32, primary_key=True, serialize=False),
+                ),
+                ("html", models.TextField()),
+                ("excerpt", models.TextField(blank=True)),
+                ("reading_minutes", models.PositiveIntegerField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="rendered",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="blog.renderedcontent",
+            ),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.5 on 2026-10-19 03:33
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0013_rendered_content"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RequestProfile",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("trigger", models.CharField(max_length=10)),
+                ("method", models.CharField(max_length=10)),
+                ("path", models.TextField()),
+                ("view_name", models.CharField(blank=True, max_length=200)),
+                ("status", models.PositiveSmallIntegerField()),
+                ("duration_ms", models.FloatField()),
+                ("sql_count", models.PositiveIntegerField()),
+                ("sql_ms", models.FloatField()),
+                ("queries", models.JSONField(default=list)),
+                ("stats", models.BinaryField()),
+                ("summary", models.TextField(blank=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.5 on 2026-10-19 03:40
+
+from django.db import migrations
+
+
+def install(apps, schema_editor):
+    # SQLite FTS5 외부 콘텐츠 표 + 동기화 트리거 / PostgreSQL GIN 식 인덱스 (blog.search)
+    from blog.search import install
+    install(schema_editor)
+
+
+def uninstall(apps, schema_editor):
+    from blog.search import install
+    install(schema_editor, reverse=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0014_request_profile"),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
@@ -0,0 +1,167 @@
+from itertools import islice
+
+from django.conf import settings
+from django.core.paginator import InvalidPage
+from django.http import StreamingHttpResponse
+from rest_framework import permissions
+from rest_framework.exceptions import NotFound
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from .fastread import get_mapper
+from .renderers import StreamingJSONRenderer
+
+
+def parse_fieldset(request):
+    """
+    ?fields=id,title  /  ?omit=content  → (fields, omit) 집합 쌍
+    요청이 없거나 쓰기 요청이면 (None, None) — 쓰기 입력 필드를 잘라내면 안 되므로 읽기에서만 적용
+    """
+    if request is None or request.method not in permissions.SAFE_METHODS:
+        return None, None
+
+    def _split(name):
+        raw = request.query_params.get(name)
+        if not raw:
+            return None
+        return {s.strip() for s in raw.split(",") if s.strip()} or None
+
+    return _split("fields"), _split("omit")
+
+
+def _related_paths(tree, prefix=""):
+    """query.select_related {"author": {"profile": {}}} → ["author", "author__profile"]"""
+    paths = []
+    for name, sub in tree.items():
+        paths.append(prefix + name)
+        paths += _related_paths(sub, f"{prefix}{name}__")
+    return paths
+
+
+class SparseFieldsetMixin:
+    """
+    모든 뷰셋 공용: ?fields= / ?omit= 으로 응답 필드와 SQL 컬럼을 함께 줄인다.
+    - 직렬화: 시리얼라이저(DynamicFieldsMixin)가 context의 request를 보고 필드를 제거
+    - 쿼리: 남은 필드의 source 중 실제 모델 컬럼만 골라 .only() 적용 (annotate 값은 영향 없음)
+    get_queryset을 직접 재정의하는 뷰셋도 있으므로 filter_queryset 단계(list/get_object 공통)에 건다.
+    """
+
+    def filter_queryset(self, queryset):
+        qs = super().filter_queryset(queryset)
+        fields, omit = parse_fieldset(getattr(self, "request", None))
+        if not fields and not omit:
+            return qs
+        related = qs.query.select_related
+        if related is True:  # select_related() 전체 — 어떤 FK를 따라가는지 알 수 없으므로 자르지 않음
+            return qs
+        only = self._sparse_only_fields(qs.model, _related_paths(related or {}))
+        return qs.only(*only) if only else qs
+
+    def _sparse_only_fields(self, model, related=()):
+        serializer = self.get_serializer()
+        concrete = {f.name: f for f in model._meta.concrete_fields}
+        only = {model._meta.pk.name, *related}  # select_related로 따라가는 FK는 defer할 수 없음
+        for field in serializer.fields.values():
+            if field.write_only or field.source == "*":
+                continue
+            head = field.source.split(".", 1)[0]
+            if head in concrete:
+                only.add(head)  # FK는 *_id 컬럼만 로드됨
+        return sorted(only)
+
+
+class FastReadMixin:
+    """
+    settings.API_FAST_READ=True 일 때 목록 응답을 .values() + 컴파일된 필드 매퍼로 만든다.
+    매퍼로 표현할 수 없는 시리얼라이저/쿼리셋이면 조용히 기존 ModelSerializer 경로로 돌아간다.
+    뷰셋은 fast_read_extend()로 values에 없는 값(M2M 태그 등)을 한 번에 채운다.
+    """
+
+    def list(self, request, *args, **kwargs):
+        response = self.fast_list_response(self.filter_queryset(self.get_queryset()))
+        if response is not None:
+            return response
+        return super().list(request, *args, **kwargs)
+
+    def fast_list_response(self, queryset):
+        if not getattr(settings, "API_FAST_READ", False):
+            return None
+        serializer = self.get_serializer()
+        mapper = get_mapper(serializer)
+        if mapper is None or not mapper.supports(queryset):
+            return None
+
+        rows = mapper.values(queryset)
+        page = self.paginate_queryset(rows)
+        rows = list(rows) if page is None else page
+        data = mapper.map_rows(rows)
+        self.fast_read_extend(serializer, rows, data)
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+    def fast_read_extend(self, serializer, rows, data):
+        """values 행(rows)과 변환 결과(data)는 같은 순서 — 필요하면 뷰셋에서 재정의"""
+
+
+class StreamingListMixin(FastReadMixin):
+    """
+    ?stream=1 이거나 page_size가 STREAMING_PAGE_SIZE 이상이면 목록을 StreamingHttpResponse로 흘려보낸다.
+    - 페이지 슬라이스를 .iterator()로 읽고 행 단위로 직렬화/인코딩 → 최대 메모리가 페이지 크기와 무관
+    - API_FAST_READ면 values 매퍼 + fast_read_extend를 청크 단위로 적용
+    - 응답 바이트는 일반 목록 응답과 동일 (JSON 렌더러가 선택된 경우에만 동작)
+    """
+    stream_chunk_size = 200
+
+    def list(self, request, *args, **kwargs):
+        if self.should_stream(request):
+            return self.streaming_list_response(self.filter_queryset(self.get_queryset()))
+        return super().list(request, *args, **kwargs)
+
+    def should_stream(self, request):
+        if not isinstance(getattr(request, "accepted_renderer", None), JSONRenderer):
+            return False  # 브라우저블 API 등은 기존 경로
+        if request.query_params.get("stream") in ("1", "true", "yes", "on"):
+            return True
+        if self.paginator is None:
+            return False
+        page_size = self.paginator.get_page_size(request)
+        return bool(page_size) and page_size >= getattr(settings, "STREAMING_PAGE_SIZE", 200)
+
+    def streaming_list_response(self, queryset):
+        head = None
+        if self.paginator is not None:
+            queryset, head = self._stream_page(queryset)
+        serializer = self.get_serializer()
+        rows = self._stream_rows(serializer, queryset)
+        renderer = StreamingJSONRenderer()
+        return StreamingHttpResponse(renderer.iter_render(rows, head), content_type=renderer.media_type)
+
+    def _stream_page(self, queryset):
+        # PageNumberPagination.paginate_queryset과 같지만 list(page)로 실체화하지 않는다
+        p, request = self.paginator, self.request
+        p.request = request
+        page_size = p.get_page_size(request)
+        if not page_size:
+            return queryset, None
+        paginator = p.django_paginator_class(queryset, page_size)
+        page_number = p.get_page_number(request, paginator)
+        try:
+            p.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(p.invalid_page_message.format(page_number=page_number, message=str(exc)))
+        head = {"count": paginator.count, "next": p.get_next_link(), "previous": p.get_previous_link()}
+        return p.page.object_list, head
+
+    def _stream_rows(self, serializer, queryset):
+        n = self.stream_chunk_size
+        mapper = get_mapper(serializer) if getattr(settings, "API_FAST_READ", False) else None
+        if mapper is not None and mapper.supports(queryset):
+            it = mapper.values(queryset).iterator(chunk_size=n)
+            while batch := list(islice(it, n)):
+                data = mapper.map_rows(batch)
+                self.fast_read_extend(serializer, batch, data)
+                yield from data
+        else:
+            for obj in queryset.iterator(chunk_size=n):
+                yield serializer.to_representation(obj)
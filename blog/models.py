@@ -1,7 +1,12 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
 from django.conf import settings
+from django.contrib.auth.models import User
+from django.utils.http import int_to_base36
 from django.utils.text import slugify
 
+from .rendering import render, render_key
+
 class Category(models.Model):
     name = models.CharField(max_length=50, unique=True)
     slug = models.SlugField(max_length=60, unique=True)
@@ -41,15 +46,79 @@ class Like(models.Model):
         return f"Like#{self.id} by {self.user} on Post#{self.post_id}"
 
 class Comment(models.Model):
+    """
+    답글은 parent로 연결하고, 루트부터 자기까지의 id를 고정 폭 36진수로 이어 붙인 path를 둔다
+    ("0000001" → "0000001000000k" ...). path 순 = 스레드 표시 순이라
+    (post, path) 인덱스 범위 조회 한 번으로 하위 트리 전체를 읽는다.
+    reply_count는 하위 답글 전체 수 (조상들에 증분 반영).
+    """
+    PATH_STEP = 7                          # 36^7 ≈ 780억 id까지
+    MAX_DEPTH = 255 // PATH_STEP - 1       # 이보다 깊은 답글은 MAX_DEPTH 단계에 둔다
+
     post = models.ForeignKey('Post', on_delete=models.CASCADE, related_name='comments')  # 어떤 글의 댓글인가
     author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='comments')  # 작성자
+    parent = models.ForeignKey('self', null=True, blank=True, on_delete=models.CASCADE, related_name='replies')
+    path = models.CharField(max_length=255, blank=True, editable=False)
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)   # 0 = 최상위 댓글
+    reply_count = models.PositiveIntegerField(default=0, editable=False)
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)   # 생성 시각
     updated_at = models.DateTimeField(auto_now=True)       # 수정 시각
 
+    class Meta:
+        indexes = [models.Index(fields=["post", "path"], name="comment_post_path")]
+
     def __str__(self):
         return f"Comment#{self.id} by {self.author} on Post#{self.post_id}"
 
+    @classmethod
+    def encode_step(cls, pk):
+        return int_to_base36(pk).rjust(cls.PATH_STEP, "0")
+
+    @classmethod
+    def path_ids(cls, path):
+        step = cls.PATH_STEP
+        return [int(path[i:i + step], 36) for i in range(0, len(path), step)]
+
+    @staticmethod
+    def subtree_end(path):
+        """path로 시작하는 모든 path보다 큰 값 (범위 조회의 상한, '~' > 0-9a-z)"""
+        return path + "~"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding or self.path:
+            return super().save(*args, **kwargs)
+        prefix = ""
+        if self.parent_id:
+            prefix = self.parent.path
+            if self.parent.depth >= self.MAX_DEPTH:  # 너무 깊으면 MAX_DEPTH 단계의 형제로
+                prefix = prefix[:self.MAX_DEPTH * self.PATH_STEP]
+                self.parent_id = self.path_ids(prefix)[-1]
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self.path = prefix + self.encode_step(self.pk)
+            self.depth = len(prefix) // self.PATH_STEP
+            Comment.objects.filter(pk=self.pk).update(path=self.path, depth=self.depth)
+            if prefix:
+                Comment.objects.filter(pk__in=self.path_ids(prefix)).update(reply_count=F("reply_count") + 1)
+
+class RenderedContent(models.Model):
+    """본문 렌더링 결과 (blog.rendering). 키 = 렌더러 버전 + 본문 해시 → 같은 본문은 한 행을 공유"""
+    key = models.CharField(max_length=32, primary_key=True)
+    html = models.TextField()
+    excerpt = models.TextField(blank=True)                 # 마크다운 기호를 뺀 평문 앞부분
+    reading_minutes = models.PositiveIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.key
+
+
+class VisiblePostManager(models.Manager):
+    """삭제 표시(deleted_at)된 글 제외 — 목록/상세/피드 등 조회의 기본 (blog.purge가 나중에 실제로 지움)"""
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
 class Post(models.Model):
     author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='posts')
     title = models.CharField(max_length=200)                 # 글 제목(검색/리스트에 보임)
@@ -63,11 +132,18 @@ class Post(models.Model):
     slug = models.SlugField(max_length=80, unique=True)
 
     # AI 결과 저장 필드
+    rendered = models.ForeignKey(RenderedContent, null=True, blank=True, editable=False,
+                                 on_delete=models.SET_NULL, related_name="+")  # 본문 HTML/평문 요약/읽기 시간
+
     summary = models.TextField(blank=True)  # 요약문 (없을 수도 있으니 blank=True)
     tags_suggested = models.JSONField(default=list, blank=True)  # 추천 태그 리스트
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    deleted_at = models.DateTimeField(null=True, blank=True, db_index=True)  # 삭제 요청 시각 (정리 전까지 숨김)
+
+    objects = VisiblePostManager()
+    all_objects = models.Manager()
 
     def __str__(self):
         return f"{self.id} - {self.title}"
@@ -78,9 +154,161 @@ class Post(models.Model):
             candidate = base
             i = 1
             from django.db.models import Q
-            while Post.objects.filter(slug=candidate).exclude(pk=self.pk).exists():
+            while Post.all_objects.filter(slug=candidate).exclude(pk=self.pk).exists():
                 i += 1
                 candidate = f"{base}-{i}"
             self.slug = candidate
+        # 본문이 저장될 때만 렌더링 결과 연결 (AI 결과 등 다른 필드만 저장할 땐 건너뜀)
+        update_fields = kwargs.get("update_fields")
+        if "content" not in self.get_deferred_fields() and (update_fields is None or "content" in update_fields):
+            if self.ensure_rendered() and update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "rendered"}
         super().save(*args, **kwargs)
 
+    def ensure_rendered(self):
+        """본문 해시에 맞는 RenderedContent 연결 (없으면 렌더링해 만듦) → 바뀌었으면 True"""
+        key = render_key(self.content)
+        if self.rendered_id == key:
+            return False
+        self.rendered, _ = RenderedContent.objects.get_or_create(key=key, defaults=render(self.content))
+        return True
+
+
+class PostRevision(models.Model):
+    """
+    글 수정 이력 (blog.revisions). data는 zlib 압축 — base == number면 전문 스냅샷,
+    아니면 직전 판에 대한 diff (base = 복원을 시작할 스냅샷 번호).
+    """
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="revisions")
+    number = models.PositiveIntegerField()                # 글마다 1부터
+    base = models.PositiveIntegerField()
+    editor = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL,
+                               related_name="+")
+    title = models.CharField(max_length=200)
+    size = models.PositiveIntegerField()                  # 본문 길이 (목록 표시용)
+    content_hash = models.CharField(max_length=32)
+    data = models.BinaryField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=("post", "number"), name="revision_post_number")]
+
+    def __str__(self):
+        return f"Post#{self.post_id} r{self.number}"
+
+
+class AIUsage(models.Model):
+    """글별 AI provider 사용량 (요약/태그 생성 1회당 1행, 실제 API 호출이 있었던 경우만)"""
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="ai_usage")
+    model = models.CharField(max_length=50, blank=True)
+    calls = models.PositiveSmallIntegerField()
+    chunks = models.PositiveSmallIntegerField(default=0)   # map 단계 조각 수 (0 = 한 번에 처리)
+    prompt_tokens = models.PositiveIntegerField()
+    output_tokens = models.PositiveIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Post#{self.post_id} {self.prompt_tokens}+{self.output_tokens} tokens"
+
+
+class PostScore(models.Model):
+    """
+    트렌딩 점수 (blog.trending). 좋아요/댓글마다 가중치 × 2^((이벤트 시각 - epoch) / 반감기)를 더해 둔다.
+    모든 행이 같은 epoch 기준이라 score 순서 = 지금 시점의 감쇠 점수 순서 → score 인덱스로 바로 정렬.
+    likes/comments는 트렌딩 목록에서 Count 집계 없이 보여줄 카운터.
+    """
+    post = models.OneToOneField(Post, on_delete=models.CASCADE, primary_key=True, related_name="trending")
+    score = models.FloatField(default=0, db_index=True)
+    likes = models.PositiveIntegerField(default=0)
+    comments = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"Post#{self.post_id} score={self.score:.3f}"
+
+
+class TrendingEpoch(models.Model):
+    """PostScore.score의 기준 시각(유닉스 초) — 행 1개. manage.py decay_scores가 현재로 옮긴다."""
+    ts = models.FloatField()
+
+
+class Follow(models.Model):
+    follower = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="following")
+    followee = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="followers")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ("follower", "followee")
+
+    def __str__(self):
+        return f"{self.follower_id} → {self.followee_id}"
+
+
+class TimelineEntry(models.Model):
+    """
+    사용자별 피드 (blog.feed). 팔로워가 적은 작성자의 새 글을 팔로워마다 미리 넣어 둔다(fan-out on write).
+    (user, post) 인덱스 순으로 post id 키셋 페이지네이션.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="timeline")
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="+")
+    author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+")  # 언팔로우 시 정리용
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["user", "post"], name="timeline_user_post")]
+        indexes = [models.Index(fields=["user", "author"], name="timeline_user_author")]
+
+    def __str__(self):
+        return f"Timeline {self.user_id}: Post#{self.post_id}"
+
+
+class ClaimsUser(User):
+    """
+    JWT 클레임(user_id, username)만으로 만든 사용자 (blog.authentication.CachedJWTAuthentication)
+    request.user.id 처럼 클레임에 있는 값은 DB 없이 바로 쓰고,
+    is_staff 등 나머지 필드는 처음 접근할 때 짧은 TTL 캐시(없으면 DB 1회)에서 한 번에 채운다.
+    proxy 모델이라 isinstance(User)가 참 → FK에 그대로 대입 가능.
+    """
+    class Meta:
+        proxy = True
+
+    @classmethod
+    def from_claims(cls, user_id, username=None):
+        names, values = ["id"], [cls._meta.pk.to_python(user_id)]  # simplejwt는 user_id를 문자열로 담음
+        if username is not None:
+            names.append("username")
+            values.append(username)
+        return cls.from_db("default", names, values)  # 나머지 필드는 deferred
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        # deferred 필드 접근(fields=[name]) → 캐시된 행으로 채움. 그 외(password 등)는 기본 동작
+        deferred = self.get_deferred_fields()
+        if fields is None or from_queryset is not None or not set(fields) <= deferred:
+            return super().refresh_from_db(using, fields, from_queryset)
+        from .authentication import get_cached_user_row
+        row = get_cached_user_row(self.pk)
+        if row is None:
+            raise User.DoesNotExist
+        if not set(fields) <= row.keys():
+            return super().refresh_from_db(using, fields, from_queryset)
+        for attname in deferred & row.keys():
+            setattr(self, attname, row[attname])
+
+
+class RequestProfile(models.Model):
+    """요청 단위 프로파일 (blog.profiling) — cProfile 통계 + 실행된 SQL. 관리자 화면에서 내려받는다"""
+    created_at = models.DateTimeField(auto_now_add=True)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL,
+                             related_name="+")
+    trigger = models.CharField(max_length=10)              # header / sample
+    method = models.CharField(max_length=10)
+    path = models.TextField()
+    view_name = models.CharField(max_length=200, blank=True)
+    status = models.PositiveSmallIntegerField()
+    duration_ms = models.FloatField()
+    sql_count = models.PositiveIntegerField()
+    sql_ms = models.FloatField()
+    queries = models.JSONField(default=list)               # [{"sql", "params", "ms", "many"}] (PROFILE_MAX_QUERIES개까지)
+    stats = models.BinaryField()                           # zlib(marshal(pstats)) → .prof
+    summary = models.TextField(blank=True)                 # 누적 시간 상위 함수 (pstats 출력)
+
+    def __str__(self):
+        return f"{self.method} {self.path} {self.duration_ms:.0f}ms"
@@ -0,0 +1,69 @@
+from functools import partial
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+from rest_framework.pagination import PageNumberPagination
+
+
+class StandardPagination(PageNumberPagination):
+    """
+    기본 PageNumberPagination + ?page_size= (MAX_PAGE_SIZE까지)
+    큰 page_size 요청은 StreamingListMixin이 스트리밍으로 응답한다.
+    """
+    page_size_query_param = "page_size"
+    max_page_size = getattr(settings, "MAX_PAGE_SIZE", 1000)
+
+
+class KnownCountPaginator(Paginator):
+    """전체 개수를 이미 아는 경우(카운터 컬럼) COUNT(*) 없이 페이지를 자른다"""
+    def __init__(self, object_list, per_page, known_count, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.__dict__["count"] = known_count  # cached_property 자리에 미리 넣어 둠
+
+
+class CounterPagination(StandardPagination):
+    def paginate_queryset(self, queryset, request, view=None, count=None):
+        if count is not None:
+            self.django_paginator_class = partial(KnownCountPaginator, known_count=count)
+        return super().paginate_queryset(queryset, request, view)
+
+
+def estimated_row_count(model, using="default"):
+    """
+    표 전체 행 수 추정 (COUNT(*) 없이). 알 수 없으면 None.
+    PostgreSQL/MySQL은 통계(reltuples/TABLE_ROWS), SQLite는 MAX(id) — 지워진 행만큼 크게 나오는 상한.
+    """
+    conn = connections[using]
+    table = model._meta.db_table
+    with conn.cursor() as cursor:
+        if conn.vendor == "postgresql":
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)", [table])
+        elif conn.vendor == "mysql":
+            cursor.execute("SELECT TABLE_ROWS FROM information_schema.TABLES "
+                           "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s", [table])
+        elif conn.vendor == "sqlite" and model._meta.pk.get_internal_type() in ("AutoField", "BigAutoField"):
+            cursor.execute(f"SELECT MAX({conn.ops.quote_name(model._meta.pk.column)}) FROM {conn.ops.quote_name(table)}")
+        else:
+            return None
+        row = cursor.fetchone()
+    if row is None or row[0] is None or row[0] < 0:  # PostgreSQL: ANALYZE 전이면 -1
+        return None
+    return int(row[0])
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    관리자 목록용: 필터/검색 없는 전체 목록이면 COUNT(*) 대신 추정 행 수로 페이지를 나눈다.
+    추정치가 ADMIN_ESTIMATED_COUNT_MIN보다 작은 표는 그냥 센다 (작으면 COUNT도 싸고, 오차가 눈에 띔).
+    """
+    @cached_property
+    def count(self):
+        qs = self.object_list
+        if isinstance(qs, QuerySet) and not qs.query.where:
+            estimate = estimated_row_count(qs.model, qs.db)
+            if estimate is not None and estimate >= getattr(settings, "ADMIN_ESTIMATED_COUNT_MIN", 100_000):
+                return estimate
+        return super().count
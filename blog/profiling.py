@@ -0,0 +1,159 @@
+"""
+운영 중 느린 요청 원인 잡기 — blog.middleware.ProfilingMiddleware가 사용.
+
+1) 요청 프로파일: 스태프가 X-Profile: 1 헤더를 보내거나 PROFILE_SAMPLE_RATE 확률로 뽑힌 요청만
+   cProfile + 실행된 SQL 전체(시간 포함)를 RequestProfile 행으로 저장 → 관리자 화면에서 .prof/.json 다운로드
+   (.prof는 pstats/snakeviz로 열 수 있는 marshal 형식). 응답에 X-Profile-Id 헤더로 행 번호를 알려 준다.
+2) 느린 쿼리 로그: 모든 요청에서 SLOW_QUERY_MS 이상 걸린 SQL을 뷰 이름, 호출 위치(프로젝트 코드 프레임)와 함께
+   blog.slow_sql 로거로 남긴다. 0이면 끔.
+프로파일 대상이 아닌 요청의 비용은 쿼리마다 perf_counter 두 번 (느린 쿼리 로그가 켜져 있을 때만).
+"""
+import cProfile
+import io
+import logging
+import marshal
+import os
+import pstats
+import random
+import time
+import traceback
+import zlib
+
+from django.conf import settings
+from django.db import connection
+
+from .models import RequestProfile
+
+slow_logger = logging.getLogger("blog.slow_sql")
+
+HEADER = "X-Profile"
+_HERE = os.path.abspath(__file__)
+
+
+def sample_rate():
+    return getattr(settings, "PROFILE_SAMPLE_RATE", 0.0)
+
+
+def slow_query_ms():
+    return getattr(settings, "SLOW_QUERY_MS", 200)
+
+
+def max_queries():
+    return getattr(settings, "PROFILE_MAX_QUERIES", 1000)
+
+
+def keep():
+    return getattr(settings, "PROFILE_KEEP", 200)
+
+
+def view_name(request):
+    match = getattr(request, "resolver_match", None)
+    return (match.view_name or match._func_path) if match else ""
+
+
+def project_stack(limit=8):
+    """현재 호출 스택 중 프로젝트 코드 프레임만 (site-packages/이 파일 제외) — 안쪽이 마지막"""
+    base = str(settings.BASE_DIR)
+    frames = [f for f in traceback.extract_stack()
+              if f.filename.startswith(base) and "site-packages" not in f.filename and f.filename != _HERE]
+    return "".join(traceback.format_list(frames[-limit:]))
+
+
+# ---------- SQL 기록 (connection.execute_wrapper) ----------
+class QueryRecorder:
+    def __init__(self, request, record=False):
+        self.request = request
+        self.record = record          # 프로파일 대상이면 모든 SQL을 남김
+        self.slow_ms = slow_query_ms()
+        self.queries = []
+        self.count = 0
+        self.total_ms = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        t0 = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            ms = (time.perf_counter() - t0) * 1000
+            self.count += 1
+            self.total_ms += ms
+            if self.record and len(self.queries) < max_queries():
+                self.queries.append({"sql": sql, "params": repr(params)[:500], "ms": round(ms, 3), "many": many})
+            if self.slow_ms and ms >= self.slow_ms:
+                slow_logger.warning("slow query %.1f ms view=%s path=%s\n%s\nparams=%.500r\n%s",
+                                    ms, view_name(self.request), self.request.path, sql, params, project_stack())
+
+
+# ---------- 요청 프로파일 ----------
+def is_staff(request):
+    """세션(관리자 화면) 또는 JWT로 인증된 스태프인지 — X-Profile 헤더가 있을 때만 확인"""
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated and user.is_staff:
+        return True
+    from .authentication import CachedJWTAuthentication
+    try:
+        result = CachedJWTAuthentication().authenticate(request)
+    except Exception:
+        return False
+    return bool(result) and result[0].is_staff
+
+
+def trigger_for(request):
+    """→ "header" / "sample" / None"""
+    if request.headers.get(HEADER) and is_staff(request):
+        return "header"
+    rate = sample_rate()
+    if rate and random.random() < rate:
+        return "sample"
+    return None
+
+
+def profile_request(request, get_response, trigger):
+    recorder = QueryRecorder(request, record=True)
+    profiler = cProfile.Profile()
+    t0 = time.perf_counter()
+    try:
+        profiler.enable()
+    except ValueError:  # 다른 프로파일러가 이미 켜져 있음
+        with connection.execute_wrapper(recorder):
+            return get_response(request)
+    try:
+        with connection.execute_wrapper(recorder):
+            response = get_response(request)
+    finally:
+        profiler.disable()
+    duration_ms = (time.perf_counter() - t0) * 1000
+
+    stats = pstats.Stats(profiler)
+    summary = io.StringIO()
+    pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(40)
+    user = getattr(request, "user", None)
+    row = RequestProfile.objects.create(
+        user_id=user.pk if user is not None and user.is_authenticated else None,
+        trigger=trigger,
+        method=request.method,
+        path=request.get_full_path(),
+        view_name=view_name(request),
+        status=response.status_code,
+        duration_ms=round(duration_ms, 3),
+        sql_count=recorder.count,
+        sql_ms=round(recorder.total_ms, 3),
+        queries=recorder.queries,
+        stats=zlib.compress(marshal.dumps(stats.stats)),
+        summary=summary.getvalue(),
+    )
+    prune()
+    response["X-Profile-Id"] = str(row.pk)
+    return response
+
+
+def prune():
+    """최근 PROFILE_KEEP개만 남김"""
+    cutoff = RequestProfile.objects.order_by("-id").values_list("id", flat=True)[keep():keep() + 1].first()
+    if cutoff is not None:
+        RequestProfile.objects.filter(id__lte=cutoff).delete()
+
+
+def prof_bytes(profile):
+    """저장된 프로파일 → .prof 파일 내용 (pstats.Stats(path)로 읽힘)"""
+    return zlib.decompress(profile.stats)
@@ -0,0 +1,100 @@
+"""
+글 삭제 (DELETE /api/posts/{id}/) — 먼저 숨기고, 딸린 행은 백그라운드에서 나눠 지운다.
+
+Post.delete()는 collector가 좋아요/댓글/알림을 모두 메모리에 올려 요청 트랜잭션 하나에서 지우므로
+반응이 많은 글은 요청이 오래 멈춘다. 대신
+1) soft_delete: deleted_at만 기록 → Post.objects(기본 매니저)와 댓글/알림/좋아요 조회에서 바로 빠진다
+2) purge_post: 커밋 후 백그라운드에서 딸린 행을 PURGE_BATCH_SIZE개씩 짧은 트랜잭션으로 지우고 마지막에 글 행을 지운다
+   글은 1)에서 이미 숨겨졌으므로 중간 상태가 독자에게 보이지 않는다.
+프로세스가 도중에 죽어 남은 글은 manage.py purge_deleted_posts 로 정리한다.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .logs import in_context
+from .models import AIUsage, Comment, Like, Notification, Post, PostRevision, PostScore, TimelineEntry
+
+logger = logging.getLogger(__name__)
+
+_purge_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="post-purge")
+
+
+def batch_size():
+    return getattr(settings, "PURGE_BATCH_SIZE", 1000)
+
+
+def soft_delete(post):
+    post.deleted_at = timezone.now()
+    post.save(update_fields=["deleted_at"])
+    post_id = post.pk
+    transaction.on_commit(lambda: _purge_pool.submit(in_context(_purge_in_background), post_id))
+
+
+def _purge_in_background(post_id):
+    try:
+        purge_post(post_id)
+    except Exception:
+        logger.exception("post purge failed id=%s", post_id)
+    finally:
+        connection.close()  # 워커 스레드의 DB 연결 정리
+
+
+def delete_in_batches(qs, size):
+    """
+    qs의 행을 size개씩: id 조회 → DELETE ... WHERE id IN (...), 배치마다 커밋.
+    collector/시그널을 거치지 않는다 (글 단위 카운터는 글과 함께 사라지므로 증분 반영 불필요).
+    """
+    model = qs.model
+    q = connection.ops.quote_name
+    table, pk = q(model._meta.db_table), q(model._meta.pk.column)
+    total = 0
+    while True:
+        ids = list(qs.values_list("pk", flat=True)[:size])
+        if not ids:
+            return total
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {table} WHERE {pk} IN ({', '.join(['%s'] * len(ids))})", ids)
+            total += cursor.rowcount
+
+
+def purge_post(post_id, size=None):
+    """
+    숨김 처리된 글의 딸린 행 → 글 행 순으로 삭제. 숨김 상태가 아니면(복구 등) 아무것도 안 함.
+    → {테이블: 지운 행 수}
+    """
+    size = size or batch_size()
+    if not Post.all_objects.filter(pk=post_id, deleted_at__isnull=False).exists():
+        return {}
+    counts = {}
+    # FK를 참조하는 쪽부터: 알림 → 댓글(깊은 답글부터, parent보다 자식이 먼저) 순
+    for qs in (
+        Notification.objects.filter(Q(post_id=post_id) | Q(comment__post_id=post_id)),
+        TimelineEntry.objects.filter(post_id=post_id),
+        PostScore.objects.filter(post_id=post_id),
+        PostRevision.objects.filter(post_id=post_id),
+        AIUsage.objects.filter(post_id=post_id),
+        Like.objects.filter(post_id=post_id),
+        Comment.objects.filter(post_id=post_id).order_by("-depth"),
+    ):
+        counts[qs.model._meta.db_table] = delete_in_batches(qs, size)
+
+    with transaction.atomic():
+        post = Post.all_objects.select_for_update().filter(pk=post_id, deleted_at__isnull=False).first()
+        if post is not None:
+            post.tags.clear()   # 태그 자동완성 글 수 반영 (m2m 시그널)
+            post.delete()       # 남은 딸린 행이 없으므로 collector는 빈 조회만 (도중에 생긴 행이 있으면 함께 삭제)
+            counts[Post._meta.db_table] = 1
+    return counts
+
+
+def purge_deleted(size=None):
+    """숨김 처리된 모든 글 정리 → 정리한 글 수"""
+    ids = list(Post.all_objects.filter(deleted_at__isnull=False).order_by("deleted_at").values_list("pk", flat=True))
+    for post_id in ids:
+        purge_post(post_id, size)
+    return len(ids)
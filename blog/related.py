@@ -0,0 +1,307 @@
+"""
+관련 글 인덱스 — GET /api/posts/{id}/related/ 용.
+
+글마다 희소 벡터(feature id 배열 + 가중치 배열)를 만든다.
+- 태그: Post.tags(가중 TAG_WEIGHT) + tags_suggested(SUGGESTED_WEIGHT), 같은 slug면 같은 feature
+- 본문: 제목 + 본문 앞부분의 TF-IDF 상위 CONTENT_TERMS개 단어 (idf는 로컬 태그 추천기 통계)
+벡터는 L2 정규화해 두고, feature → (post id 배열, 가중치 배열) 역색인으로 공유 feature가 있는 글만 점수를 더한다.
+글마다 상위 STORE_K개 결과를 보관하고, 글이 저장/삭제될 때 이웃 목록을 증분 갱신하므로 읽기는 배열 조회 한 번이다.
+
+프로세스당 1개. `manage.py build_related_index`가 만든 RELATED_INDEX_PATH 파일을 읽어 온다.
+파일이 없으면 요청 안에서 빌드하지 않는다 (대량 코퍼스에서는 분 단위) — 백그라운드 스레드 하나가 빌드해 파일로 쓰고,
+그동안 get_related_index()는 None (뷰는 503).
+파일 생성 이후의 변경은 이 프로세스에서 저장된 글만 반영되므로 주기적으로 파일을 다시 만든다.
+
+파일 형식 (네이티브 uint32/float32):
+    b"RELI1\\0\\0\\0" | n_posts | n_feats | nnz | n_top | post_ids | vec_offsets[n_posts+1] | fids[nnz] | weights[nnz]
+    | top_offsets[n_posts+1] | top_ids[n_top] | top_scores[n_top] | '\\n'으로 이은 feature 문자열(utf-8)
+"""
+import heapq
+import logging
+import math
+import os
+import threading
+from array import array
+from collections import Counter
+
+from django.conf import settings
+
+from .tagger import get_tagger, tokenize
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"RELI1\0\0\0"
+
+TAG_WEIGHT = 3.0
+SUGGESTED_WEIGHT = 1.5
+CONTENT_TERMS = 16
+CONTENT_CHARS = 2000     # 본문은 앞부분만 (긴 글도 벡터 크기가 일정하도록)
+STORE_K = 20
+MAX_POSTINGS = 1000      # 이보다 흔한 feature는 후보 생성에서 제외 (idf가 낮아 점수 기여도 작음)
+
+
+class RelatedIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._fids = {}        # feature 문자열 → id
+        self._vecs = {}        # post id → (array('I') fids, array('f') weights)
+        self._postings = {}    # fid → (array('I') post ids, array('f') weights)
+        self._topk = {}        # post id → [(score, other id), ...] 점수 내림차순
+
+    # ---------- 벡터 ----------
+    def _fid(self, feature):
+        fid = self._fids.get(feature)
+        if fid is None:
+            fid = self._fids[feature] = len(self._fids)
+        return fid
+
+    def vectorize(self, title, content, tags=(), suggested=()):
+        tagger = get_tagger()
+        weights = {}
+        for slug in suggested or ():
+            weights[f"t:{'-'.join(str(slug).lower().split())}"] = SUGGESTED_WEIGHT
+        for slug in tags or ():
+            weights[f"t:{slug.lower()}"] = TAG_WEIGHT
+
+        tf = Counter(tokenize(f"{title}\n{(content or '')[:CONTENT_CHARS]}"))
+        n = tagger.total_docs
+        scored = [((1 + math.log(c)) * (math.log((n + 1) / (tagger.df(t) + 1)) + 1.0), t) for t, c in tf.items()]
+        for w, term in heapq.nlargest(CONTENT_TERMS, scored):
+            weights[f"w:{term}"] = w
+
+        norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+        items = sorted((self._fid(f), w / norm) for f, w in weights.items())
+        return array("I", (f for f, _ in items)), array("f", (w for _, w in items))
+
+    # ---------- 색인 ----------
+    def _add_postings(self, post_id, vec):
+        for fid, w in zip(*vec):
+            ids, ws = self._postings.setdefault(fid, (array("I"), array("f")))
+            ids.append(post_id)
+            ws.append(w)
+
+    def _drop_postings(self, post_id, vec):
+        for fid in vec[0]:
+            ids, ws = self._postings[fid]
+            i = ids.index(post_id)
+            del ids[i]
+            del ws[i]
+
+    def _scores(self, post_id, vec):
+        acc = {}
+        get = acc.get
+        for fid, wq in zip(*vec):
+            ids, ws = self._postings.get(fid, ((), ()))
+            if len(ids) > MAX_POSTINGS:
+                continue
+            for pid, w in zip(ids, ws):
+                acc[pid] = get(pid, 0.0) + wq * w
+        acc.pop(post_id, None)
+        return acc
+
+    def _recompute(self, post_id):
+        scores = self._scores(post_id, self._vecs[post_id])
+        best = heapq.nlargest(STORE_K, scores, key=scores.__getitem__)
+        self._topk[post_id] = [(scores[p], p) for p in best]
+        return scores
+
+    def _update_neighbors(self, post_id, candidates, scores):
+        """
+        post_id의 점수가 바뀐 글들의 상위 목록만 고친다 (코사인은 대칭이라 후보 = 예전/지금 공유 feature가 있던 글).
+        목록이 가득 차 있었는데 항목이 빠지면 그 자리를 채울 글을 알 수 없으므로 그 글만 다시 계산.
+        """
+        for other in candidates:
+            top = self._topk.get(other)
+            if top is None:
+                continue
+            kept = [e for e in top if e[1] != post_id]
+            s = scores.get(other, 0.0)
+            if s > 0 and (len(kept) < STORE_K or s > kept[-1][0]):
+                kept.append((s, post_id))
+                kept.sort(reverse=True)
+                del kept[STORE_K:]
+            if len(top) == STORE_K and len(kept) < STORE_K:
+                self._recompute(other)
+            else:
+                self._topk[other] = kept
+
+    def upsert(self, post_id, title, content, tags=(), suggested=()):
+        with self._lock:
+            vec = self.vectorize(title, content, tags, suggested)
+            old = self._vecs.get(post_id)
+            candidates = set()
+            if old is not None:
+                candidates.update(self._scores(post_id, old))
+                self._drop_postings(post_id, old)
+            self._vecs[post_id] = vec
+            self._add_postings(post_id, vec)
+            scores = self._recompute(post_id)
+            candidates.update(scores)
+            self._update_neighbors(post_id, candidates, scores)
+
+    def remove(self, post_id):
+        with self._lock:
+            vec = self._vecs.pop(post_id, None)
+            if vec is None:
+                return
+            candidates = set(self._scores(post_id, vec))
+            self._drop_postings(post_id, vec)
+            self._topk.pop(post_id, None)
+            self._update_neighbors(post_id, candidates, {})
+
+    def related(self, post_id, k=5):
+        """상위 k개 (post id, 점수). 색인에 없는 글이면 None"""
+        with self._lock:
+            top = self._topk.get(post_id)
+        if top is None:
+            return None
+        return [(p, s) for s, p in top[:k]]
+
+    def __len__(self):
+        return len(self._vecs)
+
+    # ---------- 빌드 ----------
+    def build(self):
+        """DB 전체에서 벡터와 역색인을 만든 뒤 글마다 상위 결과를 한 번에 계산"""
+        from .models import Post
+        tags_by_post = {}
+        for post_id, slug in Post.tags.through.objects.values_list("post_id", "tag__slug").iterator(chunk_size=2000):
+            tags_by_post.setdefault(post_id, []).append(slug)
+        rows = Post.objects.values_list("id", "title", "content", "tags_suggested").iterator(chunk_size=500)
+        with self._lock:
+            for post_id, title, content, suggested in rows:
+                vec = self.vectorize(title, content, tags_by_post.get(post_id, ()), suggested)
+                self._vecs[post_id] = vec
+                self._add_postings(post_id, vec)
+            for post_id in self._vecs:
+                self._recompute(post_id)
+        return self
+
+    # ---------- 파일 ----------
+    def write(self, path):
+        """원자적으로 교체"""
+        with self._lock:
+            post_ids = array("I", self._vecs)
+            vec_off, fids, weights = array("I", [0]), array("I"), array("f")
+            top_off, top_ids, top_scores = array("I", [0]), array("I"), array("f")
+            for post_id in post_ids:
+                vf, vw = self._vecs[post_id]
+                fids.extend(vf)
+                weights.extend(vw)
+                vec_off.append(len(fids))
+                for score, other in self._topk.get(post_id, ()):
+                    top_ids.append(other)
+                    top_scores.append(score)
+                top_off.append(len(top_ids))
+            names = "\n".join(sorted(self._fids, key=self._fids.__getitem__)).encode()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"  # 여러 워커가 동시에 써도 겹치지 않게
+        with open(tmp, "wb") as f:
+            f.write(MAGIC)
+            array("I", [len(post_ids), len(self._fids), len(fids), len(top_ids)]).tofile(f)
+            for arr in (post_ids, vec_off, fids, weights, top_off, top_ids, top_scores):
+                arr.tofile(f)
+            f.write(names)
+        os.replace(tmp, path)
+
+    @classmethod
+    def read(cls, path):
+        self = cls()
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"not a related index: {path}")
+            head = array("I")
+            head.fromfile(f, 4)
+            n_posts, n_feats, nnz, n_top = head
+
+            def take(typecode, n):
+                arr = array(typecode)
+                arr.fromfile(f, n)
+                return arr
+
+            post_ids, vec_off = take("I", n_posts), take("I", n_posts + 1)
+            fids, weights = take("I", nnz), take("f", nnz)
+            top_off, top_ids, top_scores = take("I", n_posts + 1), take("I", n_top), take("f", n_top)
+            names = f.read().decode()
+        self._fids = {name: i for i, name in enumerate(names.split("\n"))} if n_feats else {}
+        for i, post_id in enumerate(post_ids):
+            a, b = vec_off[i], vec_off[i + 1]
+            vec = (fids[a:b], weights[a:b])
+            self._vecs[post_id] = vec
+            self._add_postings(post_id, vec)
+            a, b = top_off[i], top_off[i + 1]
+            self._topk[post_id] = list(zip(top_scores[a:b], top_ids[a:b]))
+        return self
+
+
+_index = None
+_index_lock = threading.Lock()
+_building = False
+
+
+def get_related_index():
+    """
+    프로세스당 1개. RELATED_INDEX_PATH 파일이 있으면 읽고, 없으면 백그라운드 빌드를 한 번 시작하고 None
+    """
+    global _index, _building
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                path = getattr(settings, "RELATED_INDEX_PATH", None)
+                if path and os.path.exists(path):
+                    _index = RelatedIndex.read(path)
+                elif not _building:
+                    _building = True
+                    logger.warning("related index file %s missing, building in background "
+                                   "(run `manage.py build_related_index` before serving)", path)
+                    threading.Thread(target=build_missing_index, args=(path,), name="related-build",
+                                     daemon=True).start()
+    return _index
+
+
+def build_missing_index(path):
+    """파일이 없을 때 DB에서 빌드해 이 프로세스에 올리고 파일로 남긴다 (다른 워커/재시작은 파일을 읽음)"""
+    global _index, _building
+    from django.db import connection
+    try:
+        index = RelatedIndex().build()
+        if path:
+            index.write(path)
+        with _index_lock:
+            _index = index
+    except Exception:
+        logger.exception("related index build failed")
+    finally:
+        _building = False  # 실패했으면 다음 요청에서 다시 시도
+        connection.close()
+
+
+def set_related_index(index):
+    global _index
+    with _index_lock:
+        _index = index
+
+
+def loaded_index():
+    """이미 빌드된 경우만 반환 — 저장 신호에서 빌드를 유발하지 않도록"""
+    return _index
+
+
+def reset_related_index():
+    global _index
+    with _index_lock:
+        _index = None
+
+
+def refresh_post(post_id):
+    """커밋된 현재 상태로 한 글의 벡터를 다시 색인 (없어졌으면 제거)"""
+    index = loaded_index()
+    if index is None:
+        return
+    from .models import Post
+    row = Post.objects.filter(pk=post_id).values_list("title", "content", "tags_suggested").first()
+    if row is None:
+        index.remove(post_id)
+        return
+    tags = Post.tags.through.objects.filter(post_id=post_id).values_list("tag__slug", flat=True)
+    index.upsert(post_id, row[0], row[1], list(tags), row[2])
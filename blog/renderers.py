@@ -0,0 +1,64 @@
+from rest_framework.renderers import JSONRenderer
+
+try:  # 선택 의존성: 없으면 DRF 기본(json.dumps) 경로 그대로 사용
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    orjson이 설치돼 있으면 orjson으로, 아니면 DRF JSONRenderer 그대로 렌더링.
+    출력 바이트는 기본 JSONRenderer(UNICODE_JSON/COMPACT_JSON 기본값)와 동일하게 맞춘다.
+    - datetime/dataclass는 orjson 자체 포맷 대신 DRF encoder로 넘김(ms 절삭, 'Z' 표기)
+    - \\u2028/\\u2029 이스케이프도 DRF와 동일하게 처리
+    - indent 요청(브라우저블 API 등)이나 비기본 설정이면 상위 클래스로 폴백
+    """
+    if orjson is not None:
+        options = (orjson.OPT_NON_STR_KEYS
+                   | orjson.OPT_PASSTHROUGH_DATETIME
+                   | orjson.OPT_PASSTHROUGH_DATACLASS)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        renderer_context = renderer_context or {}
+        if (orjson is None or self.ensure_ascii or not self.compact
+                or self.get_indent(accepted_media_type, renderer_context) is not None):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=self.options)
+        except TypeError:
+            # 64bit 초과 정수 등 orjson이 못 다루는 값 → 표준 경로
+            return super().render(data, accepted_media_type, renderer_context)
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class StreamingJSONRenderer(FastJSONRenderer):
+    """
+    목록 응답을 행 단위로 인코딩해 흘려보내는 렌더러 (StreamingHttpResponse용).
+    행 하나씩 render()해서 ','로 잇기 때문에 한 번에 렌더링한 결과와 바이트가 같다.
+    head가 있으면 페이지네이션 봉투 {"count", "next", "previous", "results": [...]} 형태.
+    """
+    flush_rows = 50  # 이 개수마다 한 청크로 묶어서 내보냄
+
+    def iter_render(self, rows, head=None):
+        if head is None:
+            opening, closing = b'[', b']'
+        else:
+            # results를 빈 배열로 렌더링한 뒤 끝의 '[]}'를 쪼개 봉투 앞/뒤로 사용
+            envelope = self.render({**head, "results": []})
+            opening, closing = envelope[:-2], b']}'
+
+        buf, first = [opening], True
+        for row in rows:
+            if not first:
+                buf.append(b',')
+            buf.append(self.render(row))
+            first = False
+            if len(buf) >= self.flush_rows * 2:
+                yield b''.join(buf)
+                buf = []
+        buf.append(closing)
+        yield b''.join(buf)
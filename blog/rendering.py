@@ -0,0 +1,187 @@
+"""
+글 본문 렌더링 — 읽을 때마다가 아니라 본문이 바뀔 때 한 번.
+
+Post.save()가 본문 해시(render_key)로 RenderedContent 행을 찾아 연결하고, 없을 때만 렌더링한다
+(같은 본문은 글이 달라도 한 행을 공유). 렌더러를 바꾸면 RENDER_VERSION을 올린다 → 키가 달라져 다시 렌더링.
+- html: 마크다운 일부(제목, 목록, 인용, 코드 블록, 굵게/기울임, 인라인 코드, 링크)만 지원.
+  입력은 전부 이스케이프한 뒤 정해진 태그만 만들어 내므로 사용자 HTML/스크립트는 그대로 통과하지 못한다.
+- excerpt: 마크다운 기호를 뺀 평문 앞부분 (목록 응답용, POST_EXCERPT_CHARS자)
+- reading_minutes: 한글/한자/가나 분당 500자 + 그 밖의 단어 분당 200개 기준
+"""
+import hashlib
+import math
+import re
+from html import escape, unescape
+
+from django.conf import settings
+from django.db.models import F, TextField
+from django.db.models.functions import Coalesce, Substr
+
+RENDER_VERSION = 1
+CJK_CHARS_PER_MINUTE = 500
+WORDS_PER_MINUTE = 200
+SAFE_URL_PREFIXES = ("http://", "https://", "mailto:", "/", "#")
+
+_FENCE = re.compile(r"^\s*```\s*([\w+-]*)")
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_HR = re.compile(r"^\s*([-*_])(\s*\1){2,}\s*$")
+_QUOTE = re.compile(r"^\s*>\s?(.*)$")
+_UL = re.compile(r"^\s*[-*+]\s+(.*)$")
+_OL = re.compile(r"^\s*\d+[.)]\s+(.*)$")
+
+_CODE = re.compile(r"`([^`\n]+)`")
+_LINK = re.compile(r"\[([^\]\n]+)\]\(([^)\s]+)\)")
+_BOLD = re.compile(r"\*\*(?=\S)(.+?)(?<=\S)\*\*")
+_ITALIC = re.compile(r"(?<![\w*])\*(?=\S)(.+?)(?<=\S)\*(?![\w*])")
+_SLOT = re.compile(r"\x00(\d+)\x00")
+_CJK = re.compile(r"[\u1100-\u11ff\u3040-\u30ff\u3130-\u318f\u3400-\u9fff\uac00-\ud7a3]")
+
+
+def excerpt_chars():
+    return getattr(settings, "POST_EXCERPT_CHARS", 120)
+
+
+def render_key(content):
+    """렌더링 결과 키 = 렌더러 버전 + 요약 길이 + 본문 해시"""
+    raw = f"{RENDER_VERSION}:{excerpt_chars()}\0{content or ''}"
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+# ---------- HTML ----------
+def _link(m):
+    text, url = m.group(1), m.group(2)
+    if not unescape(url).lower().startswith(SAFE_URL_PREFIXES):
+        return text  # javascript: 등은 링크로 만들지 않음
+    return f'<a href="{url}" rel="nofollow noopener">{text}</a>'
+
+
+def render_inline(text):
+    """한 줄 → 이스케이프된 HTML (코드 스팬 안은 다른 서식을 적용하지 않음)"""
+    codes = []
+
+    def keep(m):
+        codes.append(f"<code>{m.group(1)}</code>")
+        return f"\x00{len(codes) - 1}\x00"
+
+    s = _CODE.sub(keep, escape(text.replace("\x00", "")))
+    s = _LINK.sub(_link, s)
+    s = _BOLD.sub(r"<strong>\1</strong>", s)
+    s = _ITALIC.sub(r"<em>\1</em>", s)
+    return _SLOT.sub(lambda m: codes[int(m.group(1))], s)
+
+
+def render_html(content):
+    out, para, items, quote = [], [], [], []
+    list_tag = None
+    lines = (content or "").replace("\r\n", "\n").split("\n")
+
+    def close():
+        nonlocal list_tag
+        if para:
+            out.append("<p>" + "<br>\n".join(render_inline(s) for s in para) + "</p>")
+            para.clear()
+        if items:
+            out.append(f"<{list_tag}>" + "".join(f"<li>{render_inline(s)}</li>" for s in items) + f"</{list_tag}>")
+            items.clear()
+            list_tag = None
+        if quote:
+            out.append("<blockquote><p>" + "<br>\n".join(render_inline(s) for s in quote) + "</p></blockquote>")
+            quote.clear()
+
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        i += 1
+        fence = _FENCE.match(line)
+        if fence:
+            close()
+            code = []
+            while i < len(lines) and not _FENCE.match(lines[i]):
+                code.append(lines[i])
+                i += 1
+            i += 1  # 닫는 ``` (없으면 끝까지 코드)
+            lang = f' class="language-{fence.group(1)}"' if fence.group(1) else ""
+            out.append(f"<pre><code{lang}>{escape(chr(10).join(code))}</code></pre>")
+            continue
+        if not line.strip():
+            close()
+            continue
+        heading = _HEADING.match(line)
+        if heading:
+            close()
+            level = len(heading.group(1))
+            out.append(f"<h{level}>{render_inline(heading.group(2))}</h{level}>")
+            continue
+        if _HR.match(line):
+            close()
+            out.append("<hr>")
+            continue
+        m = _QUOTE.match(line)
+        if m:
+            if not quote:
+                close()
+            quote.append(m.group(1))
+            continue
+        for tag, pattern in (("ul", _UL), ("ol", _OL)):
+            m = pattern.match(line)
+            if m:
+                if list_tag != tag:
+                    close()
+                    list_tag = tag
+                items.append(m.group(1))
+                break
+        else:
+            if items or quote:
+                close()
+            para.append(line)
+    close()
+    return "\n".join(out)
+
+
+# ---------- 평문 ----------
+def plain_text(content):
+    """마크다운 기호를 걷어 낸 평문 (공백 하나로 합침)"""
+    words = []
+    for line in (content or "").replace("\r\n", "\n").split("\n"):
+        if _FENCE.match(line) or _HR.match(line):
+            continue
+        for pattern in (_HEADING, _QUOTE, _UL, _OL):
+            m = pattern.match(line)
+            if m:
+                line = m.group(m.lastindex)
+                break
+        line = _LINK.sub(r"\1", line)
+        line = _CODE.sub(r"\1", line)
+        line = _BOLD.sub(r"\1", line)
+        line = _ITALIC.sub(r"\1", line)
+        words.extend(line.split())
+    return " ".join(words)
+
+
+def reading_minutes(text):
+    cjk = len(_CJK.findall(text))
+    other = len(_CJK.sub(" ", text).split())
+    if not cjk and not other:
+        return 0
+    return max(1, math.ceil(cjk / CJK_CHARS_PER_MINUTE + other / WORDS_PER_MINUTE))
+
+
+def render(content):
+    """→ RenderedContent 필드 값"""
+    text = plain_text(content)
+    return {
+        "html": render_html(content),
+        "excerpt": text[:excerpt_chars()],
+        "reading_minutes": reading_minutes(text),
+    }
+
+
+def list_annotations():
+    """
+    목록 응답용 annotate: 렌더링된 평문 요약/읽기 시간을 JOIN 한 번으로.
+    아직 렌더링되지 않은 글(bulk_create 등으로 save()를 거치지 않은 글)은 본문 앞부분으로 대신한다.
+    """
+    return {
+        "excerpt": Coalesce(F("rendered__excerpt"), Substr("content", 1, excerpt_chars()), output_field=TextField()),
+        "reading_time": F("rendered__reading_minutes"),
+    }
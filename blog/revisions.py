@@ -0,0 +1,115 @@
+"""
+글 수정 이력 — GET /api/posts/{id}/revisions/ 용.
+
+각 판은 직전 판에 대한 줄 단위 diff(복사 구간 + 새 줄)를 zlib으로 압축해 저장하고,
+REVISION_SNAPSHOT_EVERY판마다(또는 diff가 전문보다 커지면) 전문 스냅샷을 둔다.
+n판 복원 = n 이하 마지막 스냅샷부터 n까지 행을 쿼리 한 번으로 읽어 diff를 차례로 적용 (최대 스냅샷 간격만큼).
+수정 없이 편집 이력이 없는 글은 행이 없다 — 첫 수정 때 수정 전 내용을 1판(스냅샷)으로 남긴다.
+"""
+import difflib
+import hashlib
+import json
+import zlib
+
+from django.conf import settings
+from django.db.models import Subquery
+
+from .models import PostRevision
+
+
+def snapshot_every():
+    return getattr(settings, "REVISION_SNAPSHOT_EVERY", 20)
+
+
+def content_hash(title, content):
+    return hashlib.blake2b(f"{title}\0{content}".encode(), digest_size=16).hexdigest()
+
+
+# ---------- 인코딩 ----------
+def encode_snapshot(content):
+    return zlib.compress(content.encode())
+
+
+def encode_delta(old, new):
+    """old → new 줄 단위 diff: [[시작, 끝], ...] 는 old 줄 복사, [문자열, ...] 는 새 줄"""
+    a, b = old.splitlines(keepends=True), new.splitlines(keepends=True)
+    ops = []
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif j2 > j1:  # replace/insert (delete는 아무것도 안 씀)
+            ops.append(["".join(b[j1:j2])])
+    return zlib.compress(json.dumps(ops, ensure_ascii=False, separators=(",", ":")).encode())
+
+
+def apply_delta(old, data):
+    lines = old.splitlines(keepends=True)
+    out = []
+    for op in json.loads(zlib.decompress(data)):
+        if len(op) == 2:
+            out.extend(lines[op[0]:op[1]])
+        else:
+            out.append(op[0])
+    return "".join(out)
+
+
+# ---------- 기록 ----------
+def record(post, before, editor=None):
+    """
+    post 저장 직후 호출. before = 저장 전 (title, content). 바뀐 게 없으면 아무것도 안 함.
+    마지막 판의 해시가 before와 다르면(관리자 화면 등 다른 경로로 수정된 경우) diff 기준이 어긋나므로 스냅샷으로 저장.
+    → 새 PostRevision 또는 None
+    """
+    if (post.title, post.content) == before:
+        return None
+    last = (PostRevision.objects.filter(post=post).order_by("-number")
+            .values("number", "content_hash", "base").first())
+    if last is None:
+        PostRevision.objects.create(post=post, number=1, base=1, title=before[0], size=len(before[1]),
+                                    content_hash=content_hash(*before), data=encode_snapshot(before[1]))
+        last = {"number": 1, "content_hash": content_hash(*before), "base": 1}
+
+    number = last["number"] + 1
+    snapshot = encode_snapshot(post.content)
+    data, base = snapshot, number
+    if last["content_hash"] == content_hash(*before) and number - last["base"] < snapshot_every():
+        delta = encode_delta(before[1], post.content)
+        if len(delta) < len(snapshot):
+            data, base = delta, last["base"]
+    return PostRevision.objects.create(post=post, number=number, base=base, editor=editor, title=post.title,
+                                       size=len(post.content), content_hash=content_hash(post.title, post.content),
+                                       data=data)
+
+
+# ---------- 복원 ----------
+def reconstruct(post_id, numbers):
+    """
+    → {번호: (title, content)} — 요청한 판 중 가장 작은 번호의 스냅샷부터 가장 큰 번호까지 한 번에 읽어 재생.
+    없는 번호(또는 삭제 표시된 글)는 결과에 없음.
+    """
+    numbers = set(numbers)
+    if not numbers:
+        return {}
+    lo, hi = min(numbers), max(numbers)
+    start = (PostRevision.objects.filter(post_id=post_id, number=lo).values("base"))
+    rows = (PostRevision.objects.filter(post_id=post_id, post__deleted_at__isnull=True,
+                                        number__gte=Subquery(start), number__lte=hi)
+            .order_by("number").values_list("number", "base", "title", "data"))
+    out, content = {}, None
+    for number, base, title, data in rows:
+        content = zlib.decompress(data).decode() if base == number else apply_delta(content, data)
+        if number in numbers:
+            out[number] = (title, content)
+    return out
+
+
+def diff(post_id, a, b):
+    """a판 → b판 unified diff. 둘 중 하나라도 없으면 None"""
+    found = reconstruct(post_id, [a, b])
+    if a not in found or b not in found:
+        return None
+    (title_a, text_a), (title_b, text_b) = found[a], found[b]
+    lines = difflib.unified_diff(text_a.splitlines(keepends=True), text_b.splitlines(keepends=True),
+                                 fromfile=f"r{a}", tofile=f"r{b}")
+    return {"from": a, "to": b, "title": None if title_a == title_b else [title_a, title_b],
+            "diff": "".join(lines)}
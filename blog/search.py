@@ -0,0 +1,106 @@
+"""
+글 전문 검색 인덱스 — 관리자 목록 검색용 (content__icontains = 표 전체 LIKE 스캔 대신).
+
+- SQLite: FTS5 외부 콘텐츠 테이블 blog_post_fts(title, content). blog_post의 INSERT/UPDATE/DELETE 트리거가 색인을 맞추므로
+  bulk_create/update()/purge의 raw DELETE도 반영된다. 색인만 저장하고 본문은 blog_post에서 읽는다.
+- PostgreSQL: to_tsvector('simple', title || ' ' || content) GIN 식 인덱스.
+- 그 외 DB는 None → 호출하는 쪽에서 기존 검색으로.
+검색어는 단어마다 접두어 일치의 AND ("본문" → "본문을", "본문에서"도 찾음 — 한국어 조사 대응).
+"""
+import re
+
+from django.conf import settings
+from django.db import connection
+
+FTS_TABLE = "blog_post_fts"
+PG_INDEX = "blog_post_fulltext"
+PG_VECTOR = "to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(content, ''))"
+
+_WORD = re.compile(r"\w+")
+
+SQLITE_SETUP = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, content, content='blog_post', content_rowid='id', tokenize='unicode61 remove_diacritics 2')""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON blog_post BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON blog_post BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, content ON blog_post BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO {FTS_TABLE}(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END""",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+SQLITE_TEARDOWN = [f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{t}" for t in ("ai", "ad", "au")] + [
+    f"DROP TABLE IF EXISTS {FTS_TABLE}"]
+PG_SETUP = [f"CREATE INDEX IF NOT EXISTS {PG_INDEX} ON blog_post USING GIN ({PG_VECTOR})"]
+PG_TEARDOWN = [f"DROP INDEX IF EXISTS {PG_INDEX}"]
+
+
+def search_limit():
+    return getattr(settings, "ADMIN_SEARCH_LIMIT", 1000)
+
+
+def _statements(vendor, reverse=False):
+    if vendor == "sqlite":
+        return SQLITE_TEARDOWN if reverse else SQLITE_SETUP
+    if vendor == "postgresql":
+        return PG_TEARDOWN if reverse else PG_SETUP
+    return []
+
+
+def install(schema_editor, reverse=False):
+    """마이그레이션에서 호출 — DB 종류에 맞는 색인 생성/삭제"""
+    for sql in _statements(schema_editor.connection.vendor, reverse):
+        schema_editor.execute(sql)
+
+
+def ensure_installed(conn):
+    """
+    post_migrate마다: SQLite는 ALTER 마이그레이션이 blog_post를 새로 만들며 트리거를 같이 지우므로 빠졌으면 다시 설치
+    (다시 설치할 때만 색인 rebuild). → 설치했으면 True
+    """
+    names = {FTS_TABLE, f"{FTS_TABLE}_ai", f"{FTS_TABLE}_ad", f"{FTS_TABLE}_au"}
+    with conn.cursor() as cursor:
+        if "blog_post" not in conn.introspection.table_names(cursor):
+            return False
+        if conn.vendor == "sqlite":
+            cursor.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')")
+            if names <= {row[0] for row in cursor.fetchall()}:
+                return False
+        elif conn.vendor == "postgresql":
+            cursor.execute("SELECT 1 FROM pg_indexes WHERE indexname = %s", [PG_INDEX])
+            if cursor.fetchone():
+                return False
+        else:
+            return False
+        for sql in _statements(conn.vendor):
+            cursor.execute(sql)
+    return True
+
+
+def search_post_ids(query, limit=None):
+    """
+    → 일치하는 글 id 목록 (관련도 순, 최대 limit개). 검색어에 단어가 없으면 [].
+    색인을 지원하지 않는 DB면 None.
+    """
+    words = _WORD.findall(query or "")
+    limit = limit or search_limit()
+    if not words:
+        return []
+    if connection.vendor == "sqlite":
+        match = " ".join('"{}"*'.format(w.replace('"', '""')) for w in words)
+        sql = f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s ORDER BY rank LIMIT %s"
+        params = [match, limit]
+    elif connection.vendor == "postgresql":
+        tsquery = " & ".join(f"{w}:*" for w in words)
+        sql = (f"SELECT id FROM blog_post WHERE {PG_VECTOR} @@ to_tsquery('simple', %s) "
+               f"ORDER BY ts_rank({PG_VECTOR}, to_tsquery('simple', %s)) DESC LIMIT %s")
+        params = [tsquery, tsquery, limit]
+    else:
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [row[0] for row in cursor.fetchall()]
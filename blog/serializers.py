@@ -1,18 +1,45 @@
 from django.utils.text import slugify
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from .models import Post, Comment, Like, Notification, Category, Tag
-
-class CategorySerializer(serializers.ModelSerializer):
+from .mixins import parse_fieldset
+
+class DynamicFieldsMixin:
+    """
+    ?fields=a,b → 해당 필드만, ?omit=c → 해당 필드 제외 (읽기 요청에서만)
+    context에 request가 없으면(뷰 밖에서 직접 생성) 아무것도 자르지 않는다.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields, omit = parse_fieldset(self.context.get("request"))
+        keep = set(self.fields)
+        if fields:
+            keep &= fields
+        if omit:
+            keep -= omit
+        for name in list(self.fields):
+            if name not in keep:
+                self.fields.pop(name)
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """토큰에 username 클레임 추가 → CachedJWTAuthentication이 DB 없이 request.user.username 제공"""
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token["username"] = user.username
+        return token
+
+class CategorySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = ["id", "name", "slug"]
 
-class TagSerializer(serializers.ModelSerializer):
+class TagSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Tag
         fields = ["id", "slug", "name"]
         
-class NotificationSerializer(serializers.ModelSerializer):
+class NotificationSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     user = serializers.ReadOnlyField(source="user.username")
     post = serializers.PrimaryKeyRelatedField(read_only=True)
     comment = serializers.PrimaryKeyRelatedField(read_only=True)
@@ -24,16 +51,24 @@ class NotificationSerializer(serializers.ModelSerializer):
         fields = ["id", "user", "message", "post", "comment", "is_read", "created_at", "post_id", "comment_id"]
         read_only_fields = ["id", "user", "post", "comment", "created_at"]
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     author = serializers.ReadOnlyField(source='author.username')  # 응답 전용
     post = serializers.PrimaryKeyRelatedField(read_only=True)     # 경로(post_id)로 주입할 거라 입력받지 않음
 
+    parent = serializers.PrimaryKeyRelatedField(queryset=Comment.objects.all(), required=False, allow_null=True)
+
     class Meta:
         model = Comment
-        fields = ["id", "post", "author", "content", "created_at", "updated_at"]
-        read_only_fields = ["id", "post", "author", "created_at", "updated_at"]
+        fields = ["id", "post", "parent", "depth", "reply_count", "author", "content", "created_at", "updated_at"]
+        read_only_fields = ["id", "post", "depth", "reply_count", "author", "created_at", "updated_at"]
+
+    def validate_parent(self, value):
+        # 답글 위치는 작성 시에만 (하위 트리 path가 바뀌지 않도록)
+        if self.instance is not None and value != self.instance.parent:
+            raise serializers.ValidationError("답글 위치는 바꿀 수 없습니다.")
+        return value
 
-class PostSerializer(serializers.ModelSerializer):
+class PostSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     author = serializers.ReadOnlyField(source='author.username')
     # annotate로 붙여온 값을 그대로 읽기전용으로 노출
     like_count = serializers.IntegerField(read_only=True)
@@ -61,6 +96,10 @@ class PostSerializer(serializers.ModelSerializer):
         allow_null=True
     )
     
+    # 저장 시 한 번 렌더링해 둔 본문 HTML(이스케이프됨)과 읽기 시간(분)
+    content_html = serializers.CharField(source="rendered.html", read_only=True)
+    reading_time = serializers.IntegerField(source="rendered.reading_minutes", read_only=True)
+
     # ai
     summary = serializers.CharField(read_only=True)
     tags_suggested = serializers.ListField(child=serializers.CharField(), read_only=True)
@@ -68,7 +107,7 @@ class PostSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Post
-        fields = ["id", "slug", "author", "title", "content",
+        fields = ["id", "slug", "author", "title", "content", "content_html", "reading_time",
                   "category", "tags",
                   "summary", "tags_suggested",       
                   "created_at", "updated_at",
@@ -82,8 +121,6 @@ class PostSerializer(serializers.ModelSerializer):
         """
         어떤 입력이 와도 ["drf","새글"] 형태로 바꿔준다.
         """
-        print("[PostSerializer.validate_tags] raw type:", type(value))  # 진단 로그
-
         if value is None:
             return []
 
@@ -141,5 +178,23 @@ class PostSerializer(serializers.ModelSerializer):
     # ---------- (D) 응답은 항상 slug 리스트 ----------
     def to_representation(self, instance):
         data = super().to_representation(instance)
-        data["tags"] = list(instance.tags.values_list("slug", flat=True))
-        return data
\ No newline at end of file
+        if "tags" in self.fields:  # ?fields/omit 로 빠졌으면 M2M 쿼리도 생략
+            data["tags"] = list(instance.tags.order_by("id").values_list("slug", flat=True))
+        return data
+
+
+class PostListSerializer(PostSerializer):
+    """
+    목록 전용: content 전체 대신 렌더링해 둔 평문 excerpt와 읽기 시간만 내려준다.
+    (PostViewSet이 list일 때 content를 defer하고 rendering.list_annotations()로 annotate)
+    """
+    excerpt = serializers.CharField(read_only=True)
+    reading_time = serializers.IntegerField(read_only=True)
+
+    class Meta(PostSerializer.Meta):
+        fields = ["id", "slug", "author", "title", "excerpt", "reading_time",
+                  "category", "tags",
+                  "summary", "tags_suggested",
+                  "created_at", "updated_at",
+                  "like_count", "comment_count"]
+        read_only_fields = PostSerializer.Meta.read_only_fields + ["excerpt", "reading_time"]
\ No newline at end of file
@@ -0,0 +1,62 @@
+"""
+운영 서버 실행 계획 — manage.py runprod가 사용 (gunicorn, ASGI는 uvicorn 워커).
+
+- CPU 수: 프로세스에 허용된 코어(sched_getaffinity)와 컨테이너 CPU 한도(cgroup v2 cpu.max) 중 작은 값
+- wsgi: gthread 워커 2×CPU+1개 × 스레드 SERVE_THREADS개. 뷰가 DB/캐시를 기다리는 동안 같은 코어의 다른 요청이 돈다
+- asgi: 이벤트 루프 워커 CPU개. 동기 뷰는 워커마다 스레드 하나에서 차례로 실행되므로(Django thread_sensitive)
+  동기 뷰가 대부분인 이 앱은 wsgi가 기본 — 차이는 benchmarks/bench_serve.py로 잰다
+워커 수는 SERVE_MAX_WORKERS로 상한 (워커마다 부팅 메모리가 든다, benchmarks/bench_boot.py).
+"""
+import math
+import os
+import sys
+
+from django.conf import settings
+
+WSGI_APP = "config.wsgi:application"
+ASGI_APP = "config.asgi:application"
+ASGI_WORKER = "uvicorn.workers.UvicornWorker"
+
+
+def cpu_count():
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # macOS/Windows
+        cpus = os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()[:2]
+        if quota != "max":
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+def plan(mode="wsgi", cpus=None, workers=None, threads=None):
+    """→ {"mode", "cpus", "workers", "threads"} (workers/threads를 주면 그대로)"""
+    cpus = cpus or cpu_count()
+    cap = getattr(settings, "SERVE_MAX_WORKERS", 16)
+    if mode == "asgi":
+        return {"mode": mode, "cpus": cpus, "workers": workers or min(cpus, cap), "threads": 1}
+    return {
+        "mode": mode,
+        "cpus": cpus,
+        "workers": workers or min(2 * cpus + 1, cap),
+        "threads": threads or getattr(settings, "SERVE_THREADS", 4),
+    }
+
+
+def command(p, bind="0.0.0.0:8000", preload=True):
+    """plan → gunicorn 실행 인자"""
+    argv = [sys.executable, "-m", "gunicorn", "--bind", bind, "--workers", str(p["workers"]),
+            "--max-requests", str(getattr(settings, "SERVE_MAX_REQUESTS", 10_000)),
+            "--max-requests-jitter", str(getattr(settings, "SERVE_MAX_REQUESTS", 10_000) // 10),
+            "--graceful-timeout", "30", "--keep-alive", "5", "--access-logfile", "-"]
+    if p["mode"] == "asgi":
+        argv += ["--worker-class", ASGI_WORKER, ASGI_APP]
+    else:
+        argv += ["--worker-class", "gthread", "--threads", str(p["threads"]), WSGI_APP]
+    if preload:  # 앱을 마스터에서 한 번 읽고 fork → 워커 메모리 공유 (DB 연결은 요청 때 열리므로 안전)
+        argv.insert(3, "--preload")
+    return argv
@@ -0,0 +1,193 @@
+from django.contrib.auth.models import User
+from django.db import connections, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_migrate, post_save, post_delete, pre_delete, m2m_changed
+from django.dispatch import receiver
+
+from .authentication import invalidate_cached_user
+from .autocomplete import loaded_tag_index
+from .facets import bump_generation
+from .models import Category, ClaimsUser, Comment, Follow, Like, Post, Tag
+from .related import loaded_index, refresh_post
+from .tagger import bump_vocab_generation, get_tagger
+from . import feed, search, syndication, trending
+
+
+@receiver([post_save, post_delete], sender=User)
+@receiver([post_save, post_delete], sender=ClaimsUser)
+def drop_cached_user(sender, instance, **kwargs):
+    # is_active/is_staff 변경이 캐시 TTL을 기다리지 않고 바로 반영되도록
+    invalidate_cached_user(instance.pk)
+
+
+@receiver(post_save, sender=Post)
+def feed_tagger(sender, instance, created, **kwargs):
+    # 로컬 태그 추천기 df 통계에 새 글 반영 (수정분은 build_tag_model 재생성 때 반영)
+    if created:
+        get_tagger().add_document(f"{instance.title}\n{instance.content}")
+
+
+@receiver([post_save, post_delete], sender=Tag)
+def invalidate_tagger_vocab(sender, **kwargs):
+    # 태그 추가/이름 변경/삭제 → 모든 워커의 추천기가 다음 사용 때 태그 목록을 다시 읽음 (커밋 후)
+    transaction.on_commit(bump_vocab_generation)
+
+
+@receiver([post_save, post_delete], sender=Post)
+def update_related_index(sender, instance, **kwargs):
+    # 관련 글 인덱스가 이미 떠 있으면 커밋 후 이 글만 다시 색인 (롤백된 내용은 반영 안 됨)
+    if loaded_index() is not None:
+        post_id = instance.pk
+        transaction.on_commit(lambda: refresh_post(post_id))
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def update_related_index_tags(sender, instance, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear") and isinstance(instance, Post):
+        update_related_index(Post, instance)
+
+
+@receiver(post_save, sender=Like)
+@receiver(post_save, sender=Comment)
+def score_trending(sender, instance, created, **kwargs):
+    # 트렌딩 점수/카운터 증분 (목록 요청에서 Like/Comment를 집계하지 않도록)
+    if created:
+        if sender is Like:
+            trending.record(instance.post_id, trending.LIKE_WEIGHT, instance.created_at, likes=1)
+        else:
+            trending.record(instance.post_id, trending.COMMENT_WEIGHT, instance.created_at, comments=1)
+
+
+@receiver(post_delete, sender=Like)
+@receiver(post_delete, sender=Comment)
+def unscore_trending(sender, instance, **kwargs):
+    if sender is Like:
+        trending.record(instance.post_id, -trending.LIKE_WEIGHT, instance.created_at, likes=-1)
+    else:
+        trending.record(instance.post_id, -trending.COMMENT_WEIGHT, instance.created_at, comments=-1)
+
+
+@receiver(post_delete, sender=Comment)
+def uncount_replies(sender, instance, origin=None, **kwargs):
+    # 남아 있는 조상들의 reply_count에서 빼기. 하위 답글은 CASCADE로 같이 지워지므로
+    # delete()를 부른 댓글이 하위 트리 크기만큼 한 번에 빼고, 나머지는 건너뛴다.
+    if isinstance(origin, Post) or not instance.path:
+        return
+    if isinstance(origin, Comment) and origin.pk != instance.pk and instance.path.startswith(origin.path):
+        return
+    ancestors = Comment.path_ids(instance.path)[:-1]
+    if not ancestors:
+        return
+    n = 1 + instance.reply_count if isinstance(origin, Comment) else 1
+    Comment.objects.filter(pk__in=ancestors).update(reply_count=Greatest(F("reply_count") - n, 0))
+
+
+def _on_tag_index(method, *args):
+    # 태그 자동완성 인덱스: 커밋 후, 인덱스가 떠 있을 때만 증분 반영
+    def apply():
+        index = loaded_tag_index()
+        if index is not None:
+            getattr(index, method)(*args)
+    transaction.on_commit(apply)
+
+
+@receiver(post_save, sender=Tag)
+def update_tag_index(sender, instance, **kwargs):
+    if loaded_tag_index() is not None:
+        _on_tag_index("upsert", instance.pk, instance.slug, instance.name)
+
+
+@receiver(post_delete, sender=Tag)
+def remove_from_tag_index(sender, instance, **kwargs):
+    if loaded_tag_index() is not None:
+        _on_tag_index("remove", instance.pk)
+
+
+def _adjust_tag_counts(tag_ids, delta):
+    tag_ids = list(tag_ids)
+    if tag_ids:
+        _on_tag_index("adjust", tag_ids, delta)
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def count_tag_posts(sender, instance, action, reverse, pk_set, **kwargs):
+    # 자동완성 순위용 태그별 글 수
+    if loaded_tag_index() is None:
+        return
+    if action == "pre_clear":
+        # clear는 post_clear에서 pk_set을 주지 않으므로 지우기 전에 대상을 기억
+        instance._cleared_tag_ids = ([instance.pk] if reverse else
+                                     list(instance.tags.values_list("id", flat=True)))
+        instance._cleared_post_count = instance.posts.count() if reverse else 1
+    elif action == "post_clear":
+        ids = getattr(instance, "_cleared_tag_ids", [])
+        _adjust_tag_counts(ids, -getattr(instance, "_cleared_post_count", 1))
+    elif action in ("post_add", "post_remove") and pk_set:
+        delta = 1 if action == "post_add" else -1
+        if reverse:  # tag.posts.add(...) → 이 태그 하나에 글 여러 개
+            _adjust_tag_counts([instance.pk], delta * len(pk_set))
+        else:
+            _adjust_tag_counts(pk_set, delta)
+
+
+@receiver(pre_delete, sender=Post)
+def uncount_tag_posts(sender, instance, **kwargs):
+    # 글 삭제 시 through 행은 신호 없이 지워지므로 미리 감소
+    if loaded_tag_index() is not None:
+        _adjust_tag_counts(instance.tags.values_list("id", flat=True), -1)
+
+
+@receiver([post_save, post_delete], sender=Post)
+@receiver([post_save, post_delete], sender=Tag)
+@receiver([post_save, post_delete], sender=Category)
+@receiver(m2m_changed, sender=Post.tags.through)
+def invalidate_facets(sender, **kwargs):
+    # facet 캐시 세대 올리기 (커밋 후 — 그 전에 읽은 값이 새 세대로 캐시되지 않도록)
+    if kwargs.get("action", "post_").startswith("post_"):
+        transaction.on_commit(bump_generation)
+
+
+@receiver([post_save, post_delete], sender=Post)
+def invalidate_post_syndication(sender, instance, **kwargs):
+    # 피드 + 이 글이 속한 sitemap 조각만 다시 만들게 (커밋 후)
+    post_id = instance.pk
+    transaction.on_commit(lambda: syndication.post_changed(post_id))
+
+
+@receiver([post_save, post_delete], sender=Tag)
+@receiver([post_save, post_delete], sender=Category)
+@receiver(m2m_changed, sender=Post.tags.through)
+def invalidate_feeds(sender, **kwargs):
+    # 태그/카테고리 이름·글 태그가 바뀌면 피드만 (sitemap은 slug/updated_at만 씀)
+    if kwargs.get("action", "post_").startswith("post_"):
+        transaction.on_commit(syndication.feeds_changed)
+
+
+@receiver(post_save, sender=Post)
+def fan_out_post(sender, instance, created, **kwargs):
+    # 새 글 → 팔로워 타임라인 (커밋 후, 팔로워 적은 작성자만)
+    if created:
+        post_id, author_id = instance.pk, instance.author_id
+        transaction.on_commit(lambda: feed.fan_out(post_id, author_id))
+
+
+@receiver(post_save, sender=Follow)
+def on_follow(sender, instance, created, **kwargs):
+    if created:
+        feed.adjust_follower_count(instance.followee_id, 1)
+        follower_id, followee_id = instance.follower_id, instance.followee_id
+        transaction.on_commit(lambda: feed.backfill(follower_id, followee_id))
+
+
+@receiver(post_delete, sender=Follow)
+def on_unfollow(sender, instance, **kwargs):
+    feed.adjust_follower_count(instance.followee_id, -1)
+    feed.unfollow_cleanup(instance.follower_id, instance.followee_id)
+
+
+@receiver(post_migrate)
+def reinstall_search_index(sender, using="default", **kwargs):
+    # 글 표를 다시 만드는 마이그레이션(SQLite ALTER) 뒤 빠진 전문 검색 트리거 복구
+    if sender.name == "blog":
+        search.ensure_installed(connections[using])
@@ -0,0 +1,157 @@
+"""
+운영용 정적 파일 — collectstatic 한 번에 해시 이름 + 미리 압축, 서빙은 StaticFilesMiddleware (blog.middleware).
+
+- CompressedManifestStaticFilesStorage: Django Manifest 저장소(파일명에 내용 해시, css url()/js import 경로도 해시 이름으로)
+  + 압축할 만한 파일마다 .gz(.br/.zst는 라이브러리가 있을 때) 를 옆에 만들어 둔다 → 요청 때 압축 CPU 없음
+- StaticIndex: 시작 시 STATIC_ROOT를 한 번 훑어 URL 경로 → 파일/압축본/ETag 표를 만든다 (요청마다 stat 없음).
+  해시 이름 파일은 내용이 바뀌면 이름이 바뀌므로 1년 immutable, 해시 없는 원본 이름은 STATIC_MAX_AGE초.
+  collectstatic 뒤에는 워커를 재시작해야 새 파일이 보인다.
+- frontend_html: frontend/index.html의 ./ 상대 경로를 해시 URL로 바꾼 SPA 진입 페이지 (config.urls의 "/")
+"""
+import functools
+import gzip
+import json
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.http import FileResponse, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from .middleware import brotli, parse_accept_encoding, zstandard
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+COMPRESSIBLE_EXTENSIONS = (".css", ".js", ".mjs", ".map", ".html", ".svg", ".json", ".txt", ".xml")
+# 압축본 확장자 — 같은 q값이면 앞쪽 우선
+ENCODINGS = [(name, ext) for name, ext, ok in (("br", ".br", brotli), ("zstd", ".zst", zstandard), ("gzip", ".gz", True))
+             if ok]
+
+_RELATIVE_REF = re.compile(r'(?P<attr>href|src)="\./(?P<path>[^"?#]+)"')
+
+
+def max_age():
+    return getattr(settings, "STATIC_MAX_AGE", 60)
+
+
+def _compress(data, encoding):
+    if encoding == "br":
+        return brotli.compress(data, quality=11)  # 배포 때 한 번이라 최고 압축
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=19).compress(data)
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    support_js_module_import_aggregation = True  # frontend/js의 ES module import도 해시 이름으로
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        names = {*self.hashed_files, *self.hashed_files.values()}
+        for name in sorted(names):
+            if name.endswith(COMPRESSIBLE_EXTENSIONS) and self.exists(name):
+                self.write_compressed(name)
+
+    def write_compressed(self, name):
+        """압축본이 원본보다 5% 이상 작을 때만 남긴다"""
+        with self.open(name) as f:
+            data = f.read()
+        if len(data) < getattr(settings, "COMPRESSION_MIN_SIZE", 512):
+            return
+        for encoding, ext in ENCODINGS:
+            compressed = _compress(data, encoding)
+            path = self.path(name + ext)
+            if len(compressed) < len(data) * 0.95:
+                with open(path, "wb") as out:
+                    out.write(compressed)
+            elif os.path.exists(path):
+                os.remove(path)
+
+
+class StaticIndex:
+    """STATIC_ROOT 아래 파일 표 (URL 상대 경로 → entry)"""
+
+    def __init__(self, root):
+        self.files = {}
+        if not root or not os.path.isdir(root):
+            return
+        hashed = set()
+        manifest = os.path.join(root, "staticfiles.json")
+        if os.path.exists(manifest):
+            with open(manifest, encoding="utf-8") as f:
+                hashed = set(json.load(f).get("paths", {}).values())
+        compressed_exts = tuple(ext for _, ext in ENCODINGS)
+        for dirpath, _, filenames in os.walk(root):
+            for filename in filenames:
+                if filename.endswith(compressed_exts) or filename == "staticfiles.json":
+                    continue
+                path = os.path.join(dirpath, filename)
+                name = os.path.relpath(path, root).replace(os.sep, "/")
+                self.files[name] = self._entry(name, path, name in hashed)
+
+    @staticmethod
+    def _entry(name, path, immutable):
+        stat = os.stat(path)
+        content_type, _ = mimetypes.guess_type(name)
+        content_type = content_type or "application/octet-stream"
+        if content_type.startswith("text/") or content_type in ("application/javascript", "application/json"):
+            content_type += "; charset=utf-8"
+        variants = {None: (path, stat.st_size)}
+        for encoding, ext in ENCODINGS:
+            if os.path.exists(path + ext):
+                variants[encoding] = (path + ext, os.path.getsize(path + ext))
+        return {
+            "content_type": content_type,
+            "variants": variants,
+            "etag": f'"{stat.st_size:x}-{int(stat.st_mtime):x}"',
+            "last_modified": int(stat.st_mtime),
+            "cache_control": IMMUTABLE if immutable else f"public, max-age={max_age()}",
+        }
+
+    def get(self, name):
+        return self.files.get(name)
+
+
+def choose_variant(entry, accept_encoding):
+    """→ 보낼 압축 방식 (None = 원본)"""
+    accepted = parse_accept_encoding(accept_encoding)
+    best, best_q = None, 0.0
+    for encoding, _ in ENCODINGS:
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if encoding in entry["variants"] and q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def serve(request, entry):
+    encoding = choose_variant(entry, request.META.get("HTTP_ACCEPT_ENCODING", ""))
+    etag = entry["etag"] if encoding is None else f'{entry["etag"][:-1]}-{encoding}"'
+    response = get_conditional_response(request, etag=etag, last_modified=entry["last_modified"])
+    if response is None:
+        path, size = entry["variants"][encoding]
+        response = HttpResponse() if request.method == "HEAD" else FileResponse(open(path, "rb"))
+        response.headers["Content-Length"] = str(size)
+        response.headers["Content-Type"] = entry["content_type"]
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+    response.headers["ETag"] = etag
+    response.headers["Last-Modified"] = http_date(entry["last_modified"])
+    response.headers["Cache-Control"] = entry["cache_control"]
+    if len(entry["variants"]) > 1:
+        response.headers["Vary"] = "Accept-Encoding"
+    return response
+
+
+# ---------- SPA 진입 페이지 ----------
+@functools.lru_cache(maxsize=1)
+def frontend_html():
+    """index.html의 ./styles.css, ./js/app.js → 정적 URL (운영에서는 해시 이름). 결과는 프로세스당 한 번"""
+    with open(os.path.join(settings.FRONTEND_DIR, "index.html"), encoding="utf-8") as f:
+        html = f.read()
+    html = _RELATIVE_REF.sub(lambda m: f'{m["attr"]}="{staticfiles_storage.url(m["path"])}"', html)
+    # 같은 오리진에서 API 호출 (js/state.js가 읽음, 없으면 개발 서버 주소)
+    return html.replace("<head>", '<head>\n  <meta name="api-base" content="" />', 1)
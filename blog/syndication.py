@@ -0,0 +1,188 @@
+"""
+RSS/Atom 피드와 sitemap — /feeds/..., /sitemap.xml 용.
+
+크롤러/피드 리더가 /api/posts/를 페이지마다 긁는 대신 미리 만든 XML을 받는다.
+- 만든 결과(본문 + ETag + Last-Modified)는 캐시에 두고, 키에 "세대" 번호를 넣어 글이 바뀌면 세대만 올린다 (facets와 같은 방식)
+  피드: 글/태그/카테고리가 바뀌면 피드 세대 하나를 올림 → 다음 요청 때 다시 만듦
+  sitemap: 글 id 구간(SITEMAP_SHARD_SIZE개)마다 조각을 나누고 바뀐 글이 속한 조각 세대만 올림 → 나머지 조각은 그대로
+- 응답은 ETag/Last-Modified를 달고, If-None-Match/If-Modified-Since가 맞으면 DB를 보지 않고 304
+"""
+import hashlib
+import time
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F, Max
+from django.utils import feedgenerator
+
+from .models import Category, Post, Tag
+from .rendering import list_annotations
+
+FEEDS_GENERATION_KEY = "syndication:feeds:gen"
+SITEMAP_GENERATION_KEY = "syndication:sitemap:gen"
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+
+
+def feed_items():
+    return getattr(settings, "FEEDS_ITEMS", 20)
+
+
+def shard_size():
+    return getattr(settings, "SITEMAP_SHARD_SIZE", 5000)
+
+
+def generation(key):
+    # 캐시에서 밀려났을 때 예전 번호와 겹치지 않도록 시각으로 시작
+    return cache.get_or_set(key, int(time.time() * 1000), None)
+
+
+def bump(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, int(time.time() * 1000), None)
+
+
+def shard_of(post_id):
+    return (post_id - 1) // shard_size()
+
+
+def shard_key(shard):
+    return f"{SITEMAP_GENERATION_KEY}:{shard}"
+
+
+def feeds_changed():
+    bump(FEEDS_GENERATION_KEY)
+
+
+def post_changed(post_id):
+    """글 저장/삭제 후 (커밋 후): 피드 전체 + 이 글의 sitemap 조각과 색인"""
+    bump(FEEDS_GENERATION_KEY)
+    bump(SITEMAP_GENERATION_KEY)
+    bump(shard_key(shard_of(post_id)))
+
+
+def post_url(request, post_id, slug):
+    template = getattr(settings, "POST_URL", "/api/posts/{id}/")
+    return request.build_absolute_uri(template.format(id=post_id, slug=slug))
+
+
+# ---------- 캐시 + 조건부 GET ----------
+def cached(request, key, build):
+    """
+    key(세대 포함) 아래 build() 결과를 캐시. build() → (본문 bytes, last_modified datetime) 또는 None(404)
+    → {"body", "etag", "last_modified"(unix 초)} 또는 None
+    """
+    key = f"syndication:{request.get_host()}:{key}"  # 절대 URL이 본문에 들어가므로 호스트별
+    entry = cache.get(key)
+    if entry is None:
+        built = build()
+        entry = {"missing": True}
+        if built is not None:
+            body, last_modified = built
+            entry = {
+                "body": body,
+                "etag": f'"{hashlib.md5(body).hexdigest()}"',
+                "last_modified": int(last_modified.timestamp()) if last_modified else int(time.time()),
+            }
+        cache.set(key, entry, getattr(settings, "FEEDS_CACHE_TTL", 86400))
+    return None if entry.get("missing") else entry
+
+
+# ---------- 피드 ----------
+def _feed_scope(kind, slug):
+    """→ (제목 꼬리, 글 쿼리셋) 또는 None(없는 카테고리/태그)"""
+    qs = Post.objects.all()
+    if kind == "category":
+        name = Category.objects.filter(slug=slug).values_list("name", flat=True).first()
+        return None if name is None else (name, qs.filter(category__slug=slug))
+    if kind == "tag":
+        name = Tag.objects.filter(slug=slug).values_list("name", flat=True).first()
+        return None if name is None else (f"#{name}", qs.filter(tags__slug=slug))
+    return "", qs
+
+
+def build_feed(request, fmt, kind=None, slug=None):
+    scope = _feed_scope(kind, slug)
+    if scope is None:
+        return None
+    suffix, qs = scope
+    posts = list(qs.select_related("author", "category")
+                 .prefetch_related("tags")
+                 .defer("content")
+                 .annotate(**list_annotations())
+                 .order_by("-id")[:feed_items()])
+
+    generator = feedgenerator.Atom1Feed if fmt == "atom" else feedgenerator.Rss201rev2Feed
+    title = getattr(settings, "FEEDS_TITLE", "DRF Blog")
+    feed = generator(
+        title=f"{title} {suffix}".strip(),
+        link=request.build_absolute_uri("/"),
+        description=getattr(settings, "FEEDS_DESCRIPTION", "최근 글"),
+        language="ko",
+        feed_url=request.build_absolute_uri(request.path),
+    )
+    for post in posts:
+        url = post_url(request, post.id, post.slug)
+        feed.add_item(
+            title=post.title,
+            link=url,
+            description=post.summary or post.excerpt or "",
+            unique_id=url,
+            pubdate=post.created_at,
+            updateddate=post.updated_at,
+            author_name=post.author.username,
+            categories=[t.slug for t in post.tags.all()] + ([post.category.slug] if post.category else []),
+        )
+    last_modified = max((p.updated_at for p in posts), default=None)
+    return feed.writeString("utf-8").encode(), last_modified
+
+
+def feed(request, fmt, kind=None, slug=None):
+    if kind not in (None, "category", "tag"):
+        return None
+    key = f"feed:{generation(FEEDS_GENERATION_KEY)}:{fmt}:{kind or 'all'}:{slug or ''}"
+    return cached(request, key, lambda: build_feed(request, fmt, kind, slug))
+
+
+# ---------- sitemap ----------
+def build_sitemap_index(request):
+    size = shard_size()
+    rows = (Post.objects.annotate(shard=(F("id") - 1) / size).order_by("shard")
+            .values("shard").annotate(lastmod=Max("updated_at")).values_list("shard", "lastmod"))
+    lines = [f'<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="{SITEMAP_NS}">']
+    last_modified = None
+    for shard, lastmod in rows:
+        loc = escape(request.build_absolute_uri(f"/sitemap-{shard}.xml"))
+        lines.append(f"<sitemap><loc>{loc}</loc><lastmod>{lastmod.isoformat()}</lastmod></sitemap>")
+        last_modified = max(last_modified or lastmod, lastmod)
+    lines.append("</sitemapindex>\n")
+    return "\n".join(lines).encode(), last_modified
+
+
+def build_sitemap_shard(request, shard):
+    size = shard_size()
+    rows = (Post.objects.filter(id__gt=shard * size, id__lte=(shard + 1) * size)
+            .order_by("id").values_list("id", "slug", "updated_at"))
+    lines = [f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="{SITEMAP_NS}">']
+    last_modified = None
+    for post_id, slug, updated_at in rows.iterator():
+        loc = escape(post_url(request, post_id, slug))
+        lines.append(f"<url><loc>{loc}</loc><lastmod>{updated_at.isoformat()}</lastmod></url>")
+        last_modified = max(last_modified or updated_at, updated_at)
+    if last_modified is None:
+        return None
+    lines.append("</urlset>\n")
+    return "\n".join(lines).encode(), last_modified
+
+
+def sitemap_index(request):
+    key = f"sitemap:{generation(SITEMAP_GENERATION_KEY)}:index"
+    return cached(request, key, lambda: build_sitemap_index(request))
+
+
+def sitemap_shard(request, shard):
+    key = f"sitemap:{generation(shard_key(shard))}:{shard}"
+    return cached(request, key, lambda: build_sitemap_shard(request, shard))
+
@@ -0,0 +1,249 @@
+"""
+로컬(오프라인) 태그 추천기 — AI가 꺼져 있거나 Gemini가 실패할 때의 폴백.
+
+- 토큰화: 영문/숫자/한글 토큰 + 한국어 조사·어미 제거 ("데이터를" → "데이터")
+- 점수: TF × IDF, 기존 Tag slug/이름과 일치하는 후보는 TAG_BOOST 배 가중
+- 통계: 문서 빈도(df)를 코퍼스 전체로 미리 계산해 압축 바이너리 파일로 저장하고,
+  프로세스에서는 mmap으로 열어 이진 탐색 (메모리에 vocab 전체를 올리지 않음)
+- 새 글은 메모리 델타(df 증분)에 바로 반영, `manage.py build_tag_model`로 파일 재생성
+- 기존 태그 목록(tag_vocab)은 캐시의 "세대" 번호가 바뀌면 다시 읽는다 (Tag 저장/삭제 시 올림 → 다른 워커에도 반영)
+
+파일 형식 (네이티브 uint32):
+    b"TAGM1\\0\\0\\0" | n_docs | n_terms | offsets[n_terms+1] | df[n_terms] | utf-8 term blob (바이트 정렬)
+"""
+import math
+import mmap
+import os
+import re
+import threading
+import time
+from array import array
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+
+MAGIC = b"TAGM1\0\0\0"
+TAG_BOOST = 2.0
+VOCAB_GENERATION_KEY = "tagger:vocab:gen"
+
+TOKEN_RE = re.compile(r"[A-Za-z0-9가-힣_\-]{2,}")
+HANGUL_RE = re.compile(r"[가-힣]")
+
+# 길이가 긴 것부터 매칭
+PARTICLES = sorted([
+    "에서부터", "으로부터", "에게서", "이라고", "에서는", "으로는", "에서도", "이라는",
+    "까지", "부터", "에게", "한테", "께서", "에서", "으로", "이나", "이며", "이고",
+    "라고", "처럼", "보다", "라는", "하고", "하여", "해서", "에는", "과는", "와는",
+    "은", "는", "이", "가", "을", "를", "에", "의", "와", "과", "도", "만", "로",
+], key=len, reverse=True)
+VERB_ENDINGS = ("합니다", "했습니다", "입니다", "습니다", "했다", "한다", "하는", "하면", "해야", "된다", "되는")
+STOPWORDS = {
+    "그리고", "하지만", "그러나", "그래서", "또한", "이번", "우리", "정도", "경우", "때문", "위해",
+    "이것", "그것", "저것", "여기", "거기", "있다", "없다", "같은", "대한", "통해", "사용",
+    "방법", "설명", "내용", "부분", "이용", "다음", "아래", "관련", "가지", "하나",
+    "the", "and", "that", "this", "with", "from", "for", "are", "was", "were", "you", "your",
+    "can", "will", "not", "but", "have", "has", "had", "into", "about", "than", "then", "them",
+    "its", "our", "use", "using", "how", "what", "when", "which", "there", "their",
+}
+
+
+def tokenize(text, keep=frozenset()):
+    """소문자 토큰 목록. keep(기존 태그 slug)에 있는 토큰은 조사 제거 없이 그대로 둔다."""
+    out = []
+    for tok in TOKEN_RE.findall((text or "").lower()):
+        tok = tok.strip("-_")
+        if tok in keep:
+            out.append(tok)
+            continue
+        if HANGUL_RE.search(tok):
+            if tok.endswith(VERB_ENDINGS):
+                continue
+            for p in PARTICLES:
+                if tok.endswith(p) and len(tok) - len(p) >= 2:
+                    tok = tok[: -len(p)]
+                    break
+        if len(tok) >= 2 and tok not in STOPWORDS and not tok.isdigit():
+            out.append(tok)
+    return out
+
+
+def vocab_generation():
+    # 캐시에서 밀려났을 때 예전 번호와 겹치지 않도록 시각으로 시작
+    return cache.get_or_set(VOCAB_GENERATION_KEY, int(time.time() * 1000), None)
+
+
+def bump_vocab_generation():
+    try:
+        cache.incr(VOCAB_GENERATION_KEY)
+    except ValueError:
+        cache.set(VOCAB_GENERATION_KEY, int(time.time() * 1000), None)
+
+
+def slug_ok(tok):
+    return 2 <= len(tok) <= 20 and re.fullmatch(r"[a-z0-9\-가-힣_]+", tok) is not None
+
+
+class TagModel:
+    def __init__(self, path=None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._mm = None
+        self.n_docs = 0
+        self.n_terms = 0
+        self._delta = Counter()   # 파일 생성 이후 추가된 문서들의 df 증분
+        self._delta_docs = 0
+        self._tags = None         # 기존 Tag slug/이름 → slug
+        self._tags_gen = None     # _tags를 읽을 때의 vocab 세대
+        if path and os.path.exists(path):
+            self._open(path)
+
+    # ---------- 파일 ----------
+    def _open(self, path):
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size <= len(MAGIC) + 8:
+                return
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if mm[:len(MAGIC)] != MAGIC:
+            mm.close()
+            raise ValueError(f"not a tag model: {path}")
+        view = memoryview(mm)
+        head = view[len(MAGIC):len(MAGIC) + 8].cast("I")
+        self.n_docs, self.n_terms = head[0], head[1]
+        pos = len(MAGIC) + 8
+        self._offsets = view[pos:pos + 4 * (self.n_terms + 1)].cast("I")
+        pos += 4 * (self.n_terms + 1)
+        self._dfs = view[pos:pos + 4 * self.n_terms].cast("I")
+        pos += 4 * self.n_terms
+        self._blob = view[pos:]
+        self._mm = mm
+
+    @staticmethod
+    def write(path, n_docs, df):
+        """df(Counter) → 압축 바이너리 파일. 원자적으로 교체"""
+        terms = sorted(t.encode() for t in df)
+        offsets, dfs, pos = array("I", [0]), array("I"), 0
+        for t in terms:
+            pos += len(t)
+            offsets.append(pos)
+            dfs.append(df[t.decode()])
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(MAGIC)
+            array("I", [n_docs, len(terms)]).tofile(f)
+            offsets.tofile(f)
+            dfs.tofile(f)
+            f.write(b"".join(terms))
+        os.replace(tmp, path)
+
+    def _base_df(self, term):
+        if self._mm is None:
+            return 0
+        key = term.encode()
+        offsets, blob = self._offsets, self._blob
+        lo, hi = 0, self.n_terms
+        while lo < hi:
+            mid = (lo + hi) // 2
+            cur = blob[offsets[mid]:offsets[mid + 1]].tobytes()
+            if cur < key:
+                lo = mid + 1
+            elif cur > key:
+                hi = mid
+            else:
+                return self._dfs[mid]
+        return 0
+
+    # ---------- 통계 ----------
+    def df(self, term):
+        return self._base_df(term) + self._delta.get(term, 0)
+
+    @property
+    def total_docs(self):
+        return self.n_docs + self._delta_docs
+
+    def add_document(self, text):
+        terms = set(tokenize(text, self.tag_vocab()))
+        with self._lock:
+            self._delta.update(terms)
+            self._delta_docs += 1
+
+    # ---------- 태그 바이어스 ----------
+    def tag_vocab(self):
+        gen = vocab_generation()  # 읽기 전에 — 읽는 도중 바뀌면 다음 호출에서 다시 읽음
+        if self._tags is None or self._tags_gen != gen:
+            from .models import Tag
+            vocab = {}
+            for slug, name in Tag.objects.values_list("slug", "name"):
+                vocab[slug.lower()] = slug
+                vocab.setdefault(re.sub(r"\s+", "-", name.strip().lower()), slug)
+            self._tags, self._tags_gen = vocab, gen
+        return self._tags
+
+    # ---------- 추천 ----------
+    def suggest(self, text, k=5):
+        vocab = self.tag_vocab()
+        tokens = tokenize(text, vocab)
+        if not tokens:
+            return []
+        tf = Counter(tokens)
+        # 인접 토큰 "rest framework" → "rest-framework" 처럼 기존 태그와 맞는 bigram만 후보에 추가
+        for a, b in zip(tokens, tokens[1:]):
+            joined = f"{a}-{b}"
+            if joined in vocab:
+                tf[joined] += 1
+
+        n = self.total_docs
+        scored = []
+        for term, count in tf.items():
+            idf = math.log((n + 1) / (self.df(term) + 1)) + 1.0
+            score = (1 + math.log(count)) * idf
+            slug = vocab.get(term)
+            if slug is not None:
+                score *= TAG_BOOST
+            else:
+                slug = term
+            if slug_ok(slug):
+                scored.append((-score, slug))
+        scored.sort()
+
+        out, seen = [], set()
+        for _, slug in scored:
+            if slug not in seen:
+                out.append(slug)
+                seen.add(slug)
+            if len(out) >= k:
+                break
+        return out
+
+
+def build_corpus_df():
+    """모든 글에서 df 계산 → (n_docs, Counter)"""
+    from .models import Post, Tag
+    keep = frozenset(s.lower() for s in Tag.objects.values_list("slug", flat=True))
+    df, n = Counter(), 0
+    for title, content in Post.objects.values_list("title", "content").iterator(chunk_size=500):
+        df.update(set(tokenize(f"{title}\n{content}", keep)))
+        n += 1
+    return n, df
+
+
+_model = None
+_model_lock = threading.Lock()
+
+
+def get_tagger():
+    """프로세스당 1개 (처음 사용할 때 TAG_MODEL_PATH를 mmap)"""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                _model = TagModel(getattr(settings, "TAG_MODEL_PATH", None))
+    return _model
+
+
+def reload_tagger():
+    """파일을 다시 만든 뒤 호출 — 기존 mmap은 참조가 사라지면 GC가 닫는다"""
+    global _model
+    with _model_lock:
+        _model = None
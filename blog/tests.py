@@ -1,3 +1,1611 @@
-from django.test import TestCase
+import datetime
+import gzip
+import importlib
+import io
+import json
+import logging
+import os
+import pstats
+import re
+import sys
+import tempfile
+import threading
+import unittest.mock
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from types import SimpleNamespace
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from .models import (Post, Comment, Like, Notification, Category, Tag, PostScore, Follow, TimelineEntry, PostRevision,
+                     AIUsage, RenderedContent, RequestProfile)
+from .authentication import CachedJWTAuthentication
+from .models import ClaimsUser
+from .renderers import FastJSONRenderer
+from .serializers import ClaimsTokenObtainPairSerializer, PostSerializer
+from .tagger import TagModel, tokenize
+from .throttling import get_store, CacheBucketStore, LocalBucketStore
+from . import idempotency
+from .ai import GeminiAI, LocalAI, TokenUsage, estimate_tokens, get_ai, record_usage, split_chunks
+from .summarizer import split_sentences, summarize
+from .related import RelatedIndex, reset_related_index, set_related_index
+from . import trending
+from . import revisions as history
+from .pagination import EstimatedCountPaginator
+from .profiling import prof_bytes
+from . import ai as ai_module, logs
+from . import serving, staticfiles
+from .purge import purge_post, soft_delete
+from .search import search_post_ids
+from .rendering import plain_text, reading_minutes, render_html
+from .autocomplete import reset_tag_index, to_choseong, to_jamo
+
+
+class FastReadContractTests(TestCase):
+    """
+    API_FAST_READ(.values() + 필드 매퍼) 경로가 기존 ModelSerializer 경로와
+    바이트 단위로 같은 응답을 내는지 확인하는 계약 테스트
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.kim = User.objects.create_user("kim", password="pw12345!")
+        cls.lee = User.objects.create_user("lee", password="pw12345!")
+        backend = Category.objects.create(name="백엔드", slug="backend")
+        jwt = Tag.objects.create(name="jwt", slug="jwt")
+        drf = Tag.objects.create(name="drf", slug="drf")
+
+        for i in range(13):
+            post = Post.objects.create(
+                author=cls.kim if i % 2 else cls.lee,
+                title=f"글 제목 {i}",
+                content=f"한글 본문 {i} 줄바꿈 " * (i + 1),
+                category=backend if i % 3 else None,
+                summary="요약" if i % 4 else "",
+                tags_suggested=["drf", "새글"] if i % 2 else [],
+            )
+            post.tags.set([drf, jwt] if i % 2 else [jwt])
+            if i % 3 == 0:
+                Like.objects.create(post=post, user=cls.kim)
+            comment = Comment.objects.create(post=post, author=cls.lee, content=f"댓글 {i}")
+            Notification.objects.create(user=cls.kim, message=f"알림 {i}", post=post, comment=comment)
+        Notification.objects.create(user=cls.kim, message="시스템 알림")  # post/comment 없음
+
+    def assertSameResponse(self, url, user=None):
+        client = APIClient()
+        if user is not None:
+            client.force_authenticate(user)
+        with override_settings(API_FAST_READ=False):
+            slow = client.get(url)
+        with override_settings(API_FAST_READ=True):
+            fast = client.get(url)
+        self.assertEqual(slow.status_code, 200)
+        self.assertEqual(fast.status_code, 200)
+        self.assertEqual(slow.content, fast.content)
+
+    def test_post_list(self):
+        for url in ["/api/posts/",
+                    "/api/posts/?page=2",
+                    "/api/posts/?ordering=like_count",
+                    "/api/posts/?tags=drf&category=backend",
+                    "/api/posts/?search=본문",
+                    "/api/posts/?fields=id,title,tags",
+                    "/api/posts/?omit=tags,excerpt"]:
+            with self.subTest(url=url):
+                self.assertSameResponse(url)
+
+    def test_comment_lists(self):
+        post = Post.objects.order_by("id").first()
+        self.assertSameResponse("/api/comments/")
+        self.assertSameResponse(f"/api/posts/{post.id}/comments/")
+
+    def test_notification_lists(self):
+        self.assertSameResponse("/api/notifications/", user=self.kim)
+        self.assertSameResponse("/api/notifications/?page=2", user=self.kim)
+        self.assertSameResponse("/api/notifications/unread/", user=self.kim)
+
+
+class StreamingListTests(FastReadContractTests):
+    """스트리밍 목록 응답은 일반 목록 응답과 바이트가 같아야 한다"""
+
+    def assertSameResponse(self, url, user=None):
+        client = APIClient()
+        if user is not None:
+            client.force_authenticate(user)
+        for fast in (False, True):
+            # 같은 URL(next/previous 링크 포함)로 비교하려고 스트리밍 전환 기준만 바꾼다
+            with override_settings(API_FAST_READ=fast, STREAMING_PAGE_SIZE=10**6):
+                normal = client.get(url)
+            with override_settings(API_FAST_READ=fast, STREAMING_PAGE_SIZE=1):
+                streamed = client.get(url)
+            self.assertFalse(normal.streaming)
+            self.assertTrue(streamed.streaming)
+            self.assertEqual(normal.content, b"".join(streamed.streaming_content))
+
+    def test_notification_lists(self):
+        pass  # 알림 목록은 스트리밍 대상 아님
+
+    def test_large_page_size_streams(self):
+        with override_settings(STREAMING_PAGE_SIZE=5):
+            res = APIClient().get("/api/posts/?page_size=5")
+        self.assertTrue(res.streaming)
+
+    def test_invalid_page(self):
+        self.assertEqual(APIClient().get("/api/posts/?page=99&stream=1").status_code, 404)
+
+
+class SparseFieldsetTests(TestCase):
+    """?fields= / ?omit= (DynamicFieldsMixin + SparseFieldsetMixin)와 목록 전용 PostListSerializer"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("sparse", password="pw12345!")
+        cls.category = Category.objects.create(name="백엔드", slug="backend")
+        tag = Tag.objects.create(name="drf", slug="drf")
+        for i in range(3):
+            post = Post.objects.create(author=cls.user, title=f"글 {i}", category=cls.category if i else None,
+                                       content=f"# 제목 {i}\n\n**굵게** 본문 " * 20, summary="요약" if i else "")
+            post.tags.set([tag])
+        cls.post = post
+        Like.objects.create(post=post, user=cls.user)
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def post_selects(self, url):
+        """url 응답과 그 요청이 blog_post에서 읽은 SELECT 문들"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get(url)
+        self.assertEqual(res.status_code, 200)
+        sql = [q["sql"] for q in ctx.captured_queries
+               if q["sql"].startswith("SELECT") and not q["sql"].startswith("SELECT COUNT") and 'FROM "blog_post"' in q["sql"]]
+        self.assertTrue(sql)
+        return res, sql
+
+    def assertSelects(self, column, sql, selected=True):
+        # 렌더링 전 글의 excerpt 대체값 SUBSTR("content", …)은 컬럼 로드가 아님
+        found = re.search(rf'(?<!SUBSTR\()"blog_post"\."{column}"', sql) is not None
+        self.assertEqual(found, selected, f"{column} in {sql}")
+
+    def test_fields_and_omit_on_list(self):
+        res = self.client.get("/api/posts/?fields=id,title")
+        self.assertEqual([set(p) for p in res.data["results"]], [{"id", "title"}] * 3)
+        res = self.client.get("/api/posts/?omit=tags,excerpt")
+        item = res.data["results"][0]
+        self.assertNotIn("tags", item)
+        self.assertNotIn("excerpt", item)
+        self.assertIn("title", item)
+        self.assertNotIn("content", item)  # 목록은 본문 대신 excerpt
+
+    def test_fields_and_omit_on_detail(self):
+        res = self.client.get(f"/api/posts/{self.post.id}/?fields=id,content,tags")
+        self.assertEqual(res.data, {"id": self.post.id, "content": self.post.content, "tags": ["drf"]})
+        res = self.client.get(f"/api/posts/{self.post.id}/?omit=content,content_html")
+        self.assertNotIn("content", res.data)
+        self.assertNotIn("content_html", res.data)
+        self.assertEqual(res.data["like_count"], 1)
+
+    def test_unknown_field_names_are_ignored(self):
+        full = self.client.get(f"/api/posts/{self.post.id}/").data
+        self.assertEqual(self.client.get(f"/api/posts/{self.post.id}/?omit=nope").data, full)
+        self.assertEqual(self.client.get(f"/api/posts/{self.post.id}/?fields=id,nope").data, {"id": self.post.id})
+        res = self.client.get("/api/posts/?fields=title,,password")
+        self.assertEqual(set(res.data["results"][0]), {"title"})
+
+    def test_fields_on_comment_lists_with_select_related(self):
+        comment = Comment.objects.create(post=self.post, author=self.user, content="댓글")
+        for url in ("/api/comments/?fields=content", f"/api/posts/{self.post.id}/comments/?fields=content",
+                    f"/api/comments/{comment.id}/?fields=id,content"):
+            with self.subTest(url=url):
+                res = self.client.get(url)
+                self.assertEqual(res.status_code, 200)
+                item = res.data["results"][0] if "results" in res.data else res.data
+                self.assertEqual(item["content"], "댓글")
+                self.assertNotIn("author", item)
+        res = self.client.get("/api/comments/?fields=id,author")
+        self.assertEqual(res.data["results"][0], {"id": comment.id, "author": "sparse"})
+
+    def test_writes_are_not_trimmed(self):
+        self.client.force_authenticate(self.user)
+        res = self.client.post("/api/posts/?skip_ai=1&fields=id", {"title": "새 글", "content": "본문"}, format="json")
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual(res.data["title"], "새 글")
+        self.assertEqual(res.data["content"], "본문")
+
+    def test_select_columns_follow_fieldset(self):
+        _, sql = self.post_selects("/api/posts/")
+        self.assertSelects("content", sql[0], False)  # 목록은 기본으로 본문을 읽지 않음
+        self.assertSelects("summary", sql[0])
+        _, sql = self.post_selects("/api/posts/?fields=id,title")
+        self.assertSelects("title", sql[0])
+        for column in ("content", "summary", "tags_suggested", "category_id"):
+            self.assertSelects(column, sql[0], False)
+        _, sql = self.post_selects(f"/api/posts/{self.post.id}/?fields=id,summary")
+        self.assertSelects("summary", sql[0])
+        self.assertSelects("content", sql[0], False)
+        _, sql = self.post_selects(f"/api/posts/{self.post.id}/")
+        self.assertSelects("content", sql[0])
+
+    def test_list_item_matches_detail(self):
+        items = self.client.get("/api/posts/").data["results"]
+        for item in items:
+            with self.subTest(id=item["id"]):
+                detail = self.client.get(f"/api/posts/{item['id']}/").data
+                for name in set(item) - {"excerpt"}:
+                    self.assertEqual(item[name], detail[name], name)
+                self.assertEqual(item["excerpt"], plain_text(detail["content"])[:settings.POST_EXCERPT_CHARS])
+        self.assertEqual(set(items[0]) - {"excerpt"}, set(items[0]) & set(PostSerializer(context={}).fields))
+
+
+class CompressionMiddlewareTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user("kim", password="pw12345!")
+        for i in range(10):
+            Post.objects.create(author=user, title=f"압축 테스트 {i}", content="한글 본문 " * 100)
+
+    def test_gzip_roundtrip(self):
+        plain = self.client.get("/api/posts/")
+        res = self.client.get("/api/posts/", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(res["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", res["Vary"])
+        self.assertEqual(gzip.decompress(res.content), plain.content)
+
+    def test_gzip_streaming(self):
+        plain = self.client.get("/api/posts/")
+        res = self.client.get("/api/posts/?stream=1", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(res["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(b"".join(res.streaming_content)), plain.content)
+
+    def test_small_or_refused(self):
+        with override_settings(COMPRESSION_MIN_SIZE=10**9):
+            res = self.client.get("/api/posts/", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertFalse(res.has_header("Content-Encoding"))
+        res = self.client.get("/api/posts/", HTTP_ACCEPT_ENCODING="gzip;q=0, identity")
+        self.assertFalse(res.has_header("Content-Encoding"))
+
+
+class FastJSONRendererTests(TestCase):
+    def test_matches_drf_json_renderer(self):
+        data = {
+            "text": "한글 \u2028 \u2029",
+            "when": datetime.datetime(2025, 9, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+            "day": datetime.date(2025, 9, 1),
+            "price": Decimal("1.50"),
+            "nested": [{"n": 1, "none": None, "ok": True}],
+            1: "int key",
+        }
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_indent_falls_back(self):
+        data = {"a": [1, 2]}
+        media = "application/json; indent=4"
+        self.assertEqual(FastJSONRenderer().render(data, media), JSONRenderer().render(data, media))
+
+
+@override_settings(REST_FRAMEWORK={
+    **settings.REST_FRAMEWORK,
+    "DEFAULT_THROTTLE_RATES": {"register": "2/min", "like": "3/min", "comment": "3/min", "ai": "4/hour"},
+}, AI_THROTTLE_UNIT_CHARS=100)
+class ThrottleTests(TestCase):
+    def setUp(self):
+        get_store().clear()
+        self.user = User.objects.create_user("kim", password="pw12345!")
+        self.post = Post.objects.create(author=self.user, title="글", content="본문")
+        self.client = APIClient()
+
+    def test_token_bucket_refills(self):
+        store = LocalBucketStore()
+        self.assertEqual(store.consume("k", 2, 1.0, 1, now=0), (True, 1.0))
+        self.assertEqual(store.consume("k", 2, 1.0, 1, now=0), (True, 0.0))
+        self.assertFalse(store.consume("k", 2, 1.0, 1, now=0)[0])
+        self.assertTrue(store.consume("k", 2, 1.0, 1, now=1.5)[0])
+
+    def test_cache_store_fails_closed_on_contention_and_open_on_cache_error(self):
+        store = CacheBucketStore()
+        store.lock_wait = 0.01
+        self.addCleanup(store.cache.delete_many, ["ck", "ck:lock"])
+        self.assertEqual(store.consume("ck", 2, 1.0, 1, now=0), (True, 1.0))
+        store.cache.add("ck:lock", 1, 5)  # 다른 워커가 락을 쥐고 있음
+        allowed, tokens = store.consume("ck", 2, 1.0, 1, now=0)
+        self.assertFalse(allowed)
+        self.assertLess(tokens, 1)  # Retry-After > 0
+        store.cache.delete("ck:lock")
+        with unittest.mock.patch.object(store.cache, "add", side_effect=ConnectionError("down")):
+            with self.assertLogs("blog.throttling", "WARNING"):
+                self.assertEqual(store.consume("ck", 2, 1.0, 1, now=0), (True, 2.0))
+
+    def test_register_limited_with_headers(self):
+        for i in range(2):
+            res = self.client.post("/api/auth/register/", {"username": f"u{i}", "password": "pw12345!"})
+            self.assertEqual(res.status_code, 201)
+        self.assertEqual(res["RateLimit-Limit"], "2")
+        self.assertEqual(res["RateLimit-Remaining"], "0")
+        res = self.client.post("/api/auth/register/", {"username": "u9", "password": "pw12345!"})
+        self.assertEqual(res.status_code, 429)
+        self.assertIn("Retry-After", res)
+        self.assertEqual(res["RateLimit-Policy"], "2;w=60")
+
+    def test_like_is_per_user(self):
+        other = User.objects.create_user("lee", password="pw12345!")
+        self.client.force_authenticate(self.user)
+        codes = [self.client.post(f"/api/posts/{self.post.id}/like/").status_code for _ in range(4)]
+        self.assertEqual(codes[-1], 429)
+        self.client.force_authenticate(other)
+        self.assertEqual(self.client.post(f"/api/posts/{self.post.id}/like/").status_code, 201)
+
+    def test_ai_scope_charges_by_length(self):
+        self.client.force_authenticate(self.user)
+        res = self.client.post("/api/posts/", {"title": "긴 글", "content": "가" * 350}, format="json")
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual(res["RateLimit-Remaining"], "0")  # 350자 → 4단위 소진
+        res = self.client.post("/api/posts/", {"title": "짧은 글", "content": "나"}, format="json")
+        self.assertEqual(res.status_code, 429)
+        # skip_ai 수정은 ai scope 대상이 아님
+        res = self.client.patch(f"/api/posts/{self.post.id}/?skip_ai=1", {"title": "제목만"}, format="json")
+        self.assertEqual(res.status_code, 200)
+
+    def test_ai_cost_with_non_numeric_pk_is_404(self):
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.client.post("/api/posts/abc/refresh_ai/").status_code, 404)
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("kim", password="pw12345!")
+        self.post = Post.objects.create(author=self.user, title="글", content="본문")
+        token = ClaimsTokenObtainPairSerializer.get_token(self.user).access_token
+        self.auth = CachedJWTAuthentication()
+        self.token = self.auth.get_validated_token(str(token).encode())
+
+    def test_claims_need_no_queries(self):
+        self.auth.get_user(self.token)  # 캐시 예열
+        with self.assertNumQueries(0):
+            user = self.auth.get_user(self.token)
+            self.assertIsInstance(user, ClaimsUser)
+            self.assertEqual((user.id, user.username, user.is_staff), (self.user.id, "kim", False))
+
+    def test_inactive_user_rejected_after_save(self):
+        self.auth.get_user(self.token)
+        self.user.is_active = False
+        self.user.save()  # signals에서 캐시 무효화
+        with self.assertRaises(Exception):
+            self.auth.get_user(self.token)
+
+    def test_claims_user_assignable_to_fk(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {ClaimsTokenObtainPairSerializer.get_token(self.user).access_token}")
+        res = client.post(f"/api/posts/{self.post.id}/comments/", {"content": "댓글"}, format="json")
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual(res.json()["author"], "kim")
+
+
+class ProfilingTests(TestCase):
+    def setUp(self):
+        self.staff = User.objects.create_superuser("ops", password="pw")
+        self.user = User.objects.create_user("reader", password="pw")
+        Post.objects.create(author=self.user, title="t", content="c")
+
+    def bearer(self, user):
+        return {"HTTP_AUTHORIZATION": f"Bearer {ClaimsTokenObtainPairSerializer.get_token(user).access_token}"}
+
+    def test_header_profiles_staff_only(self):
+        res = self.client.get("/api/posts/?ordering=like_count", HTTP_X_PROFILE="1", **self.bearer(self.user))
+        self.assertNotIn("X-Profile-Id", res)
+        res = self.client.get("/api/posts/?ordering=like_count", HTTP_X_PROFILE="1", **self.bearer(self.staff))
+        self.assertEqual(res.status_code, 200)
+        profile = RequestProfile.objects.get(pk=res["X-Profile-Id"])
+        self.assertEqual((profile.trigger, profile.view_name, profile.user_id), ("header", "post-list", self.staff.pk))
+        self.assertEqual(profile.sql_count, len(profile.queries))
+        self.assertTrue(any("blog_post" in q["sql"] for q in profile.queries))
+        self.assertIn("cumulative", profile.summary)
+        with tempfile.NamedTemporaryFile(suffix=".prof") as f:
+            f.write(prof_bytes(profile))
+            f.flush()
+            self.assertGreater(pstats.Stats(f.name).total_calls, 0)
+
+        self.client.force_login(self.staff)
+        res = self.client.get(f"/admin/blog/requestprofile/{profile.pk}/download/sql/")
+        self.assertEqual(res.status_code, 200)
+        self.assertIn("attachment", res["Content-Disposition"])
+        self.assertEqual(self.client.get(f"/admin/blog/requestprofile/{profile.pk}/download/prof/").content,
+                         prof_bytes(profile))
+
+    @override_settings(PROFILE_SAMPLE_RATE=1.0, PROFILE_KEEP=2)
+    def test_sampling_keeps_latest(self):
+        for _ in range(3):
+            res = self.client.get("/api/posts/")
+        self.assertEqual(RequestProfile.objects.count(), 2)
+        self.assertEqual(RequestProfile.objects.latest("id").pk, int(res["X-Profile-Id"]))
+        self.assertEqual(RequestProfile.objects.latest("id").trigger, "sample")
+
+    @override_settings(SLOW_QUERY_MS=0.000001)
+    def test_slow_query_log_has_view_and_stack(self):
+        with self.assertLogs("blog.slow_sql", "WARNING") as logs:
+            self.client.get("/api/posts/")
+        self.assertIn("view=post-list", logs.output[0])
+        self.assertIn("blog/", logs.output[0])
+
+
+class AdminChangelistTests(TestCase):
+    def setUp(self):
+        self.staff = User.objects.create_superuser("ops", password="pw")
+        self.user = User.objects.create_user("writer", password="pw")
+        self.a = Post.objects.create(author=self.user, title="장고 관리자", content="전문 검색 색인을 쓴다")
+        self.b = Post.objects.create(author=self.user, title="other", content="nothing here")
+        self.client.force_login(self.staff)
+
+    def test_index_follows_writes(self):
+        self.assertEqual(search_post_ids("색인"), [self.a.pk])
+        self.assertEqual(search_post_ids("검"), [self.a.pk])  # 앞부분 일치
+        self.b.content = "이제 색인 대상"
+        self.b.save()
+        self.assertEqual(set(search_post_ids("색인")), {self.a.pk, self.b.pk})
+        Post.all_objects.filter(pk=self.a.pk).update(title="renamed", content="x")
+        self.assertEqual(search_post_ids("색인"), [self.b.pk])
+        Post.all_objects.filter(pk=self.b.pk).delete()
+        self.assertEqual(search_post_ids("색인"), [])
+        self.assertEqual(search_post_ids("   "), [])
+
+    def test_post_search_and_counters(self):
+        Like.objects.create(post=self.a, user=self.staff)
+        soft_delete(self.a)  # 숨긴 글도 관리자에선 보임
+        res = self.client.get("/admin/blog/post/", {"q": "검색"})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual([p.pk for p in res.context["cl"].result_list], [self.a.pk])
+        res = self.client.get("/admin/blog/post/", {"q": str(self.b.pk)})
+        self.assertEqual([p.pk for p in res.context["cl"].result_list], [self.b.pk])
+        res = self.client.get("/admin/blog/post/", {"o": "5"})  # like_count 열로 정렬
+        self.assertEqual(res.status_code, 200)
+
+    def test_related_lookups(self):
+        Comment.objects.create(post=self.a, author=self.user, content="c")
+        Like.objects.create(post=self.b, user=self.staff)
+        res = self.client.get("/admin/blog/comment/", {"q": "writer"})
+        self.assertEqual(len(res.context["cl"].result_list), 1)
+        res = self.client.get("/admin/blog/like/", {"q": str(self.b.pk)})
+        self.assertEqual(len(res.context["cl"].result_list), 1)
+        res = self.client.get("/admin/blog/like/", {"q": "nobody"})
+        self.assertEqual(len(res.context["cl"].result_list), 0)
+        self.assertEqual(self.client.get("/admin/blog/notification/", {"is_read__exact": "0"}).status_code, 200)
+
+    def test_estimated_count(self):
+        Post.all_objects.filter(pk=self.a.pk).delete()  # MAX(id) 추정은 지워진 행을 모름
+        with override_settings(ADMIN_ESTIMATED_COUNT_MIN=1):
+            self.assertEqual(EstimatedCountPaginator(Post.all_objects.all(), 10).count, self.b.pk)
+            self.assertEqual(EstimatedCountPaginator(Post.all_objects.filter(pk=self.b.pk), 10).count, 1)
+        self.assertEqual(EstimatedCountPaginator(Post.all_objects.all(), 10).count, 1)
+
+
+class ServingTests(TestCase):
+    """운영 서빙: 실행 계획, collectstatic(해시 + 미리 압축), 정적 파일 미들웨어, SPA 진입 페이지"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.static_root = cls.enterClassContext(tempfile.TemporaryDirectory())
+        cls.enterClassContext(override_settings(
+            STATIC_ROOT=cls.static_root,
+            STORAGES={**settings.STORAGES,
+                      "staticfiles": {"BACKEND": "blog.staticfiles.CompressedManifestStaticFilesStorage"}},
+            MIDDLEWARE=["blog.middleware.StaticFilesMiddleware", *settings.MIDDLEWARE],
+        ))
+        call_command("collectstatic", interactive=False, verbosity=0)
+        staticfiles.frontend_html.cache_clear()
+        cls.addClassCleanup(staticfiles.frontend_html.cache_clear)
+
+    def test_plan_sizes_to_cpus(self):
+        self.assertEqual(serving.plan("wsgi", cpus=4), {"mode": "wsgi", "cpus": 4, "workers": 9, "threads": 4})
+        self.assertEqual(serving.plan("asgi", cpus=4)["workers"], 4)
+        with override_settings(SERVE_MAX_WORKERS=5, SERVE_THREADS=8):
+            self.assertEqual(serving.plan("wsgi", cpus=4)["workers"], 5)
+            self.assertEqual(serving.plan("wsgi", cpus=4)["threads"], 8)
+        self.assertEqual(serving.plan("wsgi", cpus=4, workers=2)["workers"], 2)
+        argv = serving.command(serving.plan("asgi", cpus=2), bind="127.0.0.1:9000")
+        self.assertEqual(argv[1:3], ["-m", "gunicorn"])
+        self.assertIn(serving.ASGI_WORKER, argv)
+        self.assertEqual(argv[-1], serving.ASGI_APP)
+        self.assertGreaterEqual(serving.cpu_count(), 1)
+
+    def test_hashed_modules_and_precompressed(self):
+        app = staticfiles.staticfiles_storage.stored_name("js/app.js")
+        self.assertNotEqual(app, "js/app.js")
+        with open(os.path.join(self.static_root, app), encoding="utf-8") as f:
+            body = f.read()
+        self.assertIn(f'from "./{os.path.basename(staticfiles.staticfiles_storage.stored_name("js/state.js"))}";', body)
+        with open(os.path.join(self.static_root, app + ".gz"), "rb") as f:
+            self.assertEqual(gzip.decompress(f.read()).decode(), body)
+
+    def test_static_middleware(self):
+        url = staticfiles.staticfiles_storage.url("js/app.js")
+        res = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res["Content-Encoding"], "gzip")
+        self.assertEqual(res["Cache-Control"], staticfiles.IMMUTABLE)
+        self.assertEqual(res["Vary"], "Accept-Encoding")
+        self.assertTrue(res["Content-Type"].startswith("text/javascript"))
+        self.assertIn(b"import", gzip.decompress(b"".join(res.streaming_content)))
+        again = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=res["ETag"])
+        self.assertEqual(again.status_code, 304)
+        plain = self.client.get("/static/js/app.js")  # 해시 없는 이름: 원본, 짧은 캐시
+        self.assertNotIn("Content-Encoding", plain)
+        self.assertEqual(plain["Cache-Control"], f"public, max-age={settings.STATIC_MAX_AGE}")
+        self.assertEqual(self.client.head(url, HTTP_ACCEPT_ENCODING="gzip")["Content-Length"], res["Content-Length"])
+        self.assertEqual(self.client.get("/static/missing.js").status_code, 404)
+
+    def test_frontend_index(self):
+        res = self.client.get("/")
+        self.assertEqual(res.status_code, 200)
+        html = res.content.decode()
+        self.assertIn(f'src="{staticfiles.staticfiles_storage.url("js/app.js")}"', html)
+        self.assertIn('<meta name="api-base" content="" />', html)
+        self.assertNotIn('"./', html)
+        self.assertEqual(self.client.get("/", HTTP_IF_NONE_MATCH=res["ETag"]).status_code, 304)
+
+    def test_production_settings_require_secret(self):
+        sys.modules.pop("config.settings_production", None)
+        with unittest.mock.patch.dict(os.environ, {"DJANGO_SECRET_KEY": ""}):
+            with self.assertRaises(ImproperlyConfigured):
+                importlib.import_module("config.settings_production")
+        sys.modules.pop("config.settings_production", None)
+        env = {"DJANGO_SECRET_KEY": "s", "ALLOWED_HOSTS": "a.example, b.example", "CACHE_URL": ""}
+        with unittest.mock.patch.dict(os.environ, env):
+            with self.assertRaises(ImproperlyConfigured):  # 공유 캐시 없이는 시작하지 않음
+                importlib.import_module("config.settings_production")
+        sys.modules.pop("config.settings_production", None)
+        with unittest.mock.patch.dict(os.environ, {**env, "CACHE_URL": "memcached://m1:11211, m2:11211"}):
+            prod = importlib.import_module("config.settings_production")
+        sys.modules.pop("config.settings_production", None)
+        self.assertEqual(prod.CACHES["default"]["LOCATION"], ["m1:11211", "m2:11211"])
+        self.assertEqual(prod.THROTTLE_STORE, "blog.throttling.CacheBucketStore")
+        self.assertEqual(prod.IDEMPOTENCY_STORE, "blog.idempotency.CacheIdempotencyStore")
+        with unittest.mock.patch.dict(os.environ, {**env, "CACHE_URL": "redis://cache:6379/0"}):
+            prod = importlib.import_module("config.settings_production")
+        self.assertEqual(prod.CACHES["default"]["BACKEND"], "django.core.cache.backends.redis.RedisCache")
+        self.assertFalse(prod.DEBUG)
+        self.assertEqual(prod.ALLOWED_HOSTS, ["a.example", "b.example"])
+        self.assertEqual(prod.MIDDLEWARE[0], "blog.middleware.StaticFilesMiddleware")
+        self.assertNotIn("rest_framework.renderers.BrowsableAPIRenderer",
+                         prod.REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"])
+
+
+class StructuredLoggingTests(TestCase):
+    def setUp(self):
+        self.stream = io.StringIO()
+        self.handler = logs.NonBlockingQueueHandler(stream=self.stream)
+        self.handler.addFilter(logs.RequestIdFilter())
+        self.addCleanup(self.handler.flush_and_stop)
+
+    def capture(self, name):
+        logger = logging.getLogger(name)
+        logger.addHandler(self.handler)
+        self.addCleanup(logger.removeHandler, self.handler)
+        logger.propagate = False  # 설정된 root 핸들러(stderr)로는 안 보냄
+        self.addCleanup(setattr, logger, "propagate", True)
+
+    def lines(self):
+        self.handler.flush_and_stop()
+        return [json.loads(line) for line in self.stream.getvalue().splitlines()]
+
+    def test_request_id_through_view(self):
+        self.capture("blog.views")
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user("logger", password="pw"))
+        res = client.post("/api/posts/", {"title": "t", "content": "c"}, format="json",
+                          HTTP_X_REQUEST_ID="req-12345678")
+        self.assertEqual(res["X-Request-ID"], "req-12345678")
+        [line] = [e for e in self.lines() if e["msg"].startswith("AI filled")]
+        self.assertEqual((line["request_id"], line["post_id"], line["level"]), ("req-12345678", res.json()["id"], "INFO"))
+        generated = client.get("/api/posts/", HTTP_X_REQUEST_ID="bad id!")["X-Request-ID"]
+        self.assertRegex(generated, r"^[0-9a-f]{32}$")
+
+    def test_context_reaches_thread_pool(self):
+        self.capture("blog.test_pool")
+        token = logs.request_id_var.set("pool-req-1")
+        self.addCleanup(logs.request_id_var.reset, token)
+        log = logging.getLogger("blog.test_pool")
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            list(pool.map(logs.in_context(lambda i: log.warning("chunk %s", i)), range(4)))
+        self.assertEqual({e["request_id"] for e in self.lines()}, {"pool-req-1"})
+
+    def test_sampling_per_logger_and_request(self):
+        f = logs.SamplingFilter({"blog.views": 0.5, "blog.quiet": 0})
+        record = lambda name, level=logging.INFO: logging.LogRecord(name, level, "", 0, "m", (), None)  # noqa: E731
+        self.assertTrue(f.filter(record("blog.ai")))
+        self.assertFalse(f.filter(record("blog.quiet.child")))
+        self.assertTrue(f.filter(record("blog.quiet", logging.WARNING)))
+        kept = set()
+        for i in range(200):
+            token = logs.request_id_var.set(f"request-{i}")
+            decisions = {f.filter(record("blog.views")) for _ in range(3)}
+            logs.request_id_var.reset(token)
+            self.assertEqual(len(decisions), 1)  # 같은 요청은 모두 남기거나 모두 버림
+            kept |= decisions
+        self.assertEqual(kept, {True, False})
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        handler = logs.NonBlockingQueueHandler(maxsize=1, stream=io.StringIO())
+        handler.listener.stop()
+        for i in range(3):
+            handler.handle(logging.LogRecord("x", logging.INFO, "", 0, "m", (), None))
+        self.assertEqual(handler.dropped, 2)
+        handler.listener = None
+
+    def test_no_secret_or_stdout_noise(self):
+        with self.assertLogs("blog.ai", "INFO") as captured:
+            ai_module._build_ai((False, "local", "AIzaSECRET9876", "m", "m"))
+        self.assertNotIn("9876", "".join(captured.output))
+        with unittest.mock.patch("sys.stdout", new_callable=io.StringIO) as out:
+            PostSerializer().validate_tags("a, b")
+        self.assertEqual(out.getvalue(), "")
+
+
+class LocalTaggerTests(TestCase):
+    def test_tokenize_strips_korean_particles(self):
+        self.assertEqual(tokenize("데이터베이스를 장고에서 설정합니다"), ["데이터베이스", "장고"])
+
+    def test_model_file_roundtrip_and_tag_bias(self):
+        Tag.objects.create(name="redis", slug="redis")
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "tagmodel.bin")
+            TagModel.write(path, 3, {"캐시": 3, "redis": 1, "파이썬": 2})
+            model = TagModel(path)
+            self.assertEqual((model.df("캐시"), model.df("redis"), model.df("없음")), (3, 1, 0))
+            model.add_document("캐시 서버")
+            self.assertEqual((model.df("캐시"), model.total_docs), (4, 4))
+            tags = model.suggest("파이썬에서 Redis를 캐시로 쓰는 서버 캐시 설정", k=3)
+        self.assertEqual(tags[0], "redis")
+        self.assertNotIn("캐시", tags[:1])
+
+    def test_tag_vocab_follows_tag_changes(self):
+        model = TagModel()
+        tag = Tag.objects.create(name="Rest Framework", slug="drf")
+        vocab = model.tag_vocab()
+        self.assertEqual(vocab["rest-framework"], "drf")
+        with self.assertNumQueries(0):
+            model.tag_vocab()  # 세대가 그대로면 다시 읽지 않음
+        with self.captureOnCommitCallbacks(execute=True):
+            tag.name = "Django REST"
+            tag.save()
+        self.assertEqual(model.tag_vocab().get("django-rest"), "drf")
+        self.assertNotIn("rest-framework", model.tag_vocab())
+        with self.captureOnCommitCallbacks(execute=True):
+            tag.delete()
+        self.assertEqual(model.tag_vocab(), {})
+
+
+class LocalSummarizerTests(TestCase):
+    text = (
+        "# 장고 캐시 정리\n"
+        "장고에서 캐시를 설정하면 반복되는 쿼리를 줄일 수 있다. "
+        "캐시 백엔드는 redis나 memcached를 주로 쓴다. "
+        "오늘 점심은 김밥이었다. "
+        "캐시 키를 잘 설계해야 캐시 무효화가 쉬워진다.\n"
+        "- 목록 응답은 짧은 TTL로 캐시한다."
+    )
+
+    def test_split_sentences_strips_markup(self):
+        sents = split_sentences(self.text)
+        self.assertEqual(sents[0], "장고 캐시 정리")
+        self.assertEqual(sents[-1], "목록 응답은 짧은 TTL로 캐시한다.")
+
+    def test_summary_fits_budget_and_skips_off_topic(self):
+        out = summarize(self.text, max_chars=80)
+        self.assertTrue(0 < len(out) <= 80)
+        self.assertNotIn("김밥", out)
+
+    def test_local_ai_analyze(self):
+        summary, tags = LocalAI().analyze(self.text, max_chars=120, k=3)
+        self.assertLessEqual(len(summary), 120)
+        self.assertIn("캐시", tags)
+
+    def test_create_post_fills_local_summary(self):
+        user = User.objects.create_user(username="s", password="pw")
+        client = APIClient()
+        client.force_authenticate(user)
+        res = client.post("/api/posts/", {"title": "캐시", "content": self.text}, format="json")
+        self.assertEqual(res.status_code, 201)
+        post = Post.objects.get(pk=res.data["id"])
+        self.assertTrue(post.summary)
+        self.assertLessEqual(len(post.summary), 120)
+
+    @override_settings(AI_PROVIDER="dummy", AI_UPGRADE_MIN_CHARS=10)
+    def test_dummy_provider_does_not_schedule_upgrade(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user("dummy", password="pw"))
+        with unittest.mock.patch("blog.views.schedule_ai_upgrade") as schedule, \
+                self.captureOnCommitCallbacks(execute=True):
+            res = client.post("/api/posts/", {"title": "더미", "content": self.text}, format="json")
+        self.assertEqual(res.status_code, 201)
+        schedule.assert_not_called()
+        with unittest.mock.patch("blog.ai.get_ai", return_value=ai_module.DummyAI()), \
+                self.assertNoLogs("blog.ai", "ERROR"):
+            ai_module.upgrade_post_ai(res.data["id"])  # analyze()가 없는 provider는 건너뜀
+
+    def test_provider_is_cached_and_sdk_not_imported(self):
+        import subprocess
+        import sys
+        self.assertIs(get_ai(), get_ai())
+        with override_settings(AI_PROVIDER="dummy"):
+            self.assertNotIsInstance(get_ai(), LocalAI)
+        self.assertIsInstance(get_ai(), LocalAI)
+        # 로컬 provider로 앱을 띄우면 Gemini SDK를 읽지 않음 (새 인터프리터에서 확인)
+        code = ("import os, sys; os.environ['DJANGO_SETTINGS_MODULE'] = 'config.settings'; import django;"
+                "django.setup(); import blog.views; print('google.generativeai' in sys.modules)")
+        out = subprocess.run([sys.executable, "-W", "ignore", "-c", code], cwd=settings.BASE_DIR,
+                             env={**os.environ, "AI_ENABLE": "false"}, capture_output=True, text=True)
+        self.assertEqual(out.stdout.strip(), "False", out.stderr)
+
+
+class _FakeGenAI:
+    """google.generativeai 대역: 프롬프트를 기록하고 JSON 모드면 요약/태그 JSON을 돌려준다"""
+    def __init__(self):
+        self.prompts = []
+
+    def GenerativeModel(self, model, generation_config, safety_settings):
+        fake = self
+        json_mode = generation_config.get("response_mime_type") == "application/json"
+
+        class Model:
+            def generate_content(self, prompt):
+                fake.prompts.append(prompt)
+                text = '{"summary": "캐시 정리 글", "tags": ["캐시", "Django Cache"]}' if json_mode else "부분 요약"
+                part = SimpleNamespace(text=text)
+                return SimpleNamespace(
+                    candidates=[SimpleNamespace(finish_reason=1, content=SimpleNamespace(parts=[part]))],
+                    usage_metadata=SimpleNamespace(prompt_token_count=len(prompt), candidates_token_count=7))
+        return Model()
+
+
+class ChunkedAnalyzeTests(TestCase):
+    paragraph = "장고 캐시 설정과 키 설계, 무효화 전략을 정리한다. " * 8
+
+    def make_ai(self):
+        ai = GeminiAI.__new__(GeminiAI)  # SDK configure 없이
+        ai.genai, ai.safety, ai.summary_model, ai.tag_model = _FakeGenAI(), {}, "fake", "fake"
+        return ai
+
+    def test_split_chunks_is_paragraph_aligned_and_within_budget(self):
+        text = "\n\n".join(f"{i}. {self.paragraph}" for i in range(10))
+        chunks = split_chunks(text, 300)
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(estimate_tokens(c) <= 300 for c in chunks))
+        self.assertEqual("\n\n".join(chunks), "\n\n".join(p.strip() for p in text.split("\n\n")))
+
+    def test_small_post_single_call(self):
+        ai, usage = self.make_ai(), TokenUsage()
+        summary, tags = ai.analyze(self.paragraph, usage=usage)
+        self.assertEqual((summary, tags), ("캐시 정리 글", ["캐시", "django-cache"]))
+        self.assertEqual((usage.calls, usage.chunks), (1, 0))
+
+    @override_settings(AI_CHUNK_TOKENS=200, AI_MAX_CHUNKS=4)
+    def test_large_post_map_reduce_and_usage_recorded(self):
+        ai, usage = self.make_ai(), TokenUsage()
+        text = "\n\n".join(f"{i}. {self.paragraph}" for i in range(12))
+        summary, _ = ai.analyze(text, usage=usage)
+        self.assertEqual(summary, "캐시 정리 글")
+        self.assertTrue(1 < usage.chunks <= 4)
+        self.assertEqual(usage.calls, usage.chunks + 1)
+        reduce_prompt = ai.genai.prompts[-1]
+        self.assertIn(f"[1/{usage.chunks}] 부분 요약", reduce_prompt)
+        self.assertNotIn(self.paragraph, reduce_prompt)  # 원문은 reduce에 다시 보내지 않음
+
+        post = Post.objects.create(author=User.objects.create_user(username="u", password="pw"), title="t")
+        record_usage(post.id, usage, "fake")
+        row = AIUsage.objects.get(post=post)
+        self.assertEqual((row.calls, row.chunks, row.prompt_tokens), (usage.calls, usage.chunks, usage.prompt_tokens))
+        record_usage(post.id, TokenUsage())  # 호출 없음 → 기록 안 함
+        self.assertEqual(AIUsage.objects.count(), 1)
+
+
+class RelatedPostsTests(TestCase):
+    def setUp(self):
+        reset_related_index()
+        self.addCleanup(reset_related_index)
+        self.user = User.objects.create_user(username="r", password="pw")
+        self.client = APIClient()
+        redis = Tag.objects.create(name="redis", slug="redis")
+        self.a = Post.objects.create(author=self.user, title="redis 캐시", content="redis 캐시 설정과 만료 정책")
+        self.b = Post.objects.create(author=self.user, title="redis 클러스터", content="redis 클러스터 구성",
+                                     tags_suggested=["캐시"])
+        self.c = Post.objects.create(author=self.user, title="김치찌개", content="김치찌개 끓이는 법")
+        self.a.tags.add(redis)
+        self.b.tags.add(redis)
+        set_related_index(RelatedIndex().build())  # build_related_index 파일을 읽은 것과 같은 상태
+
+    def test_missing_index_file_builds_in_background(self):
+        reset_related_index()
+        with tempfile.TemporaryDirectory() as d, \
+                override_settings(RELATED_INDEX_PATH=os.path.join(d, "related.bin")), \
+                unittest.mock.patch("blog.related.threading.Thread") as thread:
+            with self.assertLogs("blog.related", "WARNING") as logs:
+                res = self.client.get(f"/api/posts/{self.a.id}/related/")
+            self.assertEqual(res.status_code, 503)  # 요청 안에서 빌드하지 않음
+            self.assertEqual(res["Retry-After"], "30")
+            self.assertIn("build_related_index", logs.output[0])
+            self.assertEqual(self.client.get(f"/api/posts/{self.a.id}/related/").status_code, 503)
+            thread.assert_called_once()  # 빌드는 한 번만 시작
+            target, args = thread.call_args.kwargs["target"], thread.call_args.kwargs["args"]
+            target(*args)  # 스레드 대신 여기서 실행 (테스트 트랜잭션의 데이터를 보도록)
+            self.assertTrue(os.path.exists(os.path.join(d, "related.bin")))
+            res = self.client.get(f"/api/posts/{self.a.id}/related/")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual([item["id"] for item in res.data], [self.b.id])
+
+    def test_related_ranks_shared_tags(self):
+        res = self.client.get(f"/api/posts/{self.a.id}/related/")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual([item["id"] for item in res.data], [self.b.id])
+        self.assertIn("excerpt", res.data[0])
+        self.assertEqual(self.client.get("/api/posts/999999/related/").status_code, 404)
+
+    def test_index_follows_saves_and_deletes(self):
+        self.client.get(f"/api/posts/{self.a.id}/related/")
+        with self.captureOnCommitCallbacks(execute=True):
+            d = Post.objects.create(author=self.user, title="redis 캐시 만료", content="redis 캐시 만료 정책 정리")
+        ids = [item["id"] for item in self.client.get(f"/api/posts/{self.a.id}/related/").data]
+        self.assertEqual(ids[0], d.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            d.delete()
+        ids = [item["id"] for item in self.client.get(f"/api/posts/{self.a.id}/related/").data]
+        self.assertNotIn(d.id, ids)
+
+    def test_incremental_matches_rebuild(self):
+        index = RelatedIndex().build()
+        index.upsert(self.c.id, "redis 캐시", "redis 캐시 만료", ["redis"], [])
+        index.remove(self.b.id)
+        self.c.title, self.c.content = "redis 캐시", "redis 캐시 만료"
+        self.c.save()
+        self.c.tags.add(Tag.objects.get(slug="redis"))
+        self.b.delete()
+        fresh = RelatedIndex().build()
+        for post_id in (self.a.id, self.c.id):
+            self.assertEqual([p for p, _ in index.related(post_id, 20)], [p for p, _ in fresh.related(post_id, 20)])
+
+    def test_index_file_roundtrip(self):
+        index = RelatedIndex().build()
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "related.bin")
+            index.write(path)
+            loaded = RelatedIndex.read(path)
+        self.assertEqual(len(loaded), 3)
+        self.assertEqual([p for p, _ in loaded.related(self.a.id)], [self.b.id])
+        loaded.upsert(self.c.id, "redis 캐시", "redis 캐시 설정", ["redis"], [])
+        self.assertIn(self.c.id, [p for p, _ in loaded.related(self.a.id)])
+
+
+class TrendingTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="t", password="pw")
+        self.other = User.objects.create_user(username="t2", password="pw")
+        self.old = Post.objects.create(author=self.user, title="old", content="old")
+        self.new = Post.objects.create(author=self.user, title="new", content="new")
+        self.quiet = Post.objects.create(author=self.user, title="quiet", content="quiet")
+
+    def test_events_update_score_and_counters(self):
+        self.addCleanup(trending.flush)
+        with self.captureOnCommitCallbacks(execute=True):
+            Like.objects.create(post=self.new, user=self.user)
+            like = Like.objects.create(post=self.new, user=self.other)
+            Comment.objects.create(post=self.new, author=self.other, content="hi")
+        self.assertFalse(PostScore.objects.filter(post=self.new).exists())  # 아직 버퍼에만
+        self.assertEqual(trending.flush(), 1)  # 세 이벤트가 글 하나로 합쳐짐
+        row = PostScore.objects.get(post=self.new)
+        self.assertEqual((row.likes, row.comments), (2, 1))
+        before = row.score
+        with self.captureOnCommitCallbacks(execute=True):
+            like.delete()
+        self.assertEqual(trending.like_count(self.new.id), 2)  # 반영된 카운터만 (워커마다 같은 값)
+        trending.flush()
+        row.refresh_from_db()
+        self.assertEqual(row.likes, 1)
+        self.assertEqual(trending.like_count(self.new.id), 1)
+        self.assertAlmostEqual(before - row.score, 2 ** ((like.created_at.timestamp() - trending.get_epoch()) / trending.half_life()))
+
+    def test_flush_adds_score_to_row_created_by_another_process(self):
+        self.addCleanup(trending.flush)
+        with self.captureOnCommitCallbacks(execute=True):
+            Like.objects.create(post=self.new, user=self.user)
+        real_filter = Like.objects.filter
+
+        def race_then_count(**kwargs):  # 이 버퍼가 행이 없다고 본 뒤(COUNT 직전) 다른 워커가 먼저 만든 경우
+            # 그쪽도 COUNT(*)로 만들었으므로 이 버퍼의 (커밋된) 좋아요가 이미 들어 있음
+            PostScore.objects.bulk_create([PostScore(post=self.new, score=1.0, likes=1, comments=0)])
+            return real_filter(**kwargs)
+
+        with unittest.mock.patch.object(Like.objects, "filter", side_effect=race_then_count):
+            self.assertEqual(trending.flush(), 1)
+        row = PostScore.objects.get(post=self.new)
+        self.assertEqual((row.likes, row.comments), (1, 0))  # 카운터는 이중 집계하지 않음
+        self.assertGreater(row.score, 1.0)  # 점수 증분은 더함
+
+    def test_failed_flush_keeps_deltas_for_retry(self):
+        self.addCleanup(trending.flush)
+        with self.captureOnCommitCallbacks(execute=True):
+            Like.objects.create(post=self.new, user=self.user)
+            Like.objects.create(post=self.quiet, user=self.user)
+        with unittest.mock.patch("blog.trending.get_epoch", side_effect=DatabaseError("locked")):
+            with self.assertRaises(DatabaseError):
+                trending.flush()
+        self.assertEqual(trending.buffer.pending(self.new.id), (1, 0))
+        self.assertEqual(trending.flush(), 2)
+        self.assertEqual(dict(PostScore.objects.values_list("post_id", "likes")), {self.new.id: 1, self.quiet.id: 1})
+
+    @override_settings(TRENDING_FLUSH_SECONDS=0.05)
+    def test_background_thread_flushes_without_new_events(self):
+        buf = trending.CounterBuffer()
+        flushed = threading.Event()
+        with unittest.mock.patch.object(buf, "flush", side_effect=lambda: flushed.set()):
+            buf.add(self.new.id, 1.0, timezone.now().timestamp(), likes=1)  # 첫 add: 기한 전이라 여기서는 반영 안 함
+            self.assertTrue(flushed.wait(2))
+        buf._flusher_pid = None  # 스레드 종료
+
+    def test_reconcile_fixes_counter_drift(self):
+        Like.objects.create(post=self.new, user=self.user)
+        Comment.objects.create(post=self.new, author=self.other, content="hi")
+        PostScore.objects.bulk_create([PostScore(post=self.new, score=1.0, likes=7, comments=0),
+                                       PostScore(post=self.quiet, score=1.0, likes=0, comments=0)])
+        self.assertEqual(trending.reconcile(), 1)
+        self.assertEqual(dict(PostScore.objects.values_list("post_id", "likes")), {self.new.id: 1, self.quiet.id: 0})
+        self.assertEqual(PostScore.objects.get(post=self.new).comments, 1)
+        out = io.StringIO()
+        call_command("decay_scores", stdout=out)
+        self.assertIn("0 reconciled", out.getvalue())
+
+    @override_settings(TRENDING_FLUSH_EVENTS=3)
+    def test_buffer_flushes_after_event_threshold(self):
+        users = [User.objects.create_user(username=f"f{i}", password="pw") for i in range(3)]
+        with self.captureOnCommitCallbacks(execute=True):
+            for u in users[:2]:
+                Like.objects.create(post=self.new, user=u)
+        self.assertFalse(PostScore.objects.exists())
+        with self.captureOnCommitCallbacks(execute=True):
+            Like.objects.create(post=self.quiet, user=users[2])
+        self.assertEqual(dict(PostScore.objects.values_list("post_id", "likes")), {self.new.id: 2, self.quiet.id: 1})
+
+    def test_recent_activity_outranks_older_and_no_aggregation(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        self.addCleanup(trending.flush)
+        two_days_ago = timezone.now() - datetime.timedelta(hours=48)
+        with self.captureOnCommitCallbacks(execute=True):
+            trending.record(self.old.id, 3.0, two_days_ago)   # 3 × 1/4 = 0.75
+            Like.objects.create(post=self.new, user=self.other)  # 1
+        trending.flush()
+        client = APIClient()
+        with CaptureQueriesContext(connection) as ctx:
+            res = client.get("/api/posts/trending/")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual([p["id"] for p in res.data["results"]], [self.new.id, self.old.id])
+        self.assertEqual(res.data["results"][0]["like_count"], 1)
+        self.assertFalse(any("blog_like" in q["sql"] or "blog_comment" in q["sql"] for q in ctx.captured_queries))
+
+    def test_trending_read_does_not_flush(self):
+        self.addCleanup(trending.flush)
+        with self.captureOnCommitCallbacks(execute=True):
+            Like.objects.create(post=self.new, user=self.other)
+        with unittest.mock.patch("blog.trending.apply_deltas") as apply:
+            res = APIClient().get("/api/posts/trending/")
+        self.assertEqual(res.status_code, 200)
+        apply.assert_not_called()  # 읽기 요청은 DB에 쓰지 않음
+        self.assertEqual(trending.buffer.pending(self.new.id), (1, 0))
+
+    def test_decay_keeps_order_and_zeroes_cold_posts(self):
+        self.addCleanup(trending.flush)
+        now = timezone.now()
+        with self.captureOnCommitCallbacks(execute=True):
+            trending.record(self.old.id, 1.0, now - datetime.timedelta(days=10))
+            trending.record(self.new.id, 1.0, now)
+            trending.record(self.quiet.id, 1.0, now - datetime.timedelta(hours=1))
+        kept, cooled = trending.decay(min_score=0.05, now=now.timestamp())
+        self.assertEqual((kept, cooled), (2, 1))
+        scores = dict(PostScore.objects.values_list("post_id", "score"))
+        self.assertEqual(scores[self.old.id], 0)  # 행은 카운터 때문에 남음
+        self.assertAlmostEqual(scores[self.new.id], 1.0)
+        self.assertLess(scores[self.quiet.id], 1.0)
+
+
+class LikeToggleTests(TestCase):
+    def setUp(self):
+        self.addCleanup(trending.flush)
+        self.user = User.objects.create_user(username="liker", password="pw")
+        self.post = Post.objects.create(author=self.user, title="t", content="c")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = f"/api/posts/{self.post.id}/like/"
+
+    def test_like_is_idempotent_and_single_statement(self):
+        with self.assertNumQueries(1):
+            res = self.client.post(self.url)
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual(self.client.post(self.url).status_code, 200)
+        self.assertEqual(Like.objects.filter(post=self.post).count(), 1)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.delete(self.url).status_code, 204)
+        self.assertEqual(self.client.delete(self.url).status_code, 204)
+        self.assertFalse(Like.objects.exists())
+        self.assertEqual(self.client.post("/api/posts/999999/like/").status_code, 404)
+
+    def test_counters_follow_toggles(self):
+        other = User.objects.create_user(username="liker2", password="pw")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self.url)
+            self.client.post(self.url)  # 중복은 카운터에 안 들어감
+            self.client.force_authenticate(other)
+            self.client.post(self.url)
+        trending.flush()
+        self.assertEqual(PostScore.objects.get(post=self.post).likes, 2)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(self.url)
+            self.client.delete(self.url)
+        trending.flush()
+        row = PostScore.objects.get(post=self.post)
+        self.assertEqual(row.likes, 1)
+        self.assertGreater(row.score, 0)
+
+    def test_likes_list_is_paginated_from_counter(self):
+        Like.objects.create(post=self.post, user=self.user)
+        PostScore.objects.create(post=self.post, score=1.0, likes=1)
+        with self.assertNumQueries(2):  # 카운터 + 페이지 (COUNT 없음)
+            res = APIClient().get(f"/api/posts/{self.post.id}/likes/")
+        self.assertEqual(res.data["count"], 1)
+        self.assertEqual(res.data["results"][0]["username"], "liker")
+
+
+class IdempotencyTests(TestCase):
+    def setUp(self):
+        get_store().clear()
+        idempotency.get_store().clear()
+        self.addCleanup(trending.flush)
+        self.user = User.objects.create_user(username="idem", password="pw")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create(self, key, **data):
+        body = {"title": "제목", "content": "본문", **data}
+        return self.client.post("/api/posts/?skip_ai=1", body, format="json", HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_retry_replays_without_duplicate(self):
+        first = self.create("k1")
+        self.assertEqual(first.status_code, 201)
+        again = self.create("k1")
+        self.assertEqual(again.status_code, 201)
+        self.assertEqual(again["Idempotent-Replayed"], "true")
+        self.assertEqual(again.json()["id"], first.json()["id"])
+        self.assertNotIn("RateLimit-Remaining", again)  # throttle 토큰을 쓰지 않음
+        self.assertEqual(Post.objects.count(), 1)
+        self.assertEqual(self.create("k2").status_code, 201)
+        self.assertEqual(Post.objects.count(), 2)
+
+    def test_key_reused_for_other_body_or_user(self):
+        self.create("k1")
+        self.assertEqual(self.create("k1", title="다른 글").status_code, 422)
+        self.client.force_authenticate(User.objects.create_user(username="other", password="pw"))
+        self.assertEqual(self.create("k1").status_code, 201)  # 키는 사용자별
+        self.assertEqual(Post.objects.count(), 2)
+
+    def test_like_and_comment_replay(self):
+        post = Post.objects.create(author=self.user, title="t", content="c")
+        url = f"/api/posts/{post.id}/like/"
+        self.assertEqual(self.client.post(url, HTTP_IDEMPOTENCY_KEY="l").status_code, 201)
+        self.assertEqual(self.client.post(url, HTTP_IDEMPOTENCY_KEY="l").status_code, 201)  # 200 already liked 아님
+        url = f"/api/posts/{post.id}/comments/"
+        for _ in range(2):
+            self.client.post(url, {"content": "hi"}, format="json", HTTP_IDEMPOTENCY_KEY="c")
+        self.assertEqual(Comment.objects.filter(post=post).count(), 1)
+
+    def test_errors_are_not_stored(self):
+        post = Post.objects.create(author=self.user, title="t", content="c")
+        url = f"/api/posts/{post.id}/refresh_ai/"
+        with unittest.mock.patch("blog.views.PostViewSet._run_ai_and_save", side_effect=RuntimeError):
+            self.assertEqual(self.client.post(url, HTTP_IDEMPOTENCY_KEY="r").status_code, 502)
+        res = self.client.post(url, HTTP_IDEMPOTENCY_KEY="r")  # 502는 저장 안 됨 → 다시 처리
+        self.assertEqual(res.status_code, 200)
+        self.assertNotIn("Idempotent-Replayed", res)
+
+    @override_settings(IDEMPOTENCY_WAIT_SECONDS=0.01)
+    def test_in_flight_duplicate_conflicts_after_wait(self):
+        store = idempotency.get_store()
+        fp = None
+        original = store.claim
+
+        def hold(key, fingerprint, timeout):
+            nonlocal fp
+            fp = fingerprint
+            original(key, fingerprint, timeout)  # 다른 요청이 잡고 있는 상태
+            return original(key, fingerprint, timeout)
+
+        with unittest.mock.patch.object(store, "claim", hold):
+            self.assertEqual(self.create("k1").status_code, 409)
+        self.assertEqual(Post.objects.count(), 0)
+
+    def test_local_store_waits_and_expires(self):
+        store = idempotency.LocalIdempotencyStore()
+        now = [0.0]
+        store.timer = lambda: now[0]
+        self.assertIsNone(store.claim("k", "fp", 60))
+        self.assertEqual(store.claim("k", "fp", 60), ("fp", None))
+        timer = threading.Timer(0.05, store.complete, ("k", "fp", {"status": 201}, 100))
+        timer.start()
+        self.assertEqual(store.wait("k", 5), ("fp", {"status": 201}))
+        timer.join()
+        now[0] = 99
+        self.assertEqual(store.claim("k", "fp", 60), ("fp", {"status": 201}))
+        now[0] = 101
+        self.assertIsNone(store.claim("k", "fp", 60))  # 만료 후 다시 잡힘
+        store.max_keys = 1
+        store.claim("other", "fp", 60)
+        self.assertEqual(list(store._entries), ["other"])
+
+
+class ThreadedCommentTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="c", password="pw")
+        self.post = Post.objects.create(author=self.user, title="t", content="c")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = f"/api/posts/{self.post.id}/comments/"
+
+    def reply(self, parent=None, content="x"):
+        res = self.client.post(self.url, {"content": content, "parent": parent}, format="json")
+        self.assertEqual(res.status_code, 201, res.data)
+        return res.data["id"]
+
+    def test_path_depth_and_reply_counts(self):
+        a = self.reply()
+        b = self.reply(a)
+        c = self.reply(b)
+        self.reply(a)
+        counts = dict(Comment.objects.values_list("id", "reply_count"))
+        self.assertEqual((counts[a], counts[b], counts[c]), (3, 1, 0))
+        self.assertEqual(Comment.objects.get(pk=c).depth, 2)
+        self.assertTrue(Comment.objects.get(pk=c).path.startswith(Comment.objects.get(pk=b).path))
+
+        Comment.objects.get(pk=b).delete()  # b, c가 함께 삭제
+        self.assertEqual(Comment.objects.get(pk=a).reply_count, 1)
+
+    def test_threads_page_by_top_level_with_one_range_query(self):
+        first = self.reply(content="first")
+        r1 = self.reply(first)
+        r2 = self.reply(r1)
+        second = self.reply(content="second")
+        r3 = self.reply(second)
+        third = self.reply(content="third")
+        with self.assertNumQueries(3):  # COUNT + 루트 페이지 + 하위 트리 범위 1번
+            res = APIClient().get(f"{self.url}threads/?page_size=2")
+        self.assertEqual(res.data["count"], 3)
+        self.assertEqual([t["id"] for t in res.data["results"]], [third, second])
+        self.assertEqual([r["id"] for r in res.data["results"][1]["replies"]], [r3])
+        res = APIClient().get(f"{self.url}threads/?page_size=2&page=2")
+        thread = res.data["results"][0]
+        self.assertEqual((thread["id"], thread["reply_count"]), (first, 2))
+        self.assertEqual([(r["id"], r["depth"]) for r in thread["replies"]], [(r1, 1), (r2, 2)])
+
+        res = APIClient().get(f"/api/comments/{r1}/thread/")
+        self.assertEqual([c["id"] for c in res.data], [r1, r2])
+
+    def test_reply_must_stay_on_same_post(self):
+        other = Post.objects.create(author=self.user, title="o", content="o")
+        foreign = Comment.objects.create(post=other, author=self.user, content="x")
+        res = self.client.post(self.url, {"content": "x", "parent": foreign.id}, format="json")
+        self.assertEqual(res.status_code, 400)
+        mine = self.reply()
+        res = self.client.patch(f"/api/comments/{mine}/", {"parent": foreign.id}, format="json")
+        self.assertEqual(res.status_code, 400)
+
+    def test_too_deep_replies_are_flattened(self):
+        parent = None
+        for _ in range(Comment.MAX_DEPTH + 3):
+            parent = Comment.objects.create(post=self.post, author=self.user, content="x", parent=parent)
+        deepest = Comment.objects.get(pk=parent.pk)
+        self.assertEqual(deepest.depth, Comment.MAX_DEPTH)
+        self.assertLessEqual(len(deepest.path), 255)
+
+
+class RevisionTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="r", password="pw")
+        self.body = "".join(f"line {i}\n" for i in range(200))
+        self.post = Post.objects.create(author=self.user, title="v1", content=self.body)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = f"/api/posts/{self.post.id}/"
+
+    def edit(self, **data):
+        res = self.client.patch(f"{self.url}?skip_ai=1", data, format="json")
+        self.assertEqual(res.status_code, 200)
+
+    def test_update_reads_before_under_row_lock(self):
+        from .views import PostViewSet
+        real_get_object = PostViewSet.get_object
+        other_body = self.body.replace("line 3\n", "other 3\n")
+
+        def get_object_then_concurrent_edit(view):
+            obj = real_get_object(view)
+            if view.action == "partial_update":  # 다른 요청의 수정이 이 요청의 잠금 전에 커밋됨
+                other = Post.objects.get(pk=obj.pk)
+                before = (other.title, other.content)
+                other.content = other_body
+                other.save()
+                history.record(other, before)
+            return obj
+
+        with unittest.mock.patch.object(PostViewSet, "get_object", get_object_then_concurrent_edit):
+            self.edit(title="v3")
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.title, self.post.content), ("v3", other_body))  # 다른 수정을 덮어쓰지 않음
+        self.assertEqual(list(PostRevision.objects.order_by("number").values_list("number", "base")),
+                         [(1, 1), (2, 1), (3, 1)])  # 같은 판 번호 없이, 같은 diff 기준으로 이어짐
+        self.assertEqual(history.reconstruct(self.post.id, [1, 2, 3]),
+                         {1: ("v1", self.body), 2: ("v1", other_body), 3: ("v3", other_body)})
+
+    def test_revisions_are_deltas_with_snapshots(self):
+        self.edit(title="v1")  # 변경 없음 → 이력 없음
+        self.assertFalse(PostRevision.objects.exists())
+        body = self.body
+        versions = [(self.post.title, self.post.content)]
+        with override_settings(REVISION_SNAPSHOT_EVERY=4):
+            for i in range(6):
+                body = body.replace(f"line {i * 7}\n", f"edited {i}\n")
+                self.edit(title=f"v{i + 2}", content=body)
+                versions.append(Post.objects.values_list("title", "content").get(pk=self.post.pk))
+        rows = list(PostRevision.objects.order_by("number").values_list("number", "base"))
+        self.assertEqual(rows, [(1, 1), (2, 1), (3, 1), (4, 1), (5, 5), (6, 5), (7, 5)])
+        self.assertLess(len(bytes(PostRevision.objects.get(number=3).data)), 100)
+
+        self.assertEqual(history.reconstruct(self.post.id, range(1, 8)), dict(enumerate(versions, 1)))
+        with self.assertNumQueries(1):
+            res = self.client.get(f"{self.url}revisions/6/")
+        self.assertEqual(res.data["content"], versions[5][1])
+
+        res = self.client.get(f"{self.url}revisions/")
+        self.assertEqual(res.data["count"], 7)
+        self.assertEqual([r["number"] for r in res.data["results"][:2]], [7, 6])
+        self.assertEqual(res.data["results"][0]["editor"], "r")
+
+        res = self.client.get(f"{self.url}revisions/diff/?from=2&to=7")
+        self.assertEqual(res.data["title"], ["v2", "v7"])
+        self.assertIn("-line 7\n+edited 1\n", res.data["diff"])
+        self.assertEqual(self.client.get(f"{self.url}revisions/99/").status_code, 404)
+
+    def test_out_of_band_edit_forces_snapshot(self):
+        self.edit(content=self.body + "first edit\n")
+        Post.objects.filter(pk=self.post.pk).update(content=self.body + "admin edit\n")  # 이력 없이 바뀜
+        self.edit(content=self.body + "second edit\n")
+        self.assertEqual(list(PostRevision.objects.order_by("number").values_list("number", "base")),
+                         [(1, 1), (2, 1), (3, 3)])
+        self.assertEqual(history.reconstruct(self.post.id, [3])[3][1], Post.objects.get(pk=self.post.pk).content)
+
+
+class SoftDeleteTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="d", password="pw")
+        self.fan = User.objects.create_user(username="fan", password="pw")
+        self.post = Post.objects.create(author=self.user, title="gone", content="c",
+                                        category=Category.objects.create(name="b", slug="b"))
+        self.post.tags.add(Tag.objects.create(name="t", slug="t"))
+        for i in range(5):
+            Like.objects.create(post=self.post, user=User.objects.create_user(username=f"l{i}", password="pw"))
+        top = Comment.objects.create(post=self.post, author=self.fan, content="top")
+        reply = Comment.objects.create(post=self.post, author=self.user, content="re", parent=top)
+        Comment.objects.create(post=self.post, author=self.fan, content="re2", parent=reply)
+        Notification.objects.create(user=self.user, message="m", post=self.post, comment=top)
+        PostScore.objects.create(post=self.post, score=1.0, likes=5, comments=3)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_delete_hides_immediately_and_purges_in_batches(self):
+        post_id = self.post.id
+        self.assertEqual(self.client.delete(f"/api/posts/{post_id}/").status_code, 204)
+        self.assertTrue(Like.objects.filter(post_id=post_id).exists())  # 아직 정리 전
+        # 정리 전이라도 어디에서도 보이지 않음
+        self.assertEqual(self.client.get(f"/api/posts/{post_id}/").status_code, 404)
+        self.assertEqual(self.client.get("/api/posts/").data["count"], 0)
+        self.assertEqual(self.client.get(f"/api/posts/{post_id}/likes/").status_code, 404)
+        self.assertEqual(self.client.get(f"/api/posts/{post_id}/comments/").data["count"], 0)
+        self.assertEqual(self.client.get("/api/comments/").data["count"], 0)
+        self.assertEqual(self.client.get("/api/notifications/").data["count"], 0)
+        self.client.force_authenticate(self.fan)
+        self.assertEqual(self.client.post(f"/api/posts/{post_id}/like/").status_code, 404)
+
+        counts = purge_post(post_id, size=2)
+        self.assertEqual((counts["blog_like"], counts["blog_comment"], counts["blog_post"]), (5, 3, 1))
+        self.assertFalse(Post.all_objects.filter(pk=post_id).exists())
+        self.assertFalse(Like.objects.exists() or Comment.objects.exists() or Notification.objects.exists())
+        self.assertFalse(PostScore.objects.exists() or Post.tags.through.objects.exists())
+
+    def test_purge_skips_visible_posts_and_command_sweeps(self):
+        from django.core.management import call_command
+        self.assertEqual(purge_post(self.post.id), {})
+        self.assertEqual(Like.objects.count(), 5)
+        Post.objects.filter(pk=self.post.pk).update(deleted_at=timezone.now())
+        call_command("purge_deleted_posts", "--batch-size", "2", stdout=open(os.devnull, "w"))
+        self.assertFalse(Post.all_objects.exists())
+
+
+class RenderedContentTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="writer", password="pw")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_markdown_subset_is_escaped(self):
+        html = render_html("# 제목\n\n**굵게** `<b>` [링크](https://x.dev) [나쁜](javascript:alert(1))\n"
+                           "<script>alert(1)</script>\n\n- 하나\n- 둘\n\n```py\nif a < b:\n```")
+        self.assertIn("<h1>제목</h1>", html)
+        self.assertIn("<strong>굵게</strong> <code>&lt;b&gt;</code>", html)
+        self.assertIn('<a href="https://x.dev" rel="nofollow noopener">링크</a> 나쁜', html)
+        self.assertIn("&lt;script&gt;", html)
+        self.assertNotIn("<script>", html)
+        self.assertIn("<ul><li>하나</li><li>둘</li></ul>", html)
+        self.assertIn('<pre><code class="language-py">if a &lt; b:</code></pre>', html)
+        self.assertEqual(plain_text("## 제목\n- **굵게** [링크](https://x.dev)"), "제목 굵게 링크")
+        self.assertEqual(reading_minutes("가" * 1000 + " word" * 200), 3)
+        self.assertEqual(reading_minutes(""), 0)
+
+    def test_rendered_once_per_content(self):
+        res = self.client.post("/api/posts/?skip_ai=1", {"title": "t", "content": "# 안녕\n본문"}, format="json")
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual(res.data["content_html"], "<h1>안녕</h1>\n<p>본문</p>")
+        self.assertEqual(res.data["reading_time"], 1)
+        post = Post.objects.get(pk=res.data["id"])
+        other = Post.objects.create(author=self.user, title="같은 본문", content="# 안녕\n본문")
+        self.assertEqual(other.rendered_id, post.rendered_id)  # 본문 해시가 같으면 공유
+        self.assertEqual(RenderedContent.objects.count(), 1)
+
+        with self.assertNumQueries(1):  # AI 결과만 저장 → 렌더링/조회 없음
+            post.summary = "요약"
+            post.save(update_fields=["summary"])
+        self.client.patch(f"/api/posts/{post.id}/?skip_ai=1", {"content": "바뀐 본문"}, format="json")
+        post.refresh_from_db()
+        self.assertEqual(post.rendered.html, "<p>바뀐 본문</p>")
+
+    def test_list_excerpt_and_lazy_render(self):
+        Post.objects.create(author=self.user, title="렌더됨", content="**강조** 문장")
+        raw, = Post.objects.bulk_create([Post(author=self.user, title="bulk", slug="bulk", content="**원문** 그대로")])
+        items = {p["title"]: p for p in APIClient().get("/api/posts/").data["results"]}
+        self.assertEqual(items["렌더됨"]["excerpt"], "강조 문장")
+        self.assertEqual(items["렌더됨"]["reading_time"], 1)
+        self.assertEqual(items["bulk"]["excerpt"], "**원문** 그대로")  # 렌더링 전 → 본문 앞부분
+        self.assertIsNone(items["bulk"]["reading_time"])
+
+        res = APIClient().get(f"/api/posts/{raw.id}/")
+        self.assertEqual(res.data["content_html"], "<p><strong>원문</strong> 그대로</p>")
+        raw.refresh_from_db()
+        self.assertIsNotNone(raw.rendered_id)  # 첫 조회 때 저장
+
+    def test_render_posts_command(self):
+        from io import StringIO
+        from django.core.management import call_command
+        raw, = Post.objects.bulk_create([Post(author=self.user, title="bulk", slug="bulk", content="본문")])
+        RenderedContent.objects.create(key="0" * 32, html="", reading_minutes=0)
+        RenderedContent.objects.filter(key="0" * 32).update(created_at=timezone.now() - datetime.timedelta(days=1))
+        out = StringIO()
+        call_command("render_posts", stdout=out)
+        self.assertIn("rendered 1 posts, pruned 1", out.getvalue())
+        raw.refresh_from_db()
+        self.assertEqual(raw.rendered.excerpt, "본문")
+
+
+class TagAutocompleteTests(TestCase):
+    def setUp(self):
+        reset_tag_index()
+        self.addCleanup(reset_tag_index)
+        self.user = User.objects.create_user(username="ac", password="pw")
+        self.python = Tag.objects.create(name="파이썬", slug="python")
+        self.pandas = Tag.objects.create(name="판다스", slug="pandas")
+        self.django = Tag.objects.create(name="장고", slug="django")
+        post = Post.objects.create(author=self.user, title="p", content="p")
+        post.tags.add(self.pandas)
+
+    def search(self, q):
+        res = APIClient().get("/api/tags/autocomplete/", {"q": q})
+        self.assertEqual(res.status_code, 200)
+        return [t["slug"] for t in res.data]
+
+    def test_jamo_and_choseong(self):
+        self.assertEqual(to_jamo("과"), "ㄱㅗㅏ")
+        self.assertEqual(to_choseong("파이썬"), "ㅍㅇㅆ")
+        self.assertEqual(self.search("팡"), ["python"])       # 입력 중인 "파이" → "팡"
+        self.assertEqual(self.search("ㅍㅇ"), ["python"])
+        self.assertEqual(self.search("DJ"), ["django"])
+        self.assertEqual(self.search(""), [])
+
+    def test_ranked_by_post_count_and_incremental(self):
+        self.assertEqual(self.search("p"), ["pandas", "python"])
+        self.assertEqual(self.search("파"), ["pandas", "python"])  # "판"도 "파" 다음 입력 단계
+        self.assertEqual(self.search("파이"), ["python"])
+        with self.captureOnCommitCallbacks(execute=True):
+            post = Post.objects.create(author=self.user, title="q", content="q")
+            post.tags.add(self.python)
+            Post.objects.create(author=self.user, title="r", content="r").tags.add(self.python)
+            Tag.objects.create(name="파스칼", slug="pascal")
+        self.assertEqual(self.search("p"), ["python", "pandas", "pascal"])
+        self.assertEqual(self.search("ㅍ"), ["python", "pandas", "pascal"])
+        with self.captureOnCommitCallbacks(execute=True):
+            post.tags.clear()
+            post.delete()
+            self.pandas.delete()
+        res = APIClient().get("/api/tags/autocomplete/", {"q": "p"})
+        self.assertEqual([(t["slug"], t["post_count"]) for t in res.data], [("python", 1), ("pascal", 0)])
+
+
+class FacetTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.user = User.objects.create_user(username="f", password="pw")
+        backend = Category.objects.create(name="백엔드", slug="backend")
+        front = Category.objects.create(name="프론트", slug="frontend")
+        jwt = Tag.objects.create(name="jwt", slug="jwt")
+        drf = Tag.objects.create(name="drf", slug="drf")
+        for title, cat, tags in (("jwt 인증", backend, [jwt, drf]), ("drf 뷰셋", backend, [drf]), ("리액트", front, [])):
+            Post.objects.create(author=self.user, title=title, content=title, category=cat).tags.set(tags)
+
+    def test_counts_in_one_query_and_cached(self):
+        client = APIClient()
+        with self.assertNumQueries(1):
+            res = client.get("/api/posts/facets/")
+        self.assertEqual(res.data["categories"], [
+            {"slug": "backend", "name": "백엔드", "count": 2}, {"slug": "frontend", "name": "프론트", "count": 1}])
+        self.assertEqual([(t["slug"], t["count"]) for t in res.data["tags"]], [("drf", 2), ("jwt", 1)])
+        with self.assertNumQueries(0):
+            client.get("/api/posts/facets/")
+
+    def test_each_facet_ignores_its_own_filter(self):
+        res = APIClient().get("/api/posts/facets/", {"category": "frontend", "tags": "jwt"})
+        self.assertEqual([(c["slug"], c["count"]) for c in res.data["categories"]], [("backend", 1)])
+        self.assertEqual(res.data["tags"], [])
+        res = APIClient().get("/api/posts/facets/", {"search": "drf"})
+        self.assertEqual([(t["slug"], t["count"]) for t in res.data["tags"]], [("drf", 1)])
+
+    def test_writes_bump_generation(self):
+        client = APIClient()
+        client.get("/api/posts/facets/")
+        with self.captureOnCommitCallbacks(execute=True):
+            Post.objects.create(author=self.user, title="새 글", content="x",
+                                category=Category.objects.get(slug="frontend"))
+        res = client.get("/api/posts/facets/")
+        self.assertEqual([(c["slug"], c["count"]) for c in res.data["categories"]], [("backend", 2), ("frontend", 2)])
+
+
+class SyndicationTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.user = User.objects.create_user(username="s", password="pw")
+        backend = Category.objects.create(name="백엔드", slug="backend")
+        drf = Tag.objects.create(name="drf", slug="drf")
+        self.posts = []
+        for i in range(3):
+            post = Post.objects.create(author=self.user, title=f"글 {i}", content=f"본문 {i}",
+                                       summary=f"요약 {i}", category=backend if i else None)
+            if i == 2:
+                post.tags.set([drf])
+            self.posts.append(post)
+        self.client = APIClient()
+
+    def test_feeds_and_scopes(self):
+        res = self.client.get("/feeds/rss.xml")
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res["Content-Type"].startswith("application/rss+xml"))
+        body = res.content.decode()
+        self.assertIn("<title>글 2</title>", body)
+        self.assertIn("요약 0", body)
+        self.assertIn(f"http://testserver/api/posts/{self.posts[0].id}/", body)
+
+        atom = self.client.get("/feeds/category/backend/atom.xml").content.decode()
+        self.assertIn("<feed", atom)
+        self.assertIn("글 1", atom)
+        self.assertNotIn("글 0", atom)
+        tag = self.client.get("/feeds/tag/drf/rss.xml").content.decode()
+        self.assertIn("글 2", tag)
+        self.assertNotIn("글 1", tag)
+        self.assertEqual(self.client.get("/feeds/tag/none/rss.xml").status_code, 404)
+        self.assertEqual(self.client.get("/feeds/user/s/rss.xml").status_code, 404)
+
+    def test_conditional_get_and_invalidation(self):
+        first = self.client.get("/feeds/atom.xml")
+        with self.assertNumQueries(0):
+            again = self.client.get("/feeds/atom.xml", HTTP_IF_NONE_MATCH=first["ETag"])
+            since = self.client.get("/feeds/atom.xml", HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(since.status_code, 304)
+        self.assertEqual(again["ETag"], first["ETag"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.posts[0].summary = "새 요약"
+            self.posts[0].save(update_fields=["summary"])
+        res = self.client.get("/feeds/atom.xml", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(res.status_code, 200)
+        self.assertIn("새 요약", res.content.decode())
+
+    def test_ai_upgrade_refreshes_feeds(self):
+        post = self.posts[0]
+        self.assertIn("요약 0", self.client.get("/feeds/rss.xml").content.decode())  # 캐시됨
+        gemini = unittest.mock.create_autospec(GeminiAI, instance=True)
+        gemini.analyze.return_value = ("업그레이드된 요약", ["drf"])
+        with unittest.mock.patch("blog.ai.get_ai", return_value=gemini), \
+                self.captureOnCommitCallbacks(execute=True) as callbacks:
+            ai_module.upgrade_post_ai(post.id)
+        self.assertTrue(callbacks)
+        body = self.client.get("/feeds/rss.xml").content.decode()
+        self.assertIn("업그레이드된 요약", body)
+        self.assertNotIn("요약 0", body)
+
+    @override_settings(SITEMAP_SHARD_SIZE=2)
+    def test_sharded_sitemap_rebuilds_changed_shard_only(self):
+        first_id = self.posts[0].id
+        index = self.client.get("/sitemap.xml").content.decode()
+        shards = sorted({(p.id - 1) // 2 for p in self.posts})
+        for shard in shards:
+            self.assertIn(f"http://testserver/sitemap-{shard}.xml", index)
+        shard = self.client.get(f"/sitemap-{shards[0]}.xml")
+        self.assertIn(f"/api/posts/{first_id}/", shard.content.decode())
+        self.assertEqual(self.client.get("/sitemap-9999.xml").status_code, 404)
+
+        other = next(p for p in self.posts if (p.id - 1) // 2 != shards[0])
+        with self.captureOnCommitCallbacks(execute=True):
+            other.title = "수정"
+            other.save()
+        with self.assertNumQueries(0):  # 바뀐 글이 없는 조각은 캐시 그대로
+            self.assertEqual(self.client.get(f"/sitemap-{shards[0]}.xml").content, shard.content)
+        with self.assertNumQueries(1):
+            self.client.get("/sitemap.xml")
+
+
+class FeedTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.reader = User.objects.create_user(username="reader", password="pw")
+        self.small = User.objects.create_user(username="small", password="pw")
+        self.star = User.objects.create_user(username="star", password="pw")
+        self.client = APIClient()
+        self.client.force_authenticate(self.reader)
+
+    def follow(self, username):
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.post(f"/api/users/{username}/follow/")
+        self.assertEqual(res.status_code, 201)
+
+    def post(self, author, title):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Post.objects.create(author=author, title=title, content=title)
+
+    @override_settings(FEED_FANOUT_LIMIT=1, FEED_TIMELINE_MAX=3)
+    def test_push_pull_merge_and_keyset_pages(self):
+        old = self.post(self.small, "before follow")
+        self.follow("small")
+        self.follow("star")
+        Follow.objects.create(follower=self.small, followee=self.star)  # star: 팔로워 2명 → pull
+        posts = [self.post(self.small if i % 2 else self.star, f"p{i}") for i in range(4)]
+
+        pushed = set(TimelineEntry.objects.filter(user=self.reader).values_list("post_id", flat=True))
+        self.assertEqual(pushed, {old.id, posts[1].id, posts[3].id})  # small 글만 (backfill 포함)
+
+        res = self.client.get("/api/feed/", {"page_size": 3})
+        self.assertEqual([p["id"] for p in res.data["results"]], [p.id for p in posts[::-1][:3]])
+        res = self.client.get(res.data["next"])
+        self.assertEqual([p["id"] for p in res.data["results"]], [posts[0].id, old.id])
+        self.assertIsNone(res.data["next"])
+
+    @override_settings(FEED_TIMELINE_MAX=2)
+    def test_timeline_trimmed_and_unfollow_cleans_up(self):
+        self.follow("small")
+        for i in range(4):
+            self.post(self.small, f"p{i}")
+        self.assertEqual(TimelineEntry.objects.filter(user=self.reader).count(), 2)
+        self.assertEqual(self.client.delete("/api/users/small/follow/").status_code, 204)
+        self.assertFalse(TimelineEntry.objects.filter(user=self.reader).exists())
+        self.assertEqual(self.client.get("/api/feed/").data, {"next": None, "results": []})
@@ -0,0 +1,216 @@
+import logging
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+from .models import Post
+
+logger = logging.getLogger(__name__)
+
+# -------------------------
+# 버킷 저장소 (consume은 원자적이어야 함)
+# -------------------------
+def _refill(state, capacity, rate, now):
+    """state=(tokens, ts, ...) → 현재 시각까지 채운 토큰 수"""
+    if state is None:
+        return float(capacity)
+    tokens, ts = state[0], state[1]
+    return min(float(capacity), tokens + max(0.0, now - ts) * rate)
+
+
+class LocalBucketStore:
+    """
+    프로세스 내 dict + Lock. 워커가 하나거나 개발 환경일 때.
+    오래 안 쓰인(이미 가득 찼을) 버킷은 주기적으로 정리해 메모리를 묶어 둔다.
+    """
+    max_keys = 50_000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = {}
+
+    def consume(self, key, capacity, rate, cost, now):
+        with self._lock:
+            tokens = _refill(self._buckets.get(key), capacity, rate, now)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets[key] = (tokens, now, capacity / rate)
+            if len(self._buckets) > self.max_keys:
+                self._prune(now)
+            return allowed, tokens
+
+    def _prune(self, now):
+        self._buckets = {k: v for k, v in self._buckets.items() if now - v[1] < v[2]}
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class CacheBucketStore:
+    """
+    Django 캐시(redis/memcached 등 공유 캐시) 기반. 여러 워커가 같은 버킷을 본다.
+    cache.add()를 짧은 뮤텍스로 써서 읽기-수정-쓰기를 원자적으로 만든다.
+    락을 lock_wait 안에 못 잡으면(같은 키로 몰린 요청) 거부한다(fail-closed) — 동시 요청이 제한을 넘지 못하게.
+    캐시 백엔드 자체가 실패할 때(연결 끊김 등)만 요청을 막지 않고 통과시킨다(fail-open).
+    """
+    lock_timeout = 2
+    lock_wait = 0.05
+
+    def __init__(self, alias=None):
+        self.cache = caches[alias or getattr(settings, "THROTTLE_CACHE_ALIAS", "default")]
+
+    def consume(self, key, capacity, rate, cost, now):
+        try:
+            return self._consume(key, capacity, rate, cost, now)
+        except Exception as e:  # 캐시 장애
+            logger.warning("throttle cache unavailable, allowing request: %s", e)
+            return True, float(capacity)
+
+    def _consume(self, key, capacity, rate, cost, now):
+        lock_key = f"{key}:lock"
+        deadline = time.monotonic() + self.lock_wait
+        while not self.cache.add(lock_key, 1, self.lock_timeout):
+            if time.monotonic() > deadline:
+                # 경합: 거부하고 1초 뒤(또는 토큰이 찰 때) 다시 시도하게
+                tokens = _refill(self.cache.get(key), capacity, rate, now)
+                return False, max(0.0, min(tokens, cost - rate))
+            time.sleep(0.002)
+        try:
+            tokens = _refill(self.cache.get(key), capacity, rate, now)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            # 가득 찰 때까지의 시간이 지나면 키가 없어도 "가득 참"과 같다
+            self.cache.set(key, (tokens, now), math.ceil((capacity - tokens) / rate) + 1)
+            return allowed, tokens
+        finally:
+            self.cache.delete(lock_key)
+
+    def clear(self):
+        pass
+
+
+_store = None
+
+
+def get_store():
+    global _store
+    if _store is None:
+        path = getattr(settings, "THROTTLE_STORE", "blog.throttling.LocalBucketStore")
+        _store = import_string(path)()
+    return _store
+
+
+# -------------------------
+# Throttle 클래스
+# -------------------------
+class TokenBucketThrottle(BaseThrottle):
+    """
+    토큰 버킷: 용량 = num, 초당 num/period 만큼 다시 채움 (DEFAULT_THROTTLE_RATES의 "num/period" 형식).
+    로그인 사용자는 user id, 익명은 IP 기준. scope마다 버킷이 따로 있다.
+    결정 결과는 request.ratelimit에 남겨 RateLimitHeadersMixin이 응답 헤더로 내보낸다.
+    """
+    scope = None
+    timer = time.time
+
+    def get_rate(self):
+        rates = api_settings.DEFAULT_THROTTLE_RATES or {}
+        return rates.get(self.scope)
+
+    @staticmethod
+    def parse_rate(rate):
+        num, period = rate.split("/")
+        seconds = {"s": 1, "m": 60, "h": 3600, "d": 86400}[period[0]]
+        return int(num), seconds
+
+    def get_cost(self, request, view):
+        return 1
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = f"u{request.user.pk}"
+        else:
+            ident = f"ip{self.get_ident(request)}"
+        return f"throttle:{self.scope}:{ident}"
+
+    def allow_request(self, request, view):
+        rate = self.get_rate()
+        if not rate:
+            return True
+        capacity, period = self.parse_rate(rate)
+        refill = capacity / period
+        cost = min(max(1, self.get_cost(request, view)), capacity)  # 용량보다 큰 비용은 영원히 거부되므로 상한
+        allowed, tokens = get_store().consume(
+            self.get_cache_key(request, view), capacity, refill, cost, self.timer())
+
+        self._wait = 0 if allowed else (cost - tokens) / refill
+        decision = {
+            "scope": self.scope,
+            "limit": capacity,
+            "window": period,
+            "remaining": int(tokens),
+            "reset": math.ceil((capacity - tokens) / refill),
+        }
+        prev = getattr(request, "ratelimit", None)
+        if prev is None or decision["remaining"] < prev["remaining"]:
+            request.ratelimit = decision  # 가장 빡빡한 scope 기준으로 노출
+        return allowed
+
+    def wait(self):
+        return getattr(self, "_wait", None)
+
+
+class RegisterThrottle(TokenBucketThrottle):
+    scope = "register"
+
+
+class LikeThrottle(TokenBucketThrottle):
+    scope = "like"
+
+
+class CommentThrottle(TokenBucketThrottle):
+    scope = "comment"
+
+
+class AIThrottle(TokenBucketThrottle):
+    """
+    AI를 호출하게 되는 요청(글 생성/본문 수정/refresh_ai)용.
+    비용 = 입력 글자 수 / AI_THROTTLE_UNIT_CHARS (올림) — 긴 글일수록 토큰을 더 쓴다.
+    """
+    scope = "ai"
+
+    def get_cost(self, request, view):
+        unit = getattr(settings, "AI_THROTTLE_UNIT_CHARS", 1000)
+        if request.method == "POST" and getattr(view, "action", None) == "refresh_ai":
+            try:
+                pk = int(view.kwargs.get(view.lookup_url_kwarg or view.lookup_field))
+            except (TypeError, ValueError):
+                return 1  # 숫자가 아닌 id는 get_object()가 404로 처리
+            row = Post.objects.filter(pk=pk).values_list("title", "content").first()
+            text = (row[1] or row[0]) if row else ""
+        else:
+            data = request.data if hasattr(request.data, "get") else {}
+            text = str(data.get("content") or data.get("title") or "")
+        return max(1, math.ceil(len(text.strip()) / unit))
+
+
+class RateLimitHeadersMixin:
+    """throttle 결정을 RateLimit-* 헤더로 노출 (429 응답 포함)"""
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        decision = getattr(request, "ratelimit", None)
+        if decision:
+            response["RateLimit-Limit"] = str(decision["limit"])
+            response["RateLimit-Remaining"] = str(decision["remaining"])
+            response["RateLimit-Reset"] = str(decision["reset"])
+            response["RateLimit-Policy"] = f'{decision["limit"]};w={decision["window"]}'
+        return response
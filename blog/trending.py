@@ -0,0 +1,257 @@
+"""
+트렌딩(시간 감쇠) 점수 — GET /api/posts/trending/ 용.
+
+이벤트 하나의 현재 기여도 = 가중치 × 2^(-(지금 - 이벤트 시각) / 반감기).
+공통 기준 시각 epoch을 두고 가중치 × 2^((이벤트 시각 - epoch) / 반감기)를 PostScore.score에 더해 두면
+모든 글에 같은 배율 2^(-(지금 - epoch) / 반감기)가 곱해지는 셈이라 순서가 그대로 유지된다.
+→ 목록은 score 인덱스 순으로 읽기만 한다 (Like/Comment 집계 없음).
+값은 시간이 갈수록 커지므로 decay_scores가 주기적으로 epoch을 현재로 옮기며 전체를 줄이고 식은 글은 0으로 내린다.
+
+좋아요/댓글 증분(점수, likes/comments 카운터)은 커밋 후 프로세스 메모리(CounterBuffer)에 모았다가
+TRENDING_FLUSH_EVENTS건 또는 TRENDING_FLUSH_SECONDS초마다 글 단위로 합쳐 UPDATE 한 번으로 반영한다.
+시간 기준 반영은 백그라운드 스레드가 하므로 이벤트가 끊겨도 최대 그만큼만 늦고, 반영에 실패한 증분은 버퍼로 되돌린다.
+프로세스가 강제 종료되면 그 사이 증분은 잃으므로 decay_scores가 카운터를 원본 행 수로 맞춘다(reconcile).
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Case, Count, F, FloatField, IntegerField, Value, When
+
+from .models import Comment, Like, Post, PostScore, TrendingEpoch
+
+logger = logging.getLogger(__name__)
+
+LIKE_WEIGHT = 1.0
+COMMENT_WEIGHT = 2.0
+FLUSH_CHUNK = 500   # UPDATE 한 문장의 CASE 분기 수 상한
+
+
+def half_life():
+    return getattr(settings, "TRENDING_HALF_LIFE_HOURS", 24) * 3600
+
+
+def get_epoch():
+    row = TrendingEpoch.objects.filter(pk=1).values_list("ts", flat=True).first()
+    if row is None:
+        row = TrendingEpoch.objects.get_or_create(pk=1, defaults={"ts": time.time()})[0].ts
+    return row
+
+
+def _case(values, output_field):
+    return Case(*[When(pk=pk, then=Value(v)) for pk, v in values.items()],
+                default=Value(0), output_field=output_field)
+
+
+def flush_seconds():
+    return getattr(settings, "TRENDING_FLUSH_SECONDS", 2)
+
+
+def apply_deltas(pending, ref):
+    """
+    pending: {post_id: [ref 기준 점수 합, likes 증분, comments 증분, 양수 이벤트 여부]}
+    점수 행이 있는 글은 CASE 하나로 한꺼번에 더하고, 없는 글(처음 활동)은 현재 행 수로 카운터를 만든다.
+    반영한 글은 pending에서 뺀다 → 도중에 실패하면 pending에는 아직 반영 안 된 글만 남는다.
+    """
+    scale = 2 ** ((ref - get_epoch()) / half_life())
+    ids = list(pending)
+    for i in range(0, len(ids), FLUSH_CHUNK):
+        chunk = ids[i:i + FLUSH_CHUNK]
+        with transaction.atomic():
+            existing = set(PostScore.objects.filter(pk__in=chunk).values_list("pk", flat=True))
+            if existing:
+                PostScore.objects.filter(pk__in=existing).update(
+                    score=F("score") + _case({p: pending[p][0] * scale for p in existing}, FloatField()),
+                    likes=F("likes") + _case({p: pending[p][1] for p in existing}, IntegerField()),
+                    comments=F("comments") + _case({p: pending[p][2] for p in existing}, IntegerField()),
+                )
+            # 행이 없으면 양수 이벤트가 있었던, 아직 남아 있는 글만 생성
+            missing = Post.objects.filter(pk__in=[p for p in chunk if p not in existing and pending[p][3]])
+            missing = list(missing.values_list("pk", flat=True))
+            if missing:
+                likes = dict(Like.objects.filter(post_id__in=missing).values_list("post_id")
+                             .annotate(n=Count("id")).values_list("post_id", "n"))
+                comments = dict(Comment.objects.filter(post_id__in=missing).values_list("post_id")
+                                .annotate(n=Count("id")).values_list("post_id", "n"))
+                for p in missing:
+                    try:
+                        with transaction.atomic():
+                            PostScore.objects.create(post_id=p, score=max(0.0, pending[p][0] * scale),
+                                                     likes=likes.get(p, 0), comments=comments.get(p, 0))
+                    except IntegrityError:
+                        # 다른 프로세스가 먼저 만듦 → 점수만 더한다. 그쪽 카운터는 COUNT(*)로 만들어져
+                        # 이미 커밋된 이 버퍼의 좋아요/댓글을 포함하므로 더하면 이중 집계 (나머지는 reconcile)
+                        PostScore.objects.filter(pk=p).update(score=F("score") + pending[p][0] * scale)
+        for p in chunk:
+            del pending[p]
+
+
+def reconcile(chunk=5000):
+    """
+    likes/comments 카운터를 Like/Comment 행 수로 맞춘다 (잃어버린 증분/경합 보정, decay_scores에서).
+    다른 워커 버퍼에 남은 증분만큼은 다음 reconcile까지 어긋날 수 있다. → 고친 행 수
+    """
+    fixed, last = 0, 0
+    while True:
+        rows = list(PostScore.objects.filter(pk__gt=last).order_by("pk")
+                    .values_list("pk", "likes", "comments")[:chunk])
+        if not rows:
+            return fixed
+        ids = [r[0] for r in rows]
+        last = ids[-1]
+        likes = dict(Like.objects.filter(post_id__in=ids).values_list("post_id")
+                     .annotate(n=Count("id")).values_list("post_id", "n"))
+        comments = dict(Comment.objects.filter(post_id__in=ids).values_list("post_id")
+                        .annotate(n=Count("id")).values_list("post_id", "n"))
+        wrong = [PostScore(pk=pk, likes=likes.get(pk, 0), comments=comments.get(pk, 0))
+                 for pk, l, c in rows if (l, c) != (likes.get(pk, 0), comments.get(pk, 0))]
+        if wrong:
+            PostScore.objects.bulk_update(wrong, ["likes", "comments"])
+            fixed += len(wrong)
+
+
+class CounterBuffer:
+    """
+    좋아요/댓글 증분을 글 단위로 합쳐 두는 프로세스 내 버퍼.
+    점수는 버퍼를 만든 시각(ref) 기준으로 모아 두고 flush 때 epoch 기준으로 한 번에 환산한다.
+    첫 add() 때 시간 기준 반영 스레드를 띄운다 (fork된 워커에서는 다시).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flusher_pid = None
+        self._reset()
+
+    def _reset(self):
+        self._pending = {}
+        self._events = 0
+        self._ref = time.time()
+        self._since = time.monotonic()
+
+    def add(self, post_id, weight, ts, likes=0, comments=0):
+        with self._lock:
+            if self._flusher_pid != os.getpid():
+                self._start_flusher()
+            if not self._pending:  # 시간 기준은 첫 미반영 이벤트부터
+                self._ref, self._since = time.time(), time.monotonic()
+            row = self._pending.setdefault(post_id, [0.0, 0, 0, False])
+            row[0] += weight * 2 ** ((ts - self._ref) / half_life())
+            row[1] += likes
+            row[2] += comments
+            row[3] = row[3] or weight > 0
+            self._events += 1
+            due = (self._events >= getattr(settings, "TRENDING_FLUSH_EVENTS", 100)
+                   or time.monotonic() - self._since >= flush_seconds())
+        if due:
+            self.flush()
+
+    def _start_flusher(self):
+        self._flusher_pid = os.getpid()
+        threading.Thread(target=self._run_flusher, name="trending-flush", daemon=True).start()
+
+    def _run_flusher(self):
+        pid = os.getpid()
+        while self._flusher_pid == pid:
+            time.sleep(flush_seconds())
+            with self._lock:
+                due = bool(self._pending) and time.monotonic() - self._since >= flush_seconds()
+            if not due:
+                continue
+            try:
+                self.flush()
+            except Exception as e:  # 증분은 버퍼로 돌아가 다음 주기에 다시 시도
+                logger.warning("trending flush failed, will retry: %s", e)
+            finally:
+                connection.close()  # 이 스레드의 DB 연결 정리
+
+    def pending(self, post_id):
+        """아직 반영 안 된 (likes, comments) 증분"""
+        with self._lock:
+            row = self._pending.get(post_id)
+        return (row[1], row[2]) if row else (0, 0)
+
+    def _restore(self, pending, ref):
+        """반영하지 못한 증분을 버퍼에 되돌림 (점수는 현재 ref 기준으로 환산)"""
+        with self._lock:
+            if not self._pending:
+                self._ref = ref
+            scale = 2 ** ((ref - self._ref) / half_life())
+            for post_id, (score, likes, comments, positive) in pending.items():
+                row = self._pending.setdefault(post_id, [0.0, 0, 0, False])
+                row[0] += score * scale
+                row[1] += likes
+                row[2] += comments
+                row[3] = row[3] or positive
+            self._events += len(pending)
+
+    def flush(self):
+        with self._flush_lock:  # 반영 순서 보장 (앞 배치가 끝난 뒤 다음 배치)
+            with self._lock:
+                pending, ref = self._pending, self._ref
+                self._reset()
+            count = len(pending)
+            if pending:
+                try:
+                    apply_deltas(pending, ref)
+                except Exception:
+                    self._restore(pending, ref)
+                    raise
+            return count
+
+
+buffer = CounterBuffer()
+
+
+@atexit.register
+def _flush_on_exit():
+    try:
+        buffer.flush()
+    except Exception:
+        logger.exception("trending buffer flush failed at exit")
+
+
+def record(post_id, weight, when, likes=0, comments=0):
+    """
+    이벤트 1건을 커밋 후 버퍼에 넣는다. weight가 음수면(취소/삭제) 원래 더했던 값을 같은 시각 기준으로 뺀다.
+    decay_scores와 겹치면 그 배치만 배율이 어긋난다 (최대 한 주기분의 감쇠).
+    """
+    ts = when.timestamp()
+    transaction.on_commit(lambda: buffer.add(post_id, weight, ts, likes, comments))
+
+
+def flush():
+    return buffer.flush()
+
+
+def like_count(post_id):
+    """
+    카운터 기반 좋아요 수 — 모든 워커가 같은 값을 보도록 반영된 카운터만 (최대 TRENDING_FLUSH_SECONDS 늦음).
+    글이 없거나 삭제(숨김)됐으면 None
+    """
+    rows = list(Post.objects.filter(pk=post_id).values_list("trending__likes", flat=True))
+    if not rows:
+        return None
+    if rows[0] is None:  # 활동 기록이 아직 없는 글
+        return Like.objects.filter(post_id=post_id).count()
+    return rows[0]
+
+
+def decay(min_score=0.05, now=None):
+    """
+    epoch을 now로 옮기고 모든 점수에 같은 배율을 곱한다. 현재 점수가 min_score 미만인 글은 0으로 내려 목록에서 뺀다
+    (행은 좋아요/댓글 카운터 때문에 남겨 둠). → (목록에 남은 글 수, 이번에 빠진 글 수)
+    """
+    flush()
+    now = time.time() if now is None else now
+    with transaction.atomic():
+        epoch = get_epoch()
+        factor = 2 ** ((epoch - now) / half_life())
+        PostScore.objects.exclude(score=0).update(score=F("score") * factor)
+        cooled = PostScore.objects.filter(score__lt=min_score).exclude(score=0).update(score=0)
+        TrendingEpoch.objects.filter(pk=1).update(ts=now)
+    return PostScore.objects.filter(score__gt=0).count(), cooled
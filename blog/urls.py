@@ -1,6 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import PostViewSet, RegisterView, CommentViewSet, PostCommentViewSet, NotificationViewSet, TagViewSet
+from .views import (PostViewSet, RegisterView, CommentViewSet, PostCommentViewSet, NotificationViewSet, TagViewSet,
+                    FollowView, FeedView)
 
 router = DefaultRouter()
 router.register(r"posts", PostViewSet)  # /api/posts/ 로 CRUD 제공
@@ -11,10 +12,15 @@ router.register(r"tags", TagViewSet)
 urlpatterns = [
     path("", include(router.urls)),
     path('auth/register/', RegisterView.as_view(), name='register'),
+    path("feed/", FeedView.as_view(), name="feed"),
+    path("users/<str:username>/follow/", FollowView.as_view(), name="user-follow"),
     # 하위 리소스: /api/posts/{post_pk}/comments/
     path("posts/<int:post_pk>/comments/", 
          PostCommentViewSet.as_view({"get": "list", "post": "create"}), 
          name="post-comments"),
+    path("posts/<int:post_pk>/comments/threads/",
+         PostCommentViewSet.as_view({"get": "threads"}),
+         name="post-comment-threads"),
     #  슬러그로 상세 보기
     # path("posts/slug/<slug:slug>/",
     #      PostViewSet.as_view({"get":"retrieve"}), name="post-detail-by-slug"),
@@ -3,30 +3,63 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db import transaction
-from django.db.models import Count
+from django.db.models import Count, F, Q
 from rest_framework.decorators import action
-from .models import Post, Comment, Like, Notification, Tag
-from .serializers import PostSerializer, CommentSerializer, NotificationSerializer, TagSerializer
+from rest_framework.exceptions import ValidationError
+from rest_framework.utils.urls import replace_query_param
+from .models import Post, Comment, Like, Notification, Tag, Follow, PostRevision
+from .serializers import PostSerializer, PostListSerializer, CommentSerializer, NotificationSerializer, TagSerializer
+from .mixins import SparseFieldsetMixin, FastReadMixin, StreamingListMixin
 from .permissions import IsOwnerOrReadOnly, IsReceiverOnly, IsAdminOrOwnerOrReadOnly
-from .ai import get_ai
+from .related import get_related_index, refresh_post
+from .autocomplete import get_tag_index
+from .facets import cached_facets, count_facets
+from .feed import feed_page
+from .likes import add_like, remove_like
+from .pagination import CounterPagination
+from .purge import soft_delete
+from .rendering import list_annotations
+from . import revisions as history, staticfiles, syndication, trending
+from .ai import get_ai, GeminiAI, LocalAI, TokenUsage, record_usage, schedule_ai_upgrade
+from .idempotency import IdempotencyMixin
+from .throttling import RateLimitHeadersMixin, RegisterThrottle, LikeThrottle, CommentThrottle, AIThrottle
+import hashlib
 import logging
 logger = logging.getLogger(__name__)
 
-class TagViewSet(viewsets.ReadOnlyModelViewSet):
+class TagViewSet(SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """
     /api/tags/           → 전체/페이지네이션 목록
     /api/tags/?search=x  → name/slug 부분검색
     /api/tags/{id}/      → 단건 조회
+    /api/tags/autocomplete/?q=x → 입력 중 자동완성
     """
     queryset = Tag.objects.all().order_by("name")
     serializer_class = TagSerializer
     filter_backends = [filters.SearchFilter]
     search_fields = ["name", "slug"]
 
-class NotificationViewSet(viewsets.ModelViewSet):
+    @action(detail=False, methods=["get"])
+    def autocomplete(self, request):
+        """
+        GET /api/tags/autocomplete/?q=파이&limit=8
+        -> slug/이름 접두어(자모·초성 포함) 일치, 글 많은 순. 메모리 인덱스에서 바로 응답(쿼리 없음)
+        """
+        try:
+            limit = min(max(int(request.query_params.get("limit", 8)), 1), 20)
+        except ValueError:
+            limit = 8
+        return Response(get_tag_index().search(request.query_params.get("q", ""), limit))
+
+class NotificationViewSet(SparseFieldsetMixin, FastReadMixin, viewsets.ModelViewSet):
     """
     /api/notifications/  (내 알림만)
     GET: 목록/조회
@@ -39,7 +72,9 @@ class NotificationViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         # 내 알림만
-        return Notification.objects.filter(user=self.request.user).order_by("-id")
+        # 삭제(숨김)된 글의 알림은 정리 전이라도 보이지 않게
+        return (Notification.objects.filter(user=self.request.user)
+                .filter(Q(post__isnull=True) | Q(post__deleted_at__isnull=True)).order_by("-id"))
     
     @action(detail=False, methods=["get"])
     def unread(self, request):
@@ -47,7 +82,10 @@ class NotificationViewSet(viewsets.ModelViewSet):
         GET /api/notifications/unread/
         -> 안 읽은(is_read=False) 알림만
         """
-        qs = self.get_queryset().filter(is_read=False)
+        qs = self.filter_queryset(self.get_queryset()).filter(is_read=False)
+        fast = self.fast_list_response(qs)
+        if fast is not None:
+            return fast
         page = self.paginate_queryset(qs)
         if page is not None:
             ser = self.get_serializer(page, many=True)
@@ -85,21 +123,52 @@ class NotificationViewSet(viewsets.ModelViewSet):
         n.save(update_fields=["is_read"])
         return Response({"ok": True})
 
-class PostCommentViewSet(viewsets.ModelViewSet):
+class PostCommentViewSet(IdempotencyMixin, RateLimitHeadersMixin, SparseFieldsetMixin, StreamingListMixin, viewsets.ModelViewSet):
     """
     특정 Post에 대한 댓글 목록/생성
-    /api/posts/{post_pk}/comments/
+    /api/posts/{post_pk}/comments/          → 전체 댓글 (최신순, 평면 목록)
+    /api/posts/{post_pk}/comments/threads/  → 최상위 댓글 단위 페이지 + 각 스레드의 답글 (표시 순)
     """
     serializer_class = CommentSerializer
     permission_classes = [IsOwnerOrReadOnly]
+    idempotent_actions = ("create",)
+
+    def get_throttles(self):
+        if self.action == "create":
+            return [CommentThrottle()]
+        return super().get_throttles()
 
     def get_queryset(self):
         post_id = self.kwargs.get("post_pk")  # URL의 캡처 이름과 일치해야 함
-        return Comment.objects.filter(post_id=post_id).order_by("-id")
+        return (Comment.objects.filter(post_id=post_id, post__deleted_at__isnull=True)
+                .select_related("author").order_by("-id"))
+
+    def threads(self, request, *args, **kwargs):
+        """
+        최상위 댓글을 최신순으로 한 페이지 자르고, 그 스레드들의 답글까지 path 범위 조회 한 번으로 읽는다.
+        (한 페이지의 최상위 댓글은 id가 연속 구간이라 path도 [가장 작은 루트, 가장 큰 루트~) 한 구간)
+        """
+        roots = self.paginate_queryset(
+            self.get_queryset().filter(parent__isnull=True).values_list("path", flat=True))
+        comments = []
+        if roots:
+            comments = list(self.get_queryset().order_by("path")
+                            .filter(path__gte=min(roots), path__lt=Comment.subtree_end(max(roots))))
+        data = self.get_serializer(comments, many=True).data
+        threads = {}
+        for comment, item in zip(comments, data):
+            if comment.depth == 0:
+                threads[comment.path] = {**item, "replies": []}
+            else:
+                threads[comment.path[:Comment.PATH_STEP]]["replies"].append(item)
+        return self.get_paginated_response([threads[path] for path in roots if path in threads])
 
     def perform_create(self, serializer):
         post_id = self.kwargs.get("post_pk")
         post = get_object_or_404(Post, pk=post_id)
+        parent = serializer.validated_data.get("parent")
+        if parent is not None and parent.post_id != post.id:
+            raise ValidationError({"parent": "다른 글의 댓글에는 답글을 달 수 없습니다."})
         # 방금 생성된 댓글 객체를 변수에 담는다
         comment_obj = serializer.save(post=post, author=self.request.user)
 
@@ -113,21 +182,80 @@ class PostCommentViewSet(viewsets.ModelViewSet):
                 comment=comment_obj,
             )
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(SparseFieldsetMixin, StreamingListMixin, viewsets.ModelViewSet):
     """
     개별 댓글 CRUD
     /api/comments/{id}/
     """
-    queryset = Comment.objects.all().order_by("-id")
+    queryset = Comment.objects.filter(post__deleted_at__isnull=True).select_related("author").order_by("-id")
     serializer_class = CommentSerializer
     permission_classes = [IsAdminOrOwnerOrReadOnly]
 
+    @action(detail=True, methods=["get"])
+    def thread(self, request, pk=None):
+        """GET /api/comments/{id}/thread/ → 이 댓글과 하위 답글 전체 (표시 순, path 범위 조회 1번)"""
+        root = get_object_or_404(Comment.objects.filter(post__deleted_at__isnull=True).only("post_id", "path"), pk=pk)
+        qs = (Comment.objects.select_related("author").order_by("path")
+              .filter(post_id=root.post_id, path__gte=root.path, path__lt=Comment.subtree_end(root.path)))
+        return Response(self.get_serializer(qs, many=True).data)
+
     def perform_create(self, serializer):
         # 일반적으로 개별 생성은 사용하지 않지만, 혹시 대비
         serializer.save(author=self.request.user)
 
-class RegisterView(APIView):
+def posts_by_ids(ids):
+    """id 목록의 글을 목록용 표현(excerpt, like/comment 수)으로, 주어진 순서대로"""
+    posts = (PostViewSet.queryset.filter(pk__in=ids).select_related("author", "category")
+             .defer("content").annotate(**list_annotations()))
+    by_id = {p.id: p for p in posts}
+    return [by_id[i] for i in ids if i in by_id]
+
+class FollowView(APIView):
+    """
+    POST   /api/users/{username}/follow/  → 팔로우
+    DELETE /api/users/{username}/follow/  → 언팔로우
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, username):
+        followee = get_object_or_404(User, username=username)
+        if followee.pk == request.user.pk:
+            return Response({"detail": "자기 자신은 팔로우할 수 없습니다."}, status=status.HTTP_400_BAD_REQUEST)
+        _, created = Follow.objects.get_or_create(follower=request.user, followee=followee)
+        if created:
+            return Response({"detail": "followed"}, status=status.HTTP_201_CREATED)
+        return Response({"detail": "already following"}, status=status.HTTP_200_OK)
+
+    def delete(self, request, username):
+        followee = get_object_or_404(User, username=username)
+        for follow in Follow.objects.filter(follower=request.user, followee=followee):
+            follow.delete()  # post_delete 신호로 타임라인 정리
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+class FeedView(APIView):
+    """
+    GET /api/feed/?before=<post id>&page_size=20
+    -> 팔로우한 작성자들의 글 (최신순, post id 키셋 페이지네이션)
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        try:
+            size = min(max(int(request.query_params.get("page_size", 20)), 1), 100)
+            before = request.query_params.get("before")
+            before = int(before) if before else None
+        except ValueError:
+            return Response({"detail": "잘못된 요청입니다."}, status=status.HTTP_400_BAD_REQUEST)
+        ids, next_before = feed_page(request.user.pk, before, size)
+        data = PostListSerializer(posts_by_ids(ids), many=True, context={"request": request}).data
+        next_url = None
+        if next_before is not None:
+            next_url = replace_query_param(request.build_absolute_uri(), "before", next_before)
+        return Response({"next": next_url, "results": data})
+
+class RegisterView(RateLimitHeadersMixin, APIView):
     permission_classes = [permissions.AllowAny]  # 누구나 회원가입 가능
+    throttle_classes = [RegisterThrottle]        # IP당 가입 시도 제한
 
     def post(self, request):
         username = request.data.get('username')
@@ -139,7 +267,7 @@ class RegisterView(APIView):
         user = User.objects.create_user(username=username, password=password)
         return Response({'id': user.id, 'username': user.username}, status=status.HTTP_201_CREATED)
 
-class PostViewSet(viewsets.ModelViewSet):
+class PostViewSet(IdempotencyMixin, RateLimitHeadersMixin, SparseFieldsetMixin, StreamingListMixin, viewsets.ModelViewSet):
     # annotate로 like/comment 집계 컬럼을 쿼리 단계에서 붙임 (성능 ↑)
     queryset = (Post.objects
                 .all()
@@ -155,81 +283,253 @@ class PostViewSet(viewsets.ModelViewSet):
     search_fields = ["title","content"]
     ordering_fields = ["created_at","updated_at","id","like_count","comment_count"]
     ordering = ["-id"]  # 기본 정렬
+    # 재전송 시 글 중복 생성/AI 재호출을 막음 (Idempotency-Key 헤더)
+    idempotent_actions = ("create", "like", "refresh_ai")
 
-    def _run_ai_and_save(self, post: Post):
-        ai = get_ai()
+    def get_throttles(self):
+        # AI(유료 호출)를 부르는 요청은 글 길이만큼 비용을 매기는 ai scope로 제한
+        skip_ai = self.request.query_params.get("skip_ai") in ("1","true","yes","on")
+        if self.action in ("create", "refresh_ai") or (self.action in ("update", "partial_update") and not skip_ai):
+            return [*super().get_throttles(), AIThrottle()]
+        return super().get_throttles()
+
+    def fast_read_extend(self, serializer, rows, data):
+        # PostSerializer.to_representation이 붙이는 tags를 목록 전체에 대해 쿼리 1번으로
+        if "tags" not in serializer.fields:
+            return
+        by_post = {}
+        through = Post.tags.through.objects.filter(post_id__in=[r["id"] for r in rows])
+        for post_id, slug in through.order_by("post_id", "tag_id").values_list("post_id", "tag__slug"):
+            by_post.setdefault(post_id, []).append(slug)
+        for row, item in zip(rows, data):
+            item["tags"] = by_post.get(row["id"], [])
+
+    def get_serializer_class(self):
+        # 목록은 content 대신 excerpt만 내려주는 가벼운 표현 사용
+        if self.action in ("list", "trending"):
+            return PostListSerializer
+        return super().get_serializer_class()
+
+    def retrieve(self, request, *args, **kwargs):
+        post = self.get_object()
+        # save()를 거치지 않은 글(bulk 생성 등)이나 렌더러 버전이 바뀐 글은 첫 조회 때 한 번 렌더링해 둔다
+        if "content" not in post.get_deferred_fields() and post.ensure_rendered():
+            Post.all_objects.filter(pk=post.pk).update(rendered=post.rendered)
+        return Response(self.get_serializer(post).data)
+
+    def _run_ai_and_save(self, post: Post, ai=None):
+        ai = ai or get_ai()
         text = (post.content or post.title or "").strip()
+        usage = TokenUsage()
         if hasattr(ai, "analyze"):
-            summary, tags = ai.analyze(text, max_chars=120, k=6)
+            summary, tags = ai.analyze(text, max_chars=120, k=6, usage=usage)
         else:
             summary = ai.summarize(text)
             tags = ai.suggest_tags(text, k=6)
         post.summary = summary
         post.tags_suggested = tags
         post.save(update_fields=["summary", "tags_suggested"])
+        record_usage(post.id, usage, getattr(ai, "summary_model", ""))
+
+    def _fill_ai(self, post: Post):
+        """
+        글 저장 시점: 로컬 추출 요약/태그를 즉시 저장하고(수 ms),
+        실제 provider(Gemini)는 커밋 후 백그라운드에서 결과를 덮어쓴다.
+        AI_UPGRADE_MIN_CHARS보다 짧은 글은 로컬 결과로 충분하므로 업그레이드 생략.
+        """
+        ai = get_ai()
+        # 원격 provider일 때만 로컬 먼저 + 업그레이드 (로컬/더미는 바로 저장, 업그레이드할 것이 없음)
+        if not isinstance(ai, GeminiAI) or not getattr(settings, "AI_LOCAL_FIRST", True):
+            return self._run_ai_and_save(post, ai)
+        self._run_ai_and_save(post, LocalAI())
+        text = (post.content or post.title or "").strip()
+        if len(text) >= getattr(settings, "AI_UPGRADE_MIN_CHARS", 300):
+            transaction.on_commit(lambda: schedule_ai_upgrade(post.id))
     
     def perform_create(self, serializer):
         with transaction.atomic():
             # 1) 우선 글을 저장 (author 지정)
             post = serializer.save(author=self.request.user)
             try:
-                self._run_ai_and_save(post)                # 생성 시 1회
-                logger.info("AI filled on create id=%s", post.id)
+                self._fill_ai(post)                        # 생성 시 1회
+                logger.info("AI filled on create id=%s", post.id, extra={"post_id": post.id})
             except Exception:
-                logger.exception("AI create failed id=%s", post.id)
+                logger.exception("AI create failed id=%s", post.id, extra={"post_id": post.id})
+
+    def perform_destroy(self, instance):
+        # 숨김 처리 후 좋아요/댓글 등은 커밋 후 백그라운드에서 나눠 삭제 (blog.purge)
+        soft_delete(instance)
 
     def perform_update(self, serializer):
         skip_ai = self.request.query_params.get("skip_ai") in ("1","true","yes","on")
 
-        # 업데이트 전 값 백업
-        instance = self.get_object()
-        before = (instance.title, instance.content)
-
         with transaction.atomic():
+            # 업데이트 전 값은 행을 잠근 뒤 읽는다 — 동시 수정이 같은 판 번호/어긋난 diff 기준을 쓰지 않도록
+            # (마지막 판도 잠금 안에서 history.record가 읽음)
+            instance = serializer.instance
+            before = (Post.all_objects.select_for_update().filter(pk=instance.pk)
+                      .values_list("title", "content").get())
+            instance.title, instance.content = before  # 이번 요청이 안 바꾸는 필드를 옛 값으로 덮어쓰지 않게
             post = serializer.save()
+            history.record(post, before, editor=self.request.user)
             try:
                 changed = (post.title, post.content) != before
                 if not skip_ai and changed:
-                    self._run_ai_and_save(post)            # 내용 바뀐 경우만
-                    logger.info("AI filled on update id=%s", post.id)
+                    self._fill_ai(post)                    # 내용 바뀐 경우만
+                    logger.info("AI filled on update id=%s", post.id, extra={"post_id": post.id})
                 else:
                     logger.info("AI skipped on update id=%s (skip_ai=%s, changed=%s)",
-                                post.id, skip_ai, changed)
+                                post.id, skip_ai, changed, extra={"post_id": post.id})
             except Exception:
-                logger.exception("AI update failed id=%s", post.id)
+                logger.exception("AI update failed id=%s", post.id, extra={"post_id": post.id})
 
-    @action(detail=True, methods=["post", "delete"], permission_classes=[permissions.IsAuthenticated])
+    @action(detail=True, methods=["post", "delete"], permission_classes=[permissions.IsAuthenticated],
+            throttle_classes=[LikeThrottle])
     def like(self, request, pk=None):
         """
-        POST   /api/posts/{id}/like/    → 좋아요
-        DELETE /api/posts/{id}/like/    → 좋아요 취소
+        POST   /api/posts/{id}/like/    → 좋아요 (이미 눌렀으면 200, 그대로)
+        DELETE /api/posts/{id}/like/    → 좋아요 취소 (없어도 204)
+        글을 읽지 않고 INSERT/DELETE 한 문장으로 처리, 카운터는 trending 버퍼로 모아서 반영
         """
-        post = self.get_object()
-
+        post_id = self._pk_or_404(pk)
         if request.method.lower() == "post":
-            obj, created = Like.objects.get_or_create(post=post, user=request.user)
-            if created:
+            if add_like(post_id, request.user.pk):
+                trending.record(post_id, trending.LIKE_WEIGHT, timezone.now(), likes=1)
                 return Response({"detail": "liked"}, status=status.HTTP_201_CREATED)
+            if not Post.objects.filter(pk=post_id).exists():
+                return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
             return Response({"detail": "already liked"}, status=status.HTTP_200_OK)
 
         # DELETE
-        Like.objects.filter(post=post, user=request.user).delete()
+        created_at = remove_like(post_id, request.user.pk)
+        if created_at is not None:
+            trending.record(post_id, -trending.LIKE_WEIGHT, created_at, likes=-1)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
-    @action(detail=True, methods=["get"], permission_classes=[permissions.AllowAny])
+    @action(detail=True, methods=["get"], permission_classes=[permissions.AllowAny],
+            pagination_class=CounterPagination)
     def likes(self, request, pk=None):
         """
-        GET /api/posts/{id}/likes/  → 좋아요 수/간단 목록
+        GET /api/posts/{id}/likes/?page=1  → 좋아요 수(카운터) + 누른 사용자 목록(최근 순, 페이지)
         """
-        post = self.get_object()
-        users = list(post.likes.select_related("user").values_list("user__username", flat=True))
-        return Response({"count": len(users), "users": users})
-    
+        post_id = self._pk_or_404(pk)
+        count = trending.like_count(post_id)
+        if count is None:  # 없거나 삭제된 글
+            raise Http404
+        qs = (Like.objects.filter(post_id=post_id).order_by("-id")
+              .values("user__username", "created_at"))
+        page = self.paginator.paginate_queryset(qs, request, self, count=count)
+        users = [{"username": row["user__username"], "liked_at": row["created_at"]} for row in page]
+        return self.paginator.get_paginated_response(users)
+
+    @action(detail=True, methods=["get"], permission_classes=[permissions.AllowAny])
+    def revisions(self, request, pk=None):
+        """
+        GET /api/posts/{id}/revisions/  → 수정 이력 (최신 판부터, 페이지). 본문은 revisions/{n}/ 에서
+        """
+        post_id = self._pk_or_404(pk)
+        qs = (PostRevision.objects.filter(post_id=post_id, post__deleted_at__isnull=True).order_by("-number")
+              .values("number", "base", "title", "size", "editor__username", "created_at"))
+        page = self.paginate_queryset(qs)
+        if not page and not Post.objects.filter(pk=post_id).exists():
+            raise Http404
+        return self.get_paginated_response([
+            {"number": r["number"], "title": r["title"], "size": r["size"], "editor": r["editor__username"],
+             "snapshot": r["base"] == r["number"], "created_at": r["created_at"]} for r in page])
+
+    @action(detail=True, methods=["get"], permission_classes=[permissions.AllowAny],
+            url_path=r"revisions/(?P<number>[0-9]+)")
+    def revision(self, request, pk=None, number=None):
+        """GET /api/posts/{id}/revisions/{n}/ → n판 제목/본문 (가까운 스냅샷에서 복원)"""
+        number = int(number)
+        found = history.reconstruct(self._pk_or_404(pk), [number])
+        if number not in found:
+            raise Http404
+        title, content = found[number]
+        return Response({"number": number, "title": title, "content": content})
+
+    @action(detail=True, methods=["get"], permission_classes=[permissions.AllowAny], url_path="revisions/diff")
+    def revisions_diff(self, request, pk=None):
+        """GET /api/posts/{id}/revisions/diff/?from=1&to=3 → 두 판 사이 unified diff"""
+        try:
+            a, b = int(request.query_params["from"]), int(request.query_params["to"])
+        except (KeyError, ValueError):
+            return Response({"detail": "from, to 판 번호가 필요합니다."}, status=status.HTTP_400_BAD_REQUEST)
+        data = history.diff(self._pk_or_404(pk), a, b)
+        if data is None:
+            raise Http404
+        return Response(data)
+
+    @staticmethod
+    def _pk_or_404(pk):
+        try:
+            return int(pk)
+        except (TypeError, ValueError):
+            raise Http404
+
+    @action(detail=True, methods=["get"], permission_classes=[permissions.AllowAny])
+    def related(self, request, pk=None):
+        """
+        GET /api/posts/{id}/related/?k=5  → 태그/추천 태그/본문이 비슷한 글 (미리 계산된 인덱스 조회)
+        """
+        try:
+            k = min(max(int(request.query_params.get("k", 5)), 1), 20)
+            post_id = int(pk)
+        except (TypeError, ValueError):
+            return Response({"detail": "잘못된 요청입니다."}, status=status.HTTP_400_BAD_REQUEST)
+        index = get_related_index()
+        if index is None:  # 인덱스 파일이 없어 백그라운드에서 빌드 중
+            return Response({"detail": "관련 글 인덱스를 준비 중입니다."},
+                            status=status.HTTP_503_SERVICE_UNAVAILABLE, headers={"Retry-After": "30"})
+        hits = index.related(post_id, k)
+        if hits is None:
+            # 인덱스 파일 생성 이후 다른 프로세스에서 만들어진 글 → 지금 색인
+            get_object_or_404(Post, pk=post_id)
+            refresh_post(post_id)
+            hits = index.related(post_id, k) or []
+        by_id = {p.id: p for p in posts_by_ids([p for p, _ in hits])}
+        hits = [(by_id[p], score) for p, score in hits if p in by_id]
+        data = PostListSerializer([p for p, _ in hits], many=True, context=self.get_serializer_context()).data
+        for item, (_, score) in zip(data, hits):
+            item["score"] = round(score, 4)
+        return Response(data)
+
+    @action(detail=False, methods=["get"], permission_classes=[permissions.AllowAny])
+    def trending(self, request):
+        """
+        GET /api/posts/trending/  → 최근 좋아요/댓글이 많은 글 (시간 감쇠 점수 순)
+        점수와 카운터는 PostScore에 증분으로 쌓여 있으므로 Like/Comment 집계 없이 인덱스 순으로 읽는다.
+        읽기 요청에서는 반영(flush)하지 않는다 — 백그라운드 반영으로 최대 TRENDING_FLUSH_SECONDS 늦음.
+        """
+        qs = (Post.objects
+              .filter(trending__score__gt=0)
+              .select_related("author", "category")
+              .defer("content")
+              .annotate(like_count=F("trending__likes"),
+                        comment_count=F("trending__comments"),
+                        **list_annotations())
+              .order_by("-trending__score", "-id"))
+        fast = self.fast_list_response(qs)
+        if fast is not None:
+            return fast
+        page = self.paginate_queryset(qs)
+        if page is not None:
+            ser = self.get_serializer(page, many=True)
+            return self.get_paginated_response(ser.data)
+        return Response(self.get_serializer(qs, many=True).data)
+
     # 쿼리파라미터: ?category=backend&tags=jwt,drf
     def get_queryset(self):
         qs = super().get_queryset()
-        category = self.request.query_params.get("category")
-        tags = self.request.query_params.get("tags")
+        if self.action == "list":
+            # 목록에선 본문 전체를 읽지 않고 렌더링해 둔 평문 요약만 JOIN으로
+            qs = qs.defer("content").annotate(**list_annotations())
+        return self.filter_by_params(qs)
+
+    def filter_by_params(self, qs, category=True, tags=True):
+        """?category= / ?tags= 필터 (facets는 자기 차원의 필터를 빼고 센다)"""
+        category = self.request.query_params.get("category") if category else None
+        tags = self.request.query_params.get("tags") if tags else None
         if category:
             qs = qs.filter(category__slug=category)
         if tags:
@@ -237,13 +537,63 @@ class PostViewSet(viewsets.ModelViewSet):
             if slugs:
                 qs = qs.filter(tags__slug__in=slugs).distinct()
         return qs
+
+    @action(detail=False, methods=["get"], permission_classes=[permissions.AllowAny])
+    def facets(self, request):
+        """
+        GET /api/posts/facets/?search=&category=&tags=  → 카테고리/태그별 글 수
+        카테고리 카운트는 카테고리 필터를, 태그 카운트는 태그 필터를 뺀 범위에서 센다 (다른 값으로 바꿀 때의 개수).
+        """
+        def build():
+            searched = filters.SearchFilter().filter_queryset(request, Post.objects.all(), self)
+            return count_facets(self.filter_by_params(searched, category=False),
+                                self.filter_by_params(searched, tags=False))
+        return Response(cached_facets(request.query_params, build))
     
     @action(detail=True, methods=["post"])
-    def refresh_ai(self, request, slug=None):
+    def refresh_ai(self, request, pk=None):
         post = self.get_object()
         try:
             self._run_ai_and_save(post)
             return Response(PostSerializer(post).data)
         except Exception:
-            logger.exception("AI refresh failed id=%s", post.id)
-            return Response({"detail": "AI processing failed"}, status=502)
\ No newline at end of file
+            logger.exception("AI refresh failed id=%s", post.id, extra={"post_id": post.id})
+            return Response({"detail": "AI processing failed"}, status=502)
+
+
+# ---------- 피드 / sitemap (blog.syndication — 캐시된 XML + 조건부 GET) ----------
+def _syndication_response(request, entry, content_type):
+    if entry is None:
+        raise Http404
+    response = HttpResponse(entry["body"], content_type=content_type)
+    response["ETag"] = entry["etag"]
+    response["Last-Modified"] = http_date(entry["last_modified"])
+    patch_cache_control(response, public=True, max_age=getattr(settings, "FEEDS_MAX_AGE", 300))
+    # If-None-Match/If-Modified-Since가 맞으면 본문 없이 304 (헤더는 그대로)
+    return get_conditional_response(request, etag=entry["etag"], last_modified=entry["last_modified"],
+                                    response=response) or response
+
+
+@require_safe
+def feed_view(request, fmt, kind=None, slug=None):
+    """/feeds/rss.xml, /feeds/atom.xml, /feeds/category/<slug>/rss.xml, /feeds/tag/<slug>/atom.xml ..."""
+    content_type = "application/atom+xml; charset=utf-8" if fmt == "atom" else "application/rss+xml; charset=utf-8"
+    return _syndication_response(request, syndication.feed(request, fmt, kind, slug), content_type)
+
+
+@require_safe
+def sitemap_view(request, shard=None):
+    """/sitemap.xml (조각 색인), /sitemap-<n>.xml (글 id 구간별 조각)"""
+    entry = syndication.sitemap_index(request) if shard is None else syndication.sitemap_shard(request, shard)
+    return _syndication_response(request, entry, "application/xml; charset=utf-8")
+
+
+@require_safe
+def frontend_view(request):
+    """/ → frontend/index.html (정적 파일 경로를 해시 URL로 바꾼 것). 페이지 자체는 매번 재검증"""
+    html = staticfiles.frontend_html()
+    etag = f'"{hashlib.md5(html.encode()).hexdigest()}"'
+    response = HttpResponse(html, content_type="text/html; charset=utf-8")
+    response["ETag"] = etag
+    patch_cache_control(response, no_cache=True)
+    return get_conditional_response(request, etag=etag, response=response) or response
@@ -47,18 +47,30 @@ INSTALLED_APPS = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',  # JWT 인증 사용
+        'blog.authentication.CachedJWTAuthentication',  # JWT 인증 (클레임 + 사용자 행 캐시)
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',       # 읽기는 누구나, 쓰기는 로그인만
     ],
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_PAGINATION_CLASS": "blog.pagination.StandardPagination",   # ?page_size= 지원
     "PAGE_SIZE": 10,
     "DEFAULT_FILTER_BACKENDS": [
         "django_filters.rest_framework.DjangoFilterBackend",
         "rest_framework.filters.SearchFilter",
         "rest_framework.filters.OrderingFilter",
     ],
+    # 토큰 버킷 throttle scope별 "용량/기간" (blog.throttling)
+    "DEFAULT_THROTTLE_RATES": {
+        "register": os.getenv("THROTTLE_REGISTER", "5/hour"),
+        "like": os.getenv("THROTTLE_LIKE", "60/min"),
+        "comment": os.getenv("THROTTLE_COMMENT", "20/min"),
+        "ai": os.getenv("THROTTLE_AI", "30/hour"),   # 단위: AI_THROTTLE_UNIT_CHARS 글자
+    },
+    # orjson이 있으면 orjson, 없으면 기본 json (출력 바이트 동일)
+    "DEFAULT_RENDERER_CLASSES": [
+        "blog.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
 }
 
 
@@ -66,10 +78,16 @@ from datetime import timedelta
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=15),   # 접근 토큰 15분
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),      # 리프레시 토큰 7일
+    'TOKEN_OBTAIN_SERIALIZER': 'blog.serializers.ClaimsTokenObtainPairSerializer',  # username 클레임 포함
 }
 
+# CachedJWTAuthentication이 캐시하는 사용자 행 TTL(초)
+AUTH_USER_CACHE_TTL = int(os.getenv("AUTH_USER_CACHE_TTL", "60"))
+
 MIDDLEWARE = [
+    "blog.middleware.RequestIdMiddleware",     # 로그 상관 id (blog.logs) — 다른 미들웨어 로그에도 붙도록 맨 앞
     "corsheaders.middleware.CorsMiddleware",
+    "blog.middleware.CompressionMiddleware",   # 응답 본문을 만지는 미들웨어보다 앞(=응답 처리 시 마지막)
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -77,6 +95,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    "blog.middleware.ProfilingMiddleware",      # 스태프 프로파일 / 느린 쿼리 로그 (뷰만 재도록 맨 끝)
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -145,6 +164,12 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/5.2/howto/static-files/
 
 STATIC_URL = 'static/'
+# frontend/ SPA도 정적 파일로 수집 (운영: blog.staticfiles가 해시 이름 + 미리 압축, "/"는 index.html)
+FRONTEND_DIR = BASE_DIR / "frontend"
+STATICFILES_DIRS = [FRONTEND_DIR]
+STATIC_ROOT = os.getenv("STATIC_ROOT", str(BASE_DIR / "var" / "static"))
+# 해시 없는 이름(원본 경로)으로 요청된 정적 파일의 캐시 시간(초). 해시 이름은 1년 immutable
+STATIC_MAX_AGE = int(os.getenv("STATIC_MAX_AGE", "60"))
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
@@ -159,17 +184,144 @@ load_dotenv(BASE_DIR / ".env")
 
 # --- AI 플래그/설정 ---
 AI_ENABLE = os.getenv("AI_ENABLE", "false").lower() == "true"
-AI_PROVIDER = os.getenv("AI_PROVIDER", "dummy").lower()
+AI_PROVIDER = os.getenv("AI_PROVIDER", "local").lower()   # gemini | local | dummy
 
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
 GEMINI_SUMMARY_MODEL = os.getenv("GEMINI_SUMMARY_MODEL", "gemini-1.5-flash")
 GEMINI_TAG_MODEL = os.getenv("GEMINI_TAG_MODEL", "gemini-1.5-flash")
 
+# 저장 시점엔 로컬 요약/태그를 바로 쓰고, 이 길이 이상인 글만 커밋 후 Gemini로 업그레이드
+AI_LOCAL_FIRST = os.getenv("AI_LOCAL_FIRST", "true").lower() == "true"
+AI_UPGRADE_MIN_CHARS = int(os.getenv("AI_UPGRADE_MIN_CHARS", "300"))
+
+# 추정 토큰이 AI_CHUNK_TOKENS를 넘는 글은 문단 단위로 나눠 병렬 요약(최대 AI_MAX_CHUNKS조각) 후 합친다
+AI_CHUNK_TOKENS = int(os.getenv("AI_CHUNK_TOKENS", "3000"))
+AI_MAX_CHUNKS = int(os.getenv("AI_MAX_CHUNKS", "8"))
+AI_MAP_WORKERS = int(os.getenv("AI_MAP_WORKERS", "4"))
+
+# 로컬 태그 추천기 df 통계 파일 (manage.py build_tag_model 로 생성, 시작 후 첫 사용 시 mmap)
+TAG_MODEL_PATH = os.getenv("TAG_MODEL_PATH", str(BASE_DIR / "var" / "tagmodel.bin"))
+
+# 트렌딩 점수 반감기 (좋아요/댓글의 기여도가 절반이 되는 시간)
+TRENDING_HALF_LIFE_HOURS = float(os.getenv("TRENDING_HALF_LIFE_HOURS", "24"))
+# 좋아요/댓글 카운터 버퍼: 이벤트 수 또는 시간(초)이 차면 모아서 한 번에 UPDATE
+TRENDING_FLUSH_EVENTS = int(os.getenv("TRENDING_FLUSH_EVENTS", "100"))
+TRENDING_FLUSH_SECONDS = float(os.getenv("TRENDING_FLUSH_SECONDS", "2"))
+
+# 글 수정 이력: 이 간격(판 수)마다 diff 대신 전문 스냅샷 저장 → 복원 시 적용할 diff 수 상한
+REVISION_SNAPSHOT_EVERY = int(os.getenv("REVISION_SNAPSHOT_EVERY", "20"))
+
+# 글 삭제: 숨김 후 딸린 행(좋아요/댓글/알림 등)을 이 개수씩 나눠 지운다 (DELETE 한 번 = 트랜잭션 하나)
+PURGE_BATCH_SIZE = int(os.getenv("PURGE_BATCH_SIZE", "1000"))
+
+# 태그 자동완성 인덱스: 다른 프로세스의 변경을 맞추기 위한 재빌드 주기(초)
+AUTOCOMPLETE_TTL = int(os.getenv("AUTOCOMPLETE_TTL", "600"))
+
+# /api/posts/facets/ 캐시 TTL (글/태그/카테고리 변경 시엔 세대 번호로 즉시 무효화)
+FACETS_CACHE_TTL = int(os.getenv("FACETS_CACHE_TTL", "300"))
+
+# 피드: 팔로워가 이 수 이하인 작성자의 글만 팔로워 타임라인에 미리 넣고(push), 그 이상은 읽을 때 합침(pull)
+FEED_FANOUT_LIMIT = int(os.getenv("FEED_FANOUT_LIMIT", "1000"))
+FEED_TIMELINE_MAX = int(os.getenv("FEED_TIMELINE_MAX", "500"))   # 사용자당 타임라인 보관 개수
+
+# 관련 글 인덱스 파일 (manage.py build_related_index 로 생성, 없으면 백그라운드에서 빌드하는 동안 503)
+RELATED_INDEX_PATH = os.getenv("RELATED_INDEX_PATH", str(BASE_DIR / "var" / "related.bin"))
+
+# 목록 응답의 excerpt 길이 (content 대신 DB에서 앞부분만 잘라 전송)
+POST_EXCERPT_CHARS = int(os.getenv("POST_EXCERPT_CHARS", "120"))
+
+# 목록 API 빠른 읽기 경로(.values() + 컴파일된 필드 매퍼) 사용 여부 (opt-in)
+API_FAST_READ = os.getenv("API_FAST_READ", "false").lower() == "true"
+
+# 응답 압축(br/zstd/gzip 협상) 최소 크기, 목록 page_size 상한과 스트리밍 전환 기준
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "512"))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "1000"))
+STREAMING_PAGE_SIZE = int(os.getenv("STREAMING_PAGE_SIZE", "200"))
+
+# throttle 버킷 저장소: 워커 여러 개면 blog.throttling.CacheBucketStore (공유 캐시 필요)
+THROTTLE_STORE = os.getenv("THROTTLE_STORE", "blog.throttling.LocalBucketStore")
+THROTTLE_CACHE_ALIAS = os.getenv("THROTTLE_CACHE_ALIAS", "default")
+AI_THROTTLE_UNIT_CHARS = int(os.getenv("AI_THROTTLE_UNIT_CHARS", "1000"))
+
+# Idempotency-Key 저장소(워커 여러 개면 blog.idempotency.CacheIdempotencyStore), 보관 시간과 처리 중 중복 요청 대기 시간(초)
+IDEMPOTENCY_STORE = os.getenv("IDEMPOTENCY_STORE", "blog.idempotency.LocalIdempotencyStore")
+IDEMPOTENCY_CACHE_ALIAS = os.getenv("IDEMPOTENCY_CACHE_ALIAS", "default")
+IDEMPOTENCY_TTL = int(os.getenv("IDEMPOTENCY_TTL", "86400"))
+IDEMPOTENCY_WAIT_SECONDS = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "10"))
+IDEMPOTENCY_LOCK_SECONDS = int(os.getenv("IDEMPOTENCY_LOCK_SECONDS", "120"))
+
+# RSS/Atom 피드 글 수, 만든 XML 캐시 보관(초)과 클라이언트 캐시(max-age), sitemap 조각당 글 수
+# POST_URL: 피드/사이트맵에 넣을 글 주소 ({id}, {slug} 치환, 상대 경로면 요청 호스트 기준)
+FEEDS_TITLE = os.getenv("FEEDS_TITLE", "DRF Blog")
+FEEDS_ITEMS = int(os.getenv("FEEDS_ITEMS", "20"))
+FEEDS_CACHE_TTL = int(os.getenv("FEEDS_CACHE_TTL", "86400"))
+FEEDS_MAX_AGE = int(os.getenv("FEEDS_MAX_AGE", "300"))
+SITEMAP_SHARD_SIZE = int(os.getenv("SITEMAP_SHARD_SIZE", "5000"))
+POST_URL = os.getenv("POST_URL", "/api/posts/{id}/")
+
+# 프로파일링: 무작위 샘플 비율(0~1, 0이면 X-Profile 헤더를 보낸 스태프 요청만), 요청당 저장할 SQL 수, 남길 프로파일 수
+# SLOW_QUERY_MS 이상 걸린 SQL은 blog.slow_sql 로거로 (0이면 끔)
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_MAX_QUERIES = int(os.getenv("PROFILE_MAX_QUERIES", "1000"))
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "200"))
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+
+# 관리자 목록: 전체 목록은 추정 행 수가 이 값 이상이면 COUNT(*) 대신 추정치로 페이지 계산
+# 글 검색은 blog.search 색인(SQLite FTS5 / PostgreSQL GIN)에서 관련도 순 최대 ADMIN_SEARCH_LIMIT개
+ADMIN_ESTIMATED_COUNT_MIN = int(os.getenv("ADMIN_ESTIMATED_COUNT_MIN", "100000"))
+ADMIN_SEARCH_LIMIT = int(os.getenv("ADMIN_SEARCH_LIMIT", "1000"))
+
+# manage.py runprod (blog.serving): 워커 상한, gthread 워커당 스레드, 워커를 새로 띄우는 요청 수
+SERVE_MAX_WORKERS = int(os.getenv("SERVE_MAX_WORKERS", "16"))
+SERVE_THREADS = int(os.getenv("SERVE_THREADS", "4"))
+SERVE_MAX_REQUESTS = int(os.getenv("SERVE_MAX_REQUESTS", "10000"))
+
 # 개발 편의: 모든 오리진 허용 (운영에선 특정 도메인으로 제한)
 CORS_ALLOW_ALL_ORIGINS = True
 
 # Authorization 헤더 허용
 CORS_ALLOW_HEADERS = [
     "accept", "accept-encoding", "authorization", "content-type", "origin",
-    "dnt", "user-agent", "x-csrftoken", "x-requested-with",
-]
\ No newline at end of file
+    "dnt", "user-agent", "x-csrftoken", "x-requested-with", "idempotency-key", "x-profile",
+    "x-request-id",
+]
+CORS_EXPOSE_HEADERS = ["x-request-id"]
+
+# --- 로그 (blog.logs) ---
+# 한 줄 JSON(LOG_FORMAT=text면 사람이 읽는 형식), 요청 스레드는 큐에 넣기만 (가득 차면 버림)
+# LOG_SAMPLE_RATES: "로거=비율,..." — 그 로거의 INFO 이하를 요청 단위로 비율만큼만 남김 (WARNING 이상은 전부)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_SAMPLE_RATES = {
+    name.strip(): float(rate)
+    for name, _, rate in (item.partition("=") for item in os.getenv("LOG_SAMPLE_RATES", "blog.views=0.1,blog.ai=0.1").split(","))
+    if name.strip() and rate
+}
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "filters": {
+        "request_id": {"()": "blog.logs.RequestIdFilter"},
+        "sampling": {"()": "blog.logs.SamplingFilter", "rates": LOG_SAMPLE_RATES},
+    },
+    "formatters": {
+        "json": {"()": "blog.logs.JSONFormatter"},
+        "text": {"format": "%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"},
+    },
+    "handlers": {
+        "queue": {
+            "()": "blog.logs.NonBlockingQueueHandler",
+            "maxsize": LOG_QUEUE_SIZE,
+            "filters": ["request_id", "sampling"],
+            "formatter": LOG_FORMAT,
+        },
+    },
+    "root": {"handlers": ["queue"], "level": LOG_LEVEL},
+    "loggers": {
+        # Django 기본 console/mail_admins 대신 root(큐)로
+        "django": {"handlers": [], "level": "INFO", "propagate": True},
+        # 4xx 경고는 요청마다 나오므로 기본은 5xx(ERROR)만
+        "django.request": {"level": os.getenv("DJANGO_REQUEST_LOG_LEVEL", "ERROR")},
+    },
+}
@@ -0,0 +1,84 @@
+"""
+운영 설정 — config.settings 위에 덮어쓴다.
+
+    DJANGO_SECRET_KEY=... ALLOWED_HOSTS=blog.example.com CACHE_URL=redis://cache:6379/0 \
+    DJANGO_SETTINGS_MODULE=config.settings_production python manage.py collectstatic --noinput
+    python manage.py runprod            # gunicorn (blog.serving), 이 설정으로 실행
+
+HTTPS 종료는 앞단 프록시(X-Forwarded-Proto)에서 한다고 가정.
+"""
+import os
+from urllib.parse import urlsplit
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .settings import *  # noqa: F401,F403
+from .settings import DATABASES, MIDDLEWARE, REST_FRAMEWORK
+
+
+def _list(name, default=""):
+    return [v.strip() for v in os.getenv(name, default).split(",") if v.strip()]
+
+
+def _cache(url):
+    """CACHE_URL → CACHES["default"]. redis://, rediss:// 또는 memcached://host:port[,host:port]"""
+    scheme = urlsplit(url).scheme
+    if scheme in ("redis", "rediss"):
+        return {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": url}
+    if scheme == "memcached":
+        return {"BACKEND": "django.core.cache.backends.memcached.PyMemcacheCache",
+                "LOCATION": [h.strip() for h in url.split("://", 1)[1].split(",") if h.strip()]}
+    raise ImproperlyConfigured(f"CACHE_URL은 redis:// 또는 memcached:// 이어야 합니다: {url!r}")
+
+
+DEBUG = os.getenv("DEBUG", "false").lower() == "true"
+
+SECRET_KEY = os.getenv("DJANGO_SECRET_KEY", "")
+if not SECRET_KEY:
+    raise ImproperlyConfigured("DJANGO_SECRET_KEY 환경 변수가 필요합니다")
+
+ALLOWED_HOSTS = _list("ALLOWED_HOSTS", "localhost,127.0.0.1")
+CSRF_TRUSTED_ORIGINS = _list("CSRF_TRUSTED_ORIGINS")
+
+# SPA를 같은 오리진에서 내보내므로 CORS는 지정한 오리진만
+CORS_ALLOW_ALL_ORIGINS = False
+CORS_ALLOWED_ORIGINS = _list("CORS_ALLOWED_ORIGINS")
+
+# HTTPS (프록시 뒤). HTTPS=false는 로컬 벤치마크용
+HTTPS = os.getenv("HTTPS", "true").lower() == "true"
+SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
+SECURE_SSL_REDIRECT = HTTPS
+SESSION_COOKIE_SECURE = HTTPS
+CSRF_COOKIE_SECURE = HTTPS
+SECURE_HSTS_SECONDS = int(os.getenv("SECURE_HSTS_SECONDS", "31536000" if HTTPS else "0"))
+SECURE_CONTENT_TYPE_NOSNIFF = True
+SECURE_REFERRER_POLICY = "same-origin"
+
+# 워커가 여러 개이므로 공유 캐시 필수 — throttle 버킷, Idempotency-Key, 인증 사용자 캐시를 모든 워커가 같이 본다
+CACHE_URL = os.getenv("CACHE_URL", "")
+if not CACHE_URL:
+    raise ImproperlyConfigured("CACHE_URL 환경 변수(redis:// 또는 memcached://)가 필요합니다")
+CACHES = {"default": _cache(CACHE_URL)}
+THROTTLE_STORE = "blog.throttling.CacheBucketStore"
+IDEMPOTENCY_STORE = "blog.idempotency.CacheIdempotencyStore"
+
+# 워커가 요청마다 DB 연결을 새로 열지 않도록 (health check로 끊긴 연결은 버림)
+DATABASES = {
+    **DATABASES,
+    "default": {
+        **DATABASES["default"],
+        "NAME": os.getenv("SQLITE_PATH", str(DATABASES["default"]["NAME"])),
+        "CONN_MAX_AGE": int(os.getenv("CONN_MAX_AGE", "60")),
+        "CONN_HEALTH_CHECKS": True,
+    },
+}
+
+# 해시 이름 + 미리 압축한 정적 파일 (blog.staticfiles), 맨 앞 미들웨어가 바로 서빙
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "blog.staticfiles.CompressedManifestStaticFilesStorage"},
+}
+MIDDLEWARE = ["blog.middleware.StaticFilesMiddleware", *MIDDLEWARE]
+
+# 운영에선 JSON만 (Browsable API 렌더러는 요청마다 폼/템플릿을 만든다)
+REST_FRAMEWORK = {**REST_FRAMEWORK, "DEFAULT_RENDERER_CLASSES": ["blog.renderers.FastJSONRenderer"]}
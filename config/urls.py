@@ -17,6 +17,7 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView, TokenVerifyView
+from blog.views import feed_view, frontend_view, sitemap_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -24,4 +25,13 @@ urlpatterns = [
     path('api/auth/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('api/auth/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('api/auth/verify/', TokenVerifyView.as_view(), name='token_verify'),
+    # 피드 리더/크롤러용 (캐시된 XML, 조건부 GET)
+    path('feeds/rss.xml', feed_view, {'fmt': 'rss'}, name='feed-rss'),
+    path('feeds/atom.xml', feed_view, {'fmt': 'atom'}, name='feed-atom'),
+    path('feeds/<str:kind>/<str:slug>/rss.xml', feed_view, {'fmt': 'rss'}, name='feed-scoped-rss'),
+    path('feeds/<str:kind>/<str:slug>/atom.xml', feed_view, {'fmt': 'atom'}, name='feed-scoped-atom'),
+    path('sitemap.xml', sitemap_view, name='sitemap'),
+    path('sitemap-<int:shard>.xml', sitemap_view, name='sitemap-shard'),
+    # SPA 진입 페이지 (js/css는 STATIC_URL 아래 해시 이름)
+    path('', frontend_view, name='frontend'),
 ]
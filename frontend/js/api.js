@@ -1,5 +1,7 @@
 // js/api.js
 // ✅ 모든 네트워크 호출 모음 (JWT 자동 처리)
+import { API_BASE, store } from "./state.js";
+
 window.addEventListener("unhandledrejection", (e) => {
   e.preventDefault();
   const msg = e.reason?.message || "요청 중 오류가 발생했습니다.";
@@ -8,8 +10,6 @@ window.addEventListener("unhandledrejection", (e) => {
 
 export const PAGE_SIZE = 10; // settings.py의 REST_FRAMEWORK["PAGE_SIZE"]와 동일하게!
 
-import { API_BASE, store } from "./state.js";
-
 export async function refreshAccessToken() {
   try {
     const res = await fetch(`${API_BASE}/api/auth/refresh/`, {
@@ -34,6 +34,10 @@ export async function fetchWithAuth(url, opts = {}, retry = true) {
   if (store.access) {
     headers.set("Authorization", `Bearer ${store.access}`);
   }
+  // POST 재시도(토큰 갱신 후 등)가 글/댓글을 중복 생성하지 않도록 같은 키를 재사용
+  if ((opts.method || "GET").toUpperCase() === "POST" && !headers.has("Idempotency-Key")) {
+    headers.set("Idempotency-Key", crypto.randomUUID());
+  }
 
   let res;
   try {
@@ -228,13 +232,10 @@ export async function register(username, password) {
   return res.json(); // {id, username}
 }
 
-export async function searchTags(q, page = 1) {
-  const params = new URLSearchParams();
-  if (q) params.set("search", q);
-  params.set("page", page);
-  const res = await fetchWithAuth(`${API_BASE}/api/tags/${params.toString() ? "?" + params : ""}`);
+export async function searchTags(q, limit = 8) {
+  // 자동완성 전용 엔드포인트: 접두어(초성 포함) 일치, 글 많은 순
+  const params = new URLSearchParams({ q: q || "", limit });
+  const res = await fetchWithAuth(`${API_BASE}/api/tags/autocomplete/?${params}`);
   if (!res.ok) throw new Error("태그 검색 실패");
-  const data = await res.json();
-  // 페이지네이션/비페이지네이션 모두 대응
-  return Array.isArray(data) ? data : (data.results || []);
+  return res.json();
 }
\ No newline at end of file
@@ -33,11 +33,12 @@ function postCard(p) {
     <div class="post">
       <div class="meta">#${p.id} / by ${p.author} / ${new Date(p.created_at).toLocaleString()}</div>
       <h3><a href="#" data-goto="detail" data-id="${p.id}">${p.title}</a></h3>
-      ${p.summary?.trim() ? `<p>${p.summary}</p>` : `<p>${(p.content||"").substring(0,120)}...</p>`}
+      ${p.summary?.trim() ? `<p>${p.summary}</p>` : `<p>${p.excerpt || ""}...</p>`}
       <div class="meta">
         ${tags} ${aiTags}
         <span class="badge">❤️ ${p.like_count ?? 0}</span>
         <span class="badge">💬 ${p.comment_count ?? 0}</span>
+        ${p.reading_time ? `<span class="badge">⏱ ${p.reading_time}분</span>` : ""}
       </div>
     </div>
   `;
@@ -97,7 +98,7 @@ function renderDetail(p, comments = []) {
     <div class="meta">#${p.id} / by ${p.author} / ${new Date(p.created_at).toLocaleString()}</div>
     <h2>${p.title}</h2>
     ${p.summary?.trim() ? `<p><strong>요약:</strong> ${p.summary}</p>` : ""}
-    <pre style="white-space:pre-wrap">${p.content || ""}</pre>
+    <div class="content">${p.content_html ?? ""}</div>
     <div class="meta">
       ${(p.tags || []).map(t => `<span class="badge">#${t}</span>`).join("")}
       ${aiTags}
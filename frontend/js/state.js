@@ -1,7 +1,8 @@
 // js/state.js
 // ✅ 앱 전역 상태 & 공용 DOM 헬퍼
 
-export const API_BASE = "http://127.0.0.1:8000"; // 개발 서버 주소
+// 서버가 내보낸 index.html이면 <meta name="api-base">(같은 오리진), 파일로 열었으면 개발 서버 주소
+export const API_BASE = document.querySelector('meta[name="api-base"]')?.content ?? "http://127.0.0.1:8000";
 
 // 로컬 스토리지 토큰/유저
 export const store = {